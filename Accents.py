@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+import unicodedata  # For decomposing accented characters
+
+
+# Build the translate table
+def _build_table():
+    """
+    Builds a translate table mapping every accented Greek character to its bare letter.
+    Each character in the Greek blocks is decomposed, and if it is a letter with marks on it
+    (accents, breathings, iota subscripts, diaeresis, length marks), it maps to the letter alone.
+    Capitals map to capitals. Loose combining marks (from decomposed input) are dropped.
+    Isolated (spacing) accents are not letters, so they are left alone.
+    :return: Dictionary mapping a code point to its replacement (or None to drop it)
+    """
+    table = {}
+    for code in range(0x0300, 0x0370):  # Combining Diacritical Marks
+        table[code] = None
+    for code in list(range(0x0370, 0x0400)) + list(range(0x1F00, 0x2000)):  # Greek and Greek Extended
+        ch = unichr(code)
+        base = u"".join(c for c in unicodedata.normalize("NFD", ch) if not unicodedata.combining(c))
+        if base != ch and len(base) == 1 and base.isalpha():
+            table[code] = base
+    return table
+
+TABLE = _build_table()  # Accented to Unaccented, built once on import
+SEPARATOR = u"\x00"     # Joins words for a bulk translate. It can never appear inside a word
+
+
+# Deaccentuate a word (Remove accents and breathing marks)
+def deaccentuate(word):
+    """
+    This removes accents, breathing marks, iota subscripts and diaeresis from the letters of a word.
+    This does not remove isolated accents.
+    :param word: The word to deaccentuate (unicode, or a UTF-8 string)
+    :return: Deaccentuated word, of the same type as word
+    """
+    if isinstance(word, str):
+        return word.decode("utf-8").translate(TABLE).encode("utf-8")
+    return word.translate(TABLE)
+
+
+# Deaccentuate many words at once
+def deaccentuate_all(words):
+    """
+    Deaccentuates a whole list of unicode words with one translate call
+    :param words: List of words
+    :return: List of deaccentuated words, in the same order
+    """
+    if not words:
+        return []
+    return SEPARATOR.join(words).translate(TABLE).split(SEPARATOR)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+import unicodedata  # For composing the input
+import Paradigm     # For the slots of each form, and the words they make
+
+END = None  # Key in the ending trie under which the endings that stop at a node are kept
+
+
+# Class that parses words that are not in the database
+class Analyzer:
+    """
+    Analyzer parses a word by its ending, for words that the lexicon does not list.
+    Every slot of a form (a tense, voice and mood of a verb, or a gender of a noun or adjective) belongs to
+    a class: slots of one class differ only in their stems, so they share their written endings.
+    The written endings of each class go into a trie, keyed by their letters from the last one back,
+    and the stem of each slot goes into a dictionary keyed by its class and stem. A word is read from its
+    last letter back through the trie; every ending found on the way splits it into a stem and an ending,
+    and the stem dictionary tells which forms have that stem in that class. So a lookup costs about as many
+    steps as the word has letters, however many forms there are. Each hit is inflected again to check its accent
+    """
+    __endings = None    # Endings: Trie of written endings, from the last letter. END maps to (Class ID, Ending, Parse)
+    __stems = None      # Stems: Dictionary mapping (Class ID, Stem) to a list of (Form ID, Part, Form, Slot)
+    __classes = None    # Classes: Dictionary mapping a slot class to its Class ID
+    __forms = 0         # Forms: Number of forms indexed
+
+    # Constructor
+    def __init__(self, forms):
+        """
+        Constructor for Analyzer
+        :param forms: (Form ID, Part of Speech, Form) of each form, with the Form as a Form Table row
+        (UTF-8 strings, without the Form ID). Parts of Speech without a paradigm are skipped
+        """
+        self.__endings = {}
+        self.__stems = {}
+        self.__classes = {}
+        for form_id, part, form in forms:
+            slots = Paradigm.SLOTS.get(part)
+            if slots is None:
+                continue
+            self.__forms += 1
+            for slot in slots([v.decode("utf-8") if isinstance(v, str) else v for v in form]):
+                class_id = self.__add_class(slot)
+                self.__stems.setdefault((class_id, Paradigm.stem_key(slot)), []).append((form_id, part, form, slot))
+
+    def __len__(self):
+        return self.__forms
+
+    # Parse a word
+    def analyze(self, word):
+        """
+        Finds every way a word can be made from the indexed forms. If some of them are accented just like
+        the word, only those are given; otherwise the word is matched without its accents
+        :param word: Word (unicode, or a UTF-8 string)
+        :return: List of (Word, Form ID, Part of Speech, Info, Form). Word and Info are UTF-8 strings,
+        and Info is a tuple of the Word Table columns, as select gives them
+        """
+        if isinstance(word, str):
+            word = word.decode("utf-8")
+        word = unicodedata.normalize("NFC", word)
+        key = Paradigm.key(word)
+        exact = []; near = []; seen = set()
+        node = self.__endings
+        # Split the word before each of its letters in turn, from the end, for as long as the trie has endings
+        for i in range(len(key), -1, -1):
+            if i < len(key):
+                node = node.get(key[i])
+                if node is None:
+                    break
+            for class_id, ending, info in node.get(END, ()):
+                for form_id, part, form, slot in self.__stems.get((class_id, key[:i]), ()):
+                    name = Paradigm.inflect(slot, ending, info)
+                    found = (name.encode("utf-8"), form_id, part, tuple(v.encode("utf-8") for v in info), form)
+                    if found[:4] in seen:
+                        continue
+                    seen.add(found[:4])
+                    (exact if name == word else near).append(found)
+        return exact or near
+
+    # Helper Methods
+    # Index the class of a slot
+    def __add_class(self, slot):
+        """
+        Gets the ID of the class of a slot, and puts its written endings into the trie the first time it is seen
+        :param slot: Slot or Declension
+        :return: Class ID
+        """
+        cls = Paradigm.slot_class(slot)
+        class_id = self.__classes.get(cls)
+        if class_id is not None:
+            return class_id
+        class_id = self.__classes[cls] = len(self.__classes)
+        for written, ending, info in Paradigm.written_endings(slot):
+            node = self.__endings
+            for c in reversed(written):
+                node = node.setdefault(c, {})
+            node.setdefault(END, []).append((class_id, ending, info))
+        return class_id
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+import os                   # For the scratch database
+import gc                   # For walking what a parse holds
+import sys                  # For object sizes
+import time                 # For timing
+import shutil               # For copying the database
+import tempfile             # For the scratch database
+import multiprocessing      # For the number of CPUs
+from multiprocessing.pool import ThreadPool  # For the concurrent readers
+import sqlite3 as sql       # For the legacy select
+import Accents              # For accent stripping
+import DatabaseManager as dB  # For select
+import TextFileParser as tp  # For sample words
+import Records              # For flattening forms
+from collections import OrderedDict
+
+
+# Accent stripping as it was done before Accents, kept as the baseline
+LEGACY_ACCENT_MAP = {
+    u"ἀἁάᾶὰἄἅἆἇἂἃ": u"α",
+    u"ἐἑέὲἔἕἒἓ": u"ε",
+    u"ἰἱίῖὶἴἵἶἷἲἳ": u"ι",
+    u"ὀὁόὸὄὅὂὃ": u"ο",
+    u"ὐὑύῦὺὔὕὖὗὒὓ": u"υ",
+    u"ἠἡήῆὴἤἥἦἧἢἣ": u"η",
+    u"ὠὡώῶὼὤὥὦὧὢὣ": u"ω",
+    u"ῤῥ": u"ρ"
+}
+
+
+def legacy_deaccentuate(word):
+    unaccented = ""
+    for i in range(len(word)):
+        unaccented += legacy_deaccentuate_char(word[i])
+    return unaccented
+
+
+def legacy_deaccentuate_char(ch):
+    for a, u in LEGACY_ACCENT_MAP.iteritems():
+        if legacy_find_unicode(a, ch) >= 0:
+            return u
+    return ch
+
+
+def legacy_find_unicode(s, c):
+    for i in range(len(s)):
+        if s[i] == c:
+            return i
+    return -1
+
+
+# Select as it was done before Word Lookups (one query on Words, then the word table, form table and definitions)
+def legacy_select(conn, word, is_verbose=False, is_define=False, is_unaccented=False):
+    cur = conn.cursor()
+    cur.execute("SELECT WordID, FormID, PartOfSpeech FROM Words WHERE " +
+                ("UnaccentedWordName" if is_unaccented else "WordName") + " == ?;", (word,))
+    ids = cur.fetchone()
+    if ids is None:
+        return None, None, None
+    word_id, form_id, part = ids
+    table, form_table = dB.Lexicon.POS_TABLES[part]
+    form = None; defs = None
+    cur.execute("SELECT * FROM " + table + " WHERE WordID == ? AND FormID == ?;", (word_id, form_id))
+    info = cur.fetchone()[2:]
+    if is_verbose:
+        cur.execute("SELECT * FROM " + form_table + " WHERE FormID == ?;", (form_id,))
+        form = cur.fetchone()[1:]
+    if is_define:
+        cur.execute("SELECT Definition FROM Definitions WHERE FormID == ?;", (form_id,))
+        defs = cur.fetchall()
+    return info, form, defs
+
+
+# Entry as the parser built it before Records, kept as the baseline: a flat form list and lists of parse lists.
+# Every value read from the file was its own string, made by splitting its line
+def legacy_entry(entry, is_generated=False):
+    fresh = lambda v: (v + " ")[:-1]
+    copy = (lambda v: v) if is_generated else fresh  # Generated parses already shared their strings
+    form = [fresh(v) for v in Records.values(entry.form)]
+    words = OrderedDict((name, [[copy(v) for v in info] for info in infos])
+                        for name, infos in entry.words.iteritems())
+    return tp.Entry(entry.part, form, words)
+
+
+# Helpers
+def sample_words(file_name="Lexicon.txt"):
+    """
+    Gets every word string in the text file
+    :param file_name: Text File
+    :return: List of words
+    """
+    words = []
+    with tp.Parser(file_name) as parser:
+        for entry in parser:
+            words.extend(entry.words.iterkeys())
+    return words
+
+
+def read_all(record):
+    """
+    Reads everything in a record, as a verbose, define lookup does
+    :param record: WordRecord
+    :return: Info, Form, Definitions
+    """
+    return record.info, record.form, record.definitions
+
+
+def deep_size(obj):
+    """
+    Measures everything an object holds, counting each object it reaches once
+    :param obj: Object
+    :return: Bytes
+    """
+    seen = set(); stack = [obj]; size = 0
+    while stack:
+        o = stack.pop()
+        if id(o) in seen or isinstance(o, type):
+            continue
+        seen.add(id(o))
+        size += sys.getsizeof(o)
+        stack.extend(gc.get_referents(o))
+    return size
+
+
+def timed(func, *args):
+    """
+    Times a single call
+    :param func: Function to call
+    :param args: Arguments
+    :return: Seconds taken
+    """
+    start = time.time()
+    func(*args)
+    return time.time() - start
+
+
+def report(name, seconds, count):
+    print "%-40s %8.4fs %12.0f /s" % (name, seconds, count / seconds if seconds > 0 else 0)
+
+
+# Benchmarks
+def bench_memory(file_name="Lexicon.txt", copies=1000):
+    """
+    Compares the memory held by a whole parsed lexicon as legacy lists against the Records the parser gives,
+    as read from the text file and with the generated paradigms filled in
+    :param file_name: Text File
+    :param copies: Number of times to parse the text file, to stand in for a bigger lexicon
+    :return: None
+    """
+    for expand in (False, True):
+        entries = []
+        for i in range(copies):
+            with tp.Parser(file_name, expand=expand) as parser:
+                entries.extend(parser)
+        words = sum(len(info) for e in entries for info in e.words.itervalues())
+        print "Parsed lexicon%s, %d entries, %d words" % (" (expanded)" if expand else "", len(entries), words)
+        legacy = deep_size([legacy_entry(e, expand) for e in entries])
+        records = deep_size(entries)
+        print "%-40s %12d bytes" % ("legacy lists", legacy)
+        print "%-40s %12d bytes %7.1f%%" % ("Records", records, 100.0 * (records - legacy) / legacy)
+
+
+def bench_deaccentuate(words, rounds=2000):
+    """
+    Compares the legacy accent loop against the translate table, one word at a time and in bulk
+    :param words: Sample words
+    :param rounds: Number of times to go through the sample
+    :return: None
+    """
+    words = words * rounds
+    print "Accent stripping, %d words" % len(words)
+    report("legacy loop", timed(lambda: [legacy_deaccentuate(w) for w in words]), len(words))
+    report("Accents.deaccentuate", timed(lambda: [Accents.deaccentuate(w) for w in words]), len(words))
+    report("Accents.deaccentuate_all", timed(Accents.deaccentuate_all, words), len(words))
+
+
+def bench_select(db_path="Lexicon.db", rounds=200):
+    """
+    Compares the legacy multi-query select against Lexicon.select (one query on Word Lookups), with the cache off.
+    Runs on a copy of the database, since opening it with Lexicon may upgrade its schema
+    :param db_path: Database
+    :param rounds: Number of times to go through every word in the database
+    :return: None
+    """
+    scratch = os.path.join(tempfile.mkdtemp(), "Benchmark.db")
+    shutil.copy(db_path, scratch)
+    with dB.Lexicon(scratch, 0) as lexicon:
+        conn = sql.connect(scratch)
+        conn.text_factory = str
+        words = [row[0] for row in conn.execute("SELECT WordName FROM Words;")] * rounds
+        print "Select (verbose, define), %d lookups" % len(words)
+        report("legacy select", timed(lambda: [legacy_select(conn, w, True, True) for w in words]), len(words))
+        report("Lexicon.select", timed(lambda: [read_all(lexicon.select(w)) for w in words]), len(words))
+        report("legacy select (info only)", timed(lambda: [legacy_select(conn, w) for w in words]), len(words))
+        report("Lexicon.select (info only)", timed(lambda: [lexicon.select(w).info for w in words]), len(words))
+        conn.close()
+    shutil.rmtree(os.path.dirname(scratch))
+
+
+def bench_readers(db_path="Lexicon.db", workers=(1, 2, 4, 8), rounds=200):
+    """
+    Measures how ReaderPool lookups scale with the number of threads calling select at once, with the cache off.
+    The pool has a connection per thread. Runs on a copy of the database, like bench_select
+    :param db_path: Database
+    :param workers: Numbers of threads to try
+    :param rounds: Number of times to go through every word in the database
+    :return: None
+    """
+    scratch = os.path.join(tempfile.mkdtemp(), "Benchmark.db")
+    shutil.copy(db_path, scratch)
+    with dB.ReaderPool(scratch, max(workers), 0) as pool:
+        conn = sql.connect(scratch)
+        conn.text_factory = str
+        words = [row[0] for row in conn.execute("SELECT WordName FROM Words;")] * rounds
+        conn.close()
+        print "Concurrent select (verbose, define), %d lookups, %d CPUs" % (len(words), multiprocessing.cpu_count())
+        for n in workers:
+            threads = ThreadPool(n)
+            lookup = lambda w: read_all(pool.select(w))
+            report("ReaderPool.select, %d threads" % n,
+                   timed(lambda: threads.map(lookup, words, max(1, len(words) // (n * 16)))), len(words))
+            threads.close()
+            threads.join()
+    shutil.rmtree(os.path.dirname(scratch))
+
+
+if __name__ == "__main__":
+    bench_memory()
+    bench_deaccentuate(sample_words())
+    bench_select()
+    bench_readers()
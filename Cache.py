@@ -0,0 +1,80 @@
+import threading                      # For sharing the cache between threads
+from collections import OrderedDict  # For keeping the use order
+
+
+# Class that holds the most recently used results
+class LRUCache:
+    """
+    LRUCache maps keys to values, and forgets the least recently used key once it is full.
+    It is safe to share between threads
+    """
+    __entries = None    # Entries: Ordered from least to most recently used
+    __lock = None       # Lock: Held while the entries or counters change
+    __capacity = 0      # Capacity: Most entries held at once (0 turns the cache off)
+    hits = 0            # Hits: Number of gets that found their key
+    misses = 0          # Misses: Number of gets that did not
+
+    # Constructor
+    def __init__(self, capacity):
+        """
+        Constructor for LRUCache
+        :param capacity: Most entries held at once (0 turns the cache off)
+        """
+        self.__entries = OrderedDict()
+        self.__lock = threading.Lock()
+        self.__capacity = capacity
+
+    def __len__(self):
+        return len(self.__entries)
+
+    # Get a value
+    def get(self, key, default=None):
+        """
+        Gets the value of a key, and marks it as the most recently used
+        :param key: Key
+        :param default: Returned if the key is not cached
+        :return: Value, or default
+        """
+        with self.__lock:
+            try:
+                value = self.__entries.pop(key)
+            except KeyError:
+                self.misses += 1
+                return default
+            self.__entries[key] = value  # Move to the most recently used end
+            self.hits += 1
+            return value
+
+    # Put a value
+    def put(self, key, value):
+        """
+        Caches the value of a key, forgetting the least recently used key if full
+        :param key: Key
+        :param value: Value
+        :return: None
+        """
+        if self.__capacity <= 0:
+            return
+        with self.__lock:
+            self.__entries.pop(key, None)
+            self.__entries[key] = value
+            if len(self.__entries) > self.__capacity:
+                self.__entries.popitem(last=False)
+
+    # Forget everything
+    def clear(self):
+        """
+        Forgets every entry. The hit and miss counters are kept
+        :return: None
+        """
+        with self.__lock:
+            self.__entries.clear()
+
+    # Get the counters
+    def stats(self):
+        """
+        Gets the counters of the cache
+        :return: Dictionary of Hits, Misses, Size, Capacity
+        """
+        return {"Hits": self.hits, "Misses": self.misses,
+                "Size": len(self.__entries), "Capacity": self.__capacity}
@@ -1,6 +1,71 @@
 # -*- coding: utf-8 -*-
 import sqlite3 as sql  # For database operations
+import threading       # For the reader pool
+import Queue           # For the reader pool's idle connections
 import Utils           # For Part of Speech
+import Accents         # For the Unaccented Word Names
+import Cache           # For caching select results
+import FuzzyIndex      # For suggesting words
+import Analyzer        # For parsing words that are not listed
+import Glosses         # For the terms of the definitions
+from collections import OrderedDict
+
+
+# Pack columns into one text value
+def _packed(alias, columns):
+    """
+    Builds an SQL expression that joins columns into one text value, for the Word Lookups table.
+    Columns are separated by char(31), and a NULL column is written as char(30)
+    :param alias: Alias of the table the columns are in
+    :param columns: Column names
+    :return: SQL expression
+    """
+    return " || char(31) || ".join(["coalesce(" + alias + '."' + c + '", char(30))' for c in columns])
+
+
+# Class that hands out IDs for new rows
+class IdAllocator:
+    """
+    IdAllocator seeds itself from the database once, and then hands out
+    Form IDs and Word IDs from memory instead of querying for the maximum each time
+    """
+    __next_form = 0     # Next free Form ID
+    __next_words = None  # Dictionary mapping a Form ID to its next free Word ID
+
+    # Constructor
+    def __init__(self, conn):
+        """
+        Seeds the allocator from the current contents of the database
+        :param conn: Connection to the database
+        """
+        cur = conn.cursor()
+        cur.execute("SELECT MAX(FormID) FROM WordForms;")
+        data = cur.fetchone()
+        self.__next_form = data[0] + 1 if data[0] is not None else 0
+        cur.execute("SELECT FormID, MAX(WordID) FROM Words GROUP BY FormID;")
+        self.__next_words = dict((form_id, word_id + 1) for form_id, word_id in cur.fetchall())
+
+    # Get the next Form ID
+    def next_form_id(self):
+        """
+        Hands out the next Form ID
+        :return: Form ID
+        """
+        form_id = self.__next_form
+        self.__next_form += 1
+        return form_id
+
+    # Get the next Word IDs of a form
+    def next_word_id(self, form_id, count=1):
+        """
+        Hands out a run of Word IDs for a form
+        :param form_id: Form ID
+        :param count: Number of Word IDs to hand out
+        :return: The first Word ID of the run
+        """
+        word_id = self.__next_words.get(form_id, 0)
+        self.__next_words[form_id] = word_id + count
+        return word_id
 
 
 # Class that handles queries to the lexicon
@@ -9,6 +74,38 @@ class Lexicon:
     Lexicon handles database operations
     """
     __conn = None       # Connection to the database
+    __bulk = False      # Whether a bulk load is running (inserts share one transaction)
+    __rows = 0          # Number of rows inserted during the bulk load
+    __ids = None        # ID Allocator, seeded once per load session
+    __cache = None      # LRU Cache of select results, cleared on every write
+    CACHE_SIZE = 1024   # Default number of select results to cache
+    __fuzzy = None      # Fuzzy Index of the word names, built on the first suggestion and dropped on every write
+    __analyzer = None   # Analyzer of the forms, built on the first analysis and dropped on every write
+    __profile = None    # Name of the connection profile in use
+    __resume = None     # Name of the connection profile to go back to after a bulk load
+    SUGGESTIONS = 5     # Default number of suggestions
+
+    # Connection Profiles: Name to the PRAGMAs it sets, in the order they are set.
+    # Every profile sets every one of them but journal_mode, so applying a profile fully decides how the
+    # connection behaves. journal_mode is kept in the database file, and changing it needs the database to itself,
+    # so the default profile leaves it as it is (another process, like a server, may have it open in WAL), and a
+    # change that another connection is blocking is skipped rather than failing the profile.
+    # locking_mode is set to NORMAL before journal_mode changes, since SQLite will not leave WAL while exclusive
+    PROFILE_DEFAULT = "default"        # SQLite's own defaults, in whatever journal mode the database is in
+    PROFILE_BULK_LOAD = "bulk-load"    # For loading: no syncing, a large cache and the database to itself
+    PROFILE_SERVING = "serving"        # For lookups: WAL (readers never wait on a writer), memory-mapped, read-only
+    PROFILES = {
+        PROFILE_DEFAULT: [("query_only", 0), ("locking_mode", "NORMAL"), ("synchronous", "FULL"), ("cache_size", -2000), ("temp_store", "DEFAULT"),
+                          ("mmap_size", 0)],
+        PROFILE_BULK_LOAD: [("query_only", 0), ("locking_mode", "NORMAL"), ("journal_mode", "DELETE"),
+                            ("locking_mode", "EXCLUSIVE"), ("synchronous", "OFF"), ("cache_size", -262144),
+                            ("temp_store", "MEMORY"), ("mmap_size", 0)],
+        PROFILE_SERVING: [("query_only", 0), ("locking_mode", "NORMAL"), ("journal_mode", "WAL"),
+                          ("synchronous", "NORMAL"), ("cache_size", -65536), ("temp_store", "MEMORY"),
+                          ("mmap_size", 268435456), ("query_only", 1)]
+    }
+    SETTINGS = ["journal_mode", "synchronous", "locking_mode", "cache_size", "temp_store", "mmap_size",
+                "query_only", "foreign_keys"]
 
     # Constants for Table Names in the database
     DEF_TABLE = "Definitions"
@@ -22,31 +119,196 @@ class Lexicon:
     VERB_FORM_TABLE = "VerbForms"
     ADJ_FORM_TABLE = "AdjectiveForms"
     PRO_FORM_TABLE = "PronounForms"
-    PART_TABLE = "ParticipleForms"
-
-    # Mapping of Accented to Unaccented
-    ACCENT_MAP = {
-        u"ἀἁάᾶὰἄἅἆἇἂἃ": u"α",
-        u"ἐἑέὲἔἕἒἓ": u"ε",
-        u"ἰἱίῖὶἴἵἶἷἲἳ": u"ι",
-        u"ὀὁόὸὄὅὂὃ": u"ο",
-        u"ὐὑύῦὺὔὕὖὗὒὓ": u"υ",
-        u"ἠἡήῆὴἤἥἦἧἢἣ": u"η",
-        u"ὠὡώῶὼὤὥὦὧὢὣ": u"ω",
-        u"ῤῥ": u"ρ"
+    PART_TABLE = "Participles"
+    FINGERPRINT_TABLE = "EntryFingerprints"
+    LOOKUP_TABLE = "WordLookups"
+    TERM_TABLE = "DefinitionTerms"
+
+    # Part of Speech to its Word Table and Form Table
+    POS_TABLES = {
+        Utils.PartOfSpeech.VERB.value: (VERB_TABLE, VERB_FORM_TABLE),
+        Utils.PartOfSpeech.NOUN.value: (NOUN_TABLE, NOUN_FORM_TABLE),
+        Utils.PartOfSpeech.ADJECTIVE.value: (ADJ_TABLE, ADJ_FORM_TABLE),
+        Utils.PartOfSpeech.PRONOUN.value: (PRO_TABLE, PRO_FORM_TABLE),
+        Utils.PartOfSpeech.PARTICIPLE.value: (PART_TABLE, VERB_FORM_TABLE)
     }
 
+    # Managed Tables: Name, Definition, Options. These are added on top of the original schema
+    TABLES = [
+        (FINGERPRINT_TABLE, "Fingerprint TEXT NOT NULL, FormID INTEGER NOT NULL, PRIMARY KEY (Fingerprint), "
+                            "FOREIGN KEY (FormID) REFERENCES " + WORD_FORM_TABLE + " (FormID) ON DELETE CASCADE", ""),
+        # One row per word, with everything select returns packed into it, so a lookup is one indexed query.
+        # Seq is the rowid of the word in Words, so that the first of a name is the same one as in Words
+        (LOOKUP_TABLE, "WordName TEXT NOT NULL, Seq INTEGER NOT NULL, UnaccentedWordName TEXT NOT NULL, "
+                       "FormID INTEGER NOT NULL, PartOfSpeech TEXT NOT NULL, Info TEXT NOT NULL, Form TEXT, "
+                       "Definitions TEXT, "
+                       "PRIMARY KEY (WordName, Seq), FOREIGN KEY (FormID) REFERENCES " + WORD_FORM_TABLE +
+                       " (FormID) ON DELETE CASCADE", "WITHOUT ROWID"),
+        # An inverted index of the definitions: one row per term of each definition (see Glosses).
+        # Word is the word that made the term, and Terms is how many terms the definition has, for ranking
+        (TERM_TABLE, "Term TEXT NOT NULL, FormID INTEGER NOT NULL, Definition TEXT NOT NULL, Word TEXT NOT NULL, "
+                     "Terms INTEGER NOT NULL, PRIMARY KEY (Term, FormID, Definition), FOREIGN KEY (FormID) "
+                     "REFERENCES " + WORD_FORM_TABLE + " (FormID) ON DELETE CASCADE", "WITHOUT ROWID")
+    ]
+
+    # Managed Indexes for every lookup path: Name, Table, Columns
+    # Bump SCHEMA_VERSION whenever the managed tables or indexes change, so that opened databases get upgraded
+    SCHEMA_VERSION = 5
+    INDEX_PREFIX = "Lookup"
+    INDEXES = [
+        ("LookupWordName", WORD_TABLE, ["WordName"]),
+        ("LookupUnaccentedWordName", WORD_TABLE, ["UnaccentedWordName"]),
+        ("LookupWordForm", WORD_TABLE, ["FormID"]),
+        ("LookupVerbForm", VERB_FORM_TABLE, ["FirstPrincipalPart", "SecondPrincipalPart", "ThirdPrincipalPart",
+                                             "FourthPrincipalPart", "FifthPrincipalPart", "SixthPrincipalPart"]),
+        ("LookupNounForm", NOUN_FORM_TABLE, ["Nominative", "Genitive", "Article"]),
+        ("LookupAdjForm", ADJ_FORM_TABLE, ["Masculine", "Feminine", "Neuter"]),
+        ("LookupProForm", PRO_FORM_TABLE, ["Masculine", "Feminine", "Neuter"]),
+        ("LookupFingerprintForm", FINGERPRINT_TABLE, ["FormID"]),
+        ("LookupUnaccentedEntry", LOOKUP_TABLE, ["UnaccentedWordName", "Seq"]),
+        ("LookupEntryForm", LOOKUP_TABLE, ["FormID"]),
+        ("LookupTermForm", TERM_TABLE, ["FormID"])
+    ]
+
+    # Insert Statements: One fixed statement per table, so sqlite3 parses each one once and caches it
+    STATEMENT_CACHE_SIZE = 128
+    SQL_INSERT = dict((t, "INSERT INTO " + t + " VALUES(" + ", ".join(["?"] * n) + ");")
+                      for t, n in ((DEF_TABLE, 2), (WORD_TABLE, 5), (NOUN_TABLE, 5), (VERB_TABLE, 7),
+                                   (ADJ_TABLE, 5), (PRO_TABLE, 6), (PART_TABLE, 7), (WORD_FORM_TABLE, 3),
+                                   (NOUN_FORM_TABLE, 8), (VERB_FORM_TABLE, 13), (ADJ_FORM_TABLE, 7),
+                                   (PRO_FORM_TABLE, 6), (FINGERPRINT_TABLE, 2), (TERM_TABLE, 5)))
+    SQL_DELETE_FORMS = "DELETE FROM " + WORD_FORM_TABLE + ";"
+    SQL_DELETE_FORM = "DELETE FROM " + WORD_FORM_TABLE + " WHERE FormID == ?;"
+    SQL_DELETE_WORDS = "DELETE FROM " + WORD_TABLE + ";"
+
+    # Word Lookups: Each Word Table, its Form Table, and the columns of both that select returns, in order
+    LOOKUP_SOURCES = [
+        (NOUN_TABLE, NOUN_FORM_TABLE, ["Case", "Number", "Gender"],
+         ["Nominative", "Genitive", "Article", "MajorDeclension", "MinorDeclension", "Gender", "Irregularity"]),
+        (VERB_TABLE, VERB_FORM_TABLE, ["Person", "Number", "Tense", "Voice", "Mood"],
+         ["FirstPrincipalPart", "SecondPrincipalPart", "ThirdPrincipalPart", "FourthPrincipalPart",
+          "FifthPrincipalPart", "SixthPrincipalPart", "Ending", "Contraction", "Aorist", "Perfect",
+          "Deponency", "Irregularity"]),
+        (ADJ_TABLE, ADJ_FORM_TABLE, ["Case", "Number", "Gender"],
+         ["Masculine", "Feminine", "Neuter", "MajorDeclension", "MinorDeclension", "Irregularity"]),
+        (PRO_TABLE, PRO_FORM_TABLE, ["Case", "Number", "Gender", "Person"],
+         ["Masculine", "Feminine", "Neuter", "Person", "Type"]),
+        (PART_TABLE, VERB_FORM_TABLE, ["Case", "Number", "Gender", "Tense", "Voice"],
+         ["FirstPrincipalPart", "SecondPrincipalPart", "ThirdPrincipalPart", "FourthPrincipalPart",
+          "FifthPrincipalPart", "SixthPrincipalPart", "Ending", "Contraction", "Aorist", "Perfect",
+          "Deponency", "Irregularity"])
+    ]
+    # Column names of the Info and Form of each Word Table (used by WordRecord)
+    INFO_COLUMNS = dict([(t, c) for t, ft, c, fc in LOOKUP_SOURCES])
+    FORM_COLUMNS = dict([(t, fc) for t, ft, c, fc in LOOKUP_SOURCES])
+    SEPARATOR = "\x1f"     # Separates the columns packed into one value
+    NULL_MARKER = "\x1e"   # Stands for a NULL column in a packed value
+    SQL_FILL_LOOKUP = ("INSERT INTO " + LOOKUP_TABLE +
+                       " SELECT W.WordName, W.rowid, W.UnaccentedWordName, W.FormID, W.PartOfSpeech, %s, %s," +
+                       " (SELECT group_concat(" +
+                       "Definition, char(31)) FROM (SELECT Definition FROM " + DEF_TABLE +
+                       " WHERE FormID == W.FormID ORDER BY Definition)) FROM " + WORD_TABLE + " AS W" +
+                       " JOIN %s AS T ON T.WordID == W.WordID AND T.FormID == W.FormID" +
+                       " LEFT JOIN %s AS F ON F.FormID == W.FormID")
+    # Fill from every word (on upgrade), or from the words just inserted for a form
+    SQL_FILL_LOOKUPS = dict([(t, SQL_FILL_LOOKUP % (_packed("T", c), _packed("F", fc), t, ft) + ";")
+                             for t, ft, c, fc in LOOKUP_SOURCES])
+    SQL_INSERT_LOOKUPS = dict([(t, SQL_FILL_LOOKUP % (_packed("T", c), _packed("F", fc), t, ft) +
+                                " WHERE W.FormID == ? AND W.WordID BETWEEN ? AND ?;")
+                               for t, ft, c, fc in LOOKUP_SOURCES])
+
+    # Lookup Queries (used by select, select_many and the Form ID helpers). One indexed query per lookup
+    SQL_SELECT_LOOKUP = ("SELECT WordName, FormID, PartOfSpeech, Info, Form, Definitions FROM " + LOOKUP_TABLE +
+                         " WHERE WordName == ? ORDER BY Seq LIMIT 1;")
+    SQL_SELECT_UNACCENTED_LOOKUP = ("SELECT WordName, FormID, PartOfSpeech, Info, Form, Definitions FROM " +
+                                    LOOKUP_TABLE + " WHERE UnaccentedWordName == ? ORDER BY Seq LIMIT 1;")
+    SQL_SELECT_NAMES = "SELECT DISTINCT WordName FROM " + WORD_TABLE + ";"
+    SQL_SELECT_DEFINITIONS = "SELECT Definition FROM " + DEF_TABLE + " WHERE FormID == ? ORDER BY Definition;"
+    SQL_SELECT_ALL_DEFINITIONS = "SELECT FormID, Definition FROM " + DEF_TABLE + ";"
+    # Every row of a Form Table (used by analyze), for each Part of Speech with a paradigm
+    SQL_SELECT_FORMS = dict([(pos, "SELECT * FROM " + POS_TABLES[pos][1] + ";")
+                             for pos in (Utils.PartOfSpeech.VERB.value, Utils.PartOfSpeech.NOUN.value,
+                                         Utils.PartOfSpeech.ADJECTIVE.value)])
+    SQL_FORM_ID_NOUN = ("SELECT FormID FROM " + NOUN_FORM_TABLE +
+                        " WHERE Nominative == ? AND Genitive == ? AND Article == ?;")
+    SQL_FORM_ID_VERB = ("SELECT FormID FROM " + VERB_FORM_TABLE +
+                        " WHERE FirstPrincipalPart == ? AND SecondPrincipalPart == ? AND ThirdPrincipalPart == ?" +
+                        " AND FourthPrincipalPart == ? AND FifthPrincipalPart == ? AND SixthPrincipalPart == ?;")
+    SQL_FORM_ID_ADJ = ("SELECT FormID FROM " + ADJ_FORM_TABLE +
+                       " WHERE Masculine == ? AND Feminine == ? AND Neuter == ?;")
+    SQL_FORM_ID_PRO = ("SELECT FormID FROM " + PRO_FORM_TABLE +
+                       " WHERE Masculine == ? AND Feminine == ? AND Neuter == ?;")
+
+    # English Queries (used by search_english). One indexed query per term, and one per form given back
+    ENGLISH_RESULTS = 10
+    SQL_SELECT_TERM = "SELECT FormID, Definition, Word, Terms FROM " + TERM_TABLE + " WHERE Term == ?;"
+    # The headword of a form is the first column of its Form Table, or else the first of its words
+    SQL_SELECT_FACE = ("SELECT coalesce(V.FirstPrincipalPart, N.Nominative, A.Masculine, P.Masculine, " +
+                       "(SELECT WordName FROM " + WORD_TABLE + " WHERE FormID == F.FormID ORDER BY rowid LIMIT 1)), " +
+                       "F.PartOfSpeech FROM " + WORD_FORM_TABLE + " AS F" +
+                       " LEFT JOIN " + VERB_FORM_TABLE + " AS V ON V.FormID == F.FormID" +
+                       " LEFT JOIN " + NOUN_FORM_TABLE + " AS N ON N.FormID == F.FormID" +
+                       " LEFT JOIN " + ADJ_FORM_TABLE + " AS A ON A.FormID == F.FormID" +
+                       " LEFT JOIN " + PRO_FORM_TABLE + " AS P ON P.FormID == F.FormID WHERE F.FormID == ?;")
+
+    # Batch Lookup Queries (used by select_many). Every IN list has exactly IN_SIZE values,
+    # padded by repeating the last one, so each of these is still one fixed, cached statement
+    IN_SIZE = 100
+    IN_LIST = "(" + ", ".join(["?"] * IN_SIZE) + ")"
+    SQL_SELECT_LOOKUPS = ("SELECT WordName, WordName, FormID, PartOfSpeech, Info, Form, Definitions FROM " +
+                          LOOKUP_TABLE + " WHERE WordName IN " + IN_LIST + " ORDER BY Seq;")
+    SQL_SELECT_UNACCENTED_LOOKUPS = ("SELECT UnaccentedWordName, WordName, FormID, PartOfSpeech, Info, Form, " +
+                                     "Definitions FROM " + LOOKUP_TABLE +
+                                     " WHERE UnaccentedWordName IN " + IN_LIST + " ORDER BY Seq;")
+
+    # Search Queries (used by search). Each is a range scan over a name index, in index order,
+    # so a page costs about as many index steps as it has results. Pages continue from the last (name, rowid)
+    PAGE_SIZE = 20
+    WILDCARDS = u"*?["
+    SQL_SEARCH = ("SELECT WordName, PartOfSpeech, FormID, %s, rowid FROM " + WORD_TABLE +
+                  " WHERE %s >= ? AND %s < ? AND %s GLOB ? ORDER BY %s, rowid LIMIT ?;")
+    SQL_SEARCH_AFTER = ("SELECT WordName, PartOfSpeech, FormID, %s, rowid FROM " + WORD_TABLE +
+                        " WHERE %s >= ? AND %s < ? AND %s GLOB ? AND (%s, rowid) > (?, ?) ORDER BY %s, rowid LIMIT ?;")
+    SQL_SEARCH_WORD = SQL_SEARCH % (("WordName",) * 5)
+    SQL_SEARCH_UNACCENTED_WORD = SQL_SEARCH % (("UnaccentedWordName",) * 5)
+    SQL_SEARCH_WORD_AFTER = SQL_SEARCH_AFTER % (("WordName",) * 6)
+    SQL_SEARCH_UNACCENTED_WORD_AFTER = SQL_SEARCH_AFTER % (("UnaccentedWordName",) * 6)
+
+    # List Query (used by list_words). Words drives the join (CROSS JOIN keeps that order), in rowid order,
+    # so each page continues a single pass over Words and never sorts. Filters are added as "AND <Column> == ?"
+    LIST_PAGE_SIZE = 500
+    FETCH_SIZE = 100
+    SQL_LIST = ("SELECT W.rowid, W.WordName, F.ChapterLearned, T.* FROM " + WORD_TABLE + " AS W" +
+                " CROSS JOIN %s AS T ON T.WordID == W.WordID AND T.FormID == W.FormID" +
+                " CROSS JOIN " + WORD_FORM_TABLE + " AS F ON F.FormID == W.FormID" +
+                " CROSS JOIN %s AS FT ON FT.FormID == W.FormID" +
+                " WHERE W.PartOfSpeech == ? AND W.rowid > ?%s ORDER BY W.rowid LIMIT ?;")
+
     # Constructor
-    def __init__(self, db_path):
+    def __init__(self, db_path, cache_size=CACHE_SIZE, profile=PROFILE_DEFAULT):
+        """
+        Constructor for Lexicon
+        :param db_path: Path to the database
+        :param cache_size: Number of select results to cache (0 turns the cache off)
+        :param profile: Name of the connection profile to use (one of PROFILES)
+        """
+        if profile not in self.PROFILES:
+            raise ValueError("Unknown profile: " + profile + ".")
+        self.__cache = Cache.LRUCache(cache_size)
         try:  # Try to connect to the database at db_path
-            self.__conn = sql.connect(db_path)  # Connect
+            self.__conn = sql.connect(db_path, cached_statements=self.STATEMENT_CACHE_SIZE)  # Connect
             self.__conn.text_factory = lambda x: str(x, "utf-8")  # Set to UTF-8 for Greek characters
             self.__conn.text_factory = str
             cur = self.__conn.cursor()
             cur.execute("PRAGMA foreign_keys = 1;")  # Set Foreign Key Constraints on (SQLite thing)
             self.__conn.commit()
-        except sql.Error, e:  # If there is an exception
-            print "Error %s: " % e.args[0]
+            self.__upgrade_schema()  # Make sure the managed tables exist, and every lookup path is indexed
+            self.apply_profile(profile)  # After the upgrade, since a profile may make the connection read-only
+        except sql.Error:  # A connection that is only partly set up is no use, so do not hand it out
+            if self.__conn:
+                self.__conn.close()
+                self.__conn = None
+            raise
 
     def __enter__(self):
         return self
@@ -55,6 +317,91 @@ class Lexicon:
         if self.__conn:
             self.__conn.close()
 
+    # Schema Methods
+    # Upgrade the schema
+    def __upgrade_schema(self):
+        """
+        Creates any missing managed table or index, and drops managed indexes that are no longer in the set.
+        Only runs when the database is older than SCHEMA_VERSION
+        :return: None
+        """
+        cur = self.__conn.cursor()
+        cur.execute("PRAGMA user_version;")
+        if cur.fetchone()[0] >= self.SCHEMA_VERSION:
+            return
+
+        # Create the managed tables that are missing. Word Lookups only holds copies, so an old one is rebuilt
+        cur.execute("SELECT name FROM sqlite_master WHERE type == 'table';")
+        existing = set(row[0] for row in cur.fetchall())
+        if self.LOOKUP_TABLE in existing and "PartOfSpeech" not in self.__columns(self.LOOKUP_TABLE):
+            cur.execute("DROP TABLE " + self.LOOKUP_TABLE + ";")
+            existing.remove(self.LOOKUP_TABLE)
+        for name, definition, options in self.TABLES:
+            cur.execute("CREATE TABLE IF NOT EXISTS " + name + " (" + definition + ") " + options + ";")
+
+        # Fill the Word Lookups table from the words already in the database
+        if self.LOOKUP_TABLE not in existing:
+            for query in self.SQL_FILL_LOOKUPS.itervalues():
+                cur.execute(query)
+
+        # Fill the Definition Terms table from the definitions already in the database
+        if self.TERM_TABLE not in existing:
+            cur.execute(self.SQL_SELECT_ALL_DEFINITIONS)
+            cur.executemany(self.SQL_INSERT[self.TERM_TABLE], _term_rows(cur.fetchall()))
+
+        # Drop the managed indexes that were removed from the set
+        names = [i[0] for i in self.INDEXES]
+        cur.execute("SELECT name FROM sqlite_master WHERE type == 'index' AND name LIKE ?;",
+                    (self.INDEX_PREFIX + "%",))
+        for (name,) in cur.fetchall():
+            if name not in names:
+                cur.execute("DROP INDEX " + name + ";")
+
+        # Create the ones that are missing
+        for name, table, columns in self.INDEXES:
+            cur.execute("CREATE INDEX IF NOT EXISTS " + name + " ON " + table + " (" + ", ".join(columns) + ");")
+
+        cur.execute("PRAGMA user_version = " + str(self.SCHEMA_VERSION) + ";")
+        self.__conn.commit()
+
+    # Connection Methods
+    # Apply a connection profile
+    def apply_profile(self, profile):
+        """
+        Sets every PRAGMA of a connection profile. Must not be called during a bulk load
+        :param profile: Name of the profile (one of PROFILES)
+        :return: None
+        """
+        if profile not in self.PROFILES:
+            raise ValueError("Unknown profile: " + profile + ".")
+        self.__profile = profile  # Recorded first, so that even a profile that fails part way is named by stats
+        self.__conn.commit()  # Some of these cannot change inside a transaction
+        cur = self.__conn.cursor()
+        _apply_pragmas(cur, self.PROFILES[profile])
+        if dict(self.PROFILES[profile]).get("locking_mode") == "NORMAL":
+            cur.execute("SELECT count(*) FROM sqlite_master;")  # An exclusive lock is only let go on the next read
+            cur.fetchall()
+
+    # Get the connection profile
+    def profile(self):
+        """
+        :return: Name of the connection profile in use
+        """
+        return self.__profile
+
+    # Get the connection settings
+    def settings(self):
+        """
+        Reads back the PRAGMAs that profiles set, as the connection actually has them
+        :return: Ordered Dictionary mapping each PRAGMA in SETTINGS to its value
+        """
+        cur = self.__conn.cursor()
+        settings = OrderedDict()
+        for pragma in self.SETTINGS:
+            cur.execute("PRAGMA " + pragma + ";")
+            settings[pragma] = cur.fetchone()[0]
+        return settings
+
     # Core methods
     # Reset the database
     def reset(self):
@@ -65,17 +412,99 @@ class Lexicon:
         # Erase everything in the database
         cur = self.__conn.cursor()
         # WordForms and Words contains everything, Foreign Keys will cascade the other tables
-        cur.execute("DELETE FROM WordForms;")
-        cur.execute("DELETE FROM Words;")
+        cur.execute(self.SQL_DELETE_FORMS)
+        cur.execute(self.SQL_DELETE_WORDS)
+        self.__cache.clear()
+        self.__fuzzy = None
+        self.__analyzer = None
+        self.__ids = None  # The old IDs are gone, so reseed
+        if not self.__bulk:  # A bulk load commits the reset along with the inserts
+            self.__conn.commit()
+
+    # Delete a form
+    def delete_form(self, form_id):
+        """
+        Deletes a form, and (by cascading) its words, definitions and fingerprint
+        :param form_id: Form ID
+        :return: None
+        """
+        cur = self.__conn.cursor()
+        cur.execute(self.SQL_DELETE_FORM, (form_id,))
+        self.__cache.clear()
+        self.__fuzzy = None
+        self.__analyzer = None
+        self.__commit()
+
+    # Get the stored fingerprints
+    def fingerprints(self):
+        """
+        Gets the fingerprint of every entry stored in the database
+        :return: Dictionary mapping a fingerprint to its Form ID
+        """
+        cur = self.__conn.cursor()
+        cur.execute("SELECT Fingerprint, FormID FROM " + self.FINGERPRINT_TABLE + ";")
+        return dict(cur.fetchall())
+
+    # Get every Form ID
+    def form_ids(self):
+        """
+        Gets the ID of every form in the database
+        :return: Set of Form IDs
+        """
+        cur = self.__conn.cursor()
+        cur.execute("SELECT FormID FROM " + self.WORD_FORM_TABLE + ";")
+        return set(row[0] for row in cur.fetchall())
+
+    # Start a bulk load
+    def begin_bulk_load(self, profile=PROFILE_BULK_LOAD):
+        """
+        Starts a bulk load. Inserts no longer commit on their own, and instead
+        share one transaction until end_bulk_load, so the load either lands whole or not at all.
+        The connection switches to a profile for the load, and back once it ends
+        :param profile: Name of the connection profile to load with (None to keep the current one)
+        :return: None
+        """
+        if profile is not None:
+            self.__resume = self.__profile
+            self.apply_profile(profile)
+        self.__bulk = True
+        self.__ids = None  # Seed the IDs fresh for this load
+        self.__rows = 0
+
+    # Finish a bulk load
+    def end_bulk_load(self):
+        """
+        Commits everything inserted during the bulk load, and ends it
+        :return: Number of rows inserted during the bulk load
+        """
         self.__conn.commit()
+        self.__bulk = False
+        self.__ids = None
+        self.__end_profile()
+        return self.__rows
+
+    # Abandon a bulk load
+    def abort_bulk_load(self):
+        """
+        Rolls back everything inserted during the bulk load, and ends it
+        :return: None
+        """
+        self.__conn.rollback()
+        self.__cache.clear()  # Results may have been read from the rolled back rows
+        self.__fuzzy = None
+        self.__analyzer = None
+        self.__bulk = False
+        self.__ids = None  # IDs handed out in the rolled back inserts are free again
+        self.__end_profile()
 
     # Insert into database
-    def insert(self, pos, word=None, form=None):
+    def insert(self, pos, word=None, form=None, fingerprint=None):
         """
         Insert the word into the database
         :param pos: Word to insert (or the form if just the form)
         :param word: Part of Speech (which tables to insert to)
         :param form: Form (Used only with Words)
+        :param fingerprint: Fingerprint of the whole entry, stored with the form (Used only with Forms)
         :return: Success
         """
         if word is None and form is None:
@@ -85,98 +514,288 @@ class Lexicon:
             print "Form cannot be None if Word isn't."
             return False  # Fail if word is not None, but form is
 
-        if pos == Utils.PartOfSpeech.NOUN.value:  # Nouns
-            return self.__insert_noun_form(form) if word is None else self.__insert_noun(word, form)
-        elif pos == Utils.PartOfSpeech.VERB.value:  # Verbs
-            return self.__insert_verb_form(form) if word is None else self.__insert_verb(word, form)
-        elif pos == Utils.PartOfSpeech.ADJECTIVE.value:  # Adjectives
-            return self.__insert_adj_form(form) if word is None else self.__insert_adj(word, form)
-        elif pos == Utils.PartOfSpeech.PRONOUN.value:  # Pronouns
-            return self.__insert_pronoun_form(form) if word is None else self.__insert_pronoun(word, form)
-        elif pos == Utils.PartOfSpeech.PARTICIPLE.value:
-            return False if word is None else self.__insert_participle(word, form)
-        else:  # Others
-            print "Inserting other words"
+        self.__cache.clear()  # Any cached result may be stale after this
+        self.__fuzzy = None
+        self.__analyzer = None
+
+        try:
+            if pos == Utils.PartOfSpeech.NOUN.value:  # Nouns
+                return self.__insert_noun_form(form, fingerprint) if word is None else self.__insert_noun(word, form)
+            elif pos == Utils.PartOfSpeech.VERB.value:  # Verbs
+                return self.__insert_verb_form(form, fingerprint) if word is None else self.__insert_verb(word, form)
+            elif pos == Utils.PartOfSpeech.ADJECTIVE.value:  # Adjectives
+                return self.__insert_adj_form(form, fingerprint) if word is None else self.__insert_adj(word, form)
+            elif pos == Utils.PartOfSpeech.PRONOUN.value:  # Pronouns
+                return self.__insert_pronoun_form(form, fingerprint) if word is None else self.__insert_pronoun(word, form)
+            elif pos == Utils.PartOfSpeech.PARTICIPLE.value:
+                return False if word is None else self.__insert_participle(word, form)
+            else:  # Others
+                print "Inserting other words"
+        except sql.Error, e:  # A failed insert is a bad insert, the caller decides whether to roll back
+            print "Error %s: " % e.args[0]
+            return False
+        return True
+
+    # Insert a batch of entries
+    def insert_entries(self, entries):
+        """
+        Inserts a batch of parsed entries, each one form first and then its words
+        :param entries: List of (Entry, Fingerprint) pairs. An Entry has a part, form and words
+        :return: Success
+        """
+        for entry, fingerprint in entries:
+            # Try to insert that word form into the database
+            if not self.insert(entry.part, form=entry.form, fingerprint=fingerprint):
+                return False
+            # Try to insert the word into the database
+            if not self.insert(entry.part, entry.words, entry.form):
+                return False
         return True
 
     # Select the info of a word
-    def select(self, word, is_verbose=False, is_define=False, is_unaccented=False):
+    def select(self, word, is_unaccented=False):
         """
-        Search the database for the word's info
+        Search the database for the word's info. Results are cached until the next write
         :param word: Word to query
-        :param is_verbose: Whether to only give form info, or full info
-        :param is_define: Whether to include definitions
         :param is_unaccented: Whether the word is unaccented or not (This is useful for enclitics, or words in sentences with enclitics
-        :return: Info, Form, Definitions - each of which are lists
+        :return: WordRecord, or None if the word was not found
+        """
+        return _select_cached(self.__conn.cursor(), self.__cache, word, is_unaccented)
+
+    # Select the info of many words
+    def select_many(self, words, is_unaccented=False):
+        """
+        Search the database for the info of many words at once, with one query on Word Lookups
+        for every IN_SIZE words. Results are shared with the select cache
+        :param words: Words to query
+        :param is_unaccented: Whether the words are unaccented or not
+        :return: Ordered Dictionary mapping each word to its WordRecord, or to None if it was not found
+        """
+        return _select_many(self.__conn.cursor(), self.__cache, words, is_unaccented)
+
+    # Search for words by prefix or wildcard
+    def search(self, pattern, is_unaccented=False, limit=PAGE_SIZE, after=None):
+        """
+        Search the database for words matching a pattern, one page at a time, in name order.
+        A pattern without wildcards is a prefix. Otherwise * matches any run of letters, ? matches one letter,
+        and [...] matches one of a set of letters. The part before the first wildcard bounds a range scan on the index
+        :param pattern: Pattern to match (unicode, or a UTF-8 string)
+        :param is_unaccented: Whether to match the pattern against the unaccented names (accents in it are ignored)
+        :param limit: Most results in the page
+        :param after: Key returned with the previous page, to get the page after it (None for the first page)
+        :return: List of (Word Name, Part of Speech, Form ID), and the key of the next page (None if this is the last)
+        """
+        if isinstance(pattern, str):
+            pattern = pattern.decode("utf-8")
+        if is_unaccented:
+            pattern = Accents.deaccentuate(pattern)
+        if not any(c in pattern for c in self.WILDCARDS):
+            pattern += u"*"
+        prefix = pattern
+        for c in self.WILDCARDS:
+            prefix = prefix.split(c)[0]
+        # Every name starting with the prefix falls in [prefix, prefix with its last letter bumped by one)
+        upper = prefix[:-1] + unichr(ord(prefix[-1]) + 1) if prefix else unichr(0x10FFFF)
+
+        cur = self.__conn.cursor()
+        if after is None:
+            cur.execute(self.SQL_SEARCH_UNACCENTED_WORD if is_unaccented else self.SQL_SEARCH_WORD,
+                        (prefix, upper, pattern, limit + 1))
+        else:
+            cur.execute(self.SQL_SEARCH_UNACCENTED_WORD_AFTER if is_unaccented else self.SQL_SEARCH_WORD_AFTER,
+                        (prefix, upper, pattern) + tuple(after) + (limit + 1,))
+        rows = cur.fetchall()  # At most one page (and one more row, to see if there is a next page)
+        if len(rows) <= limit:
+            return [r[:3] for r in rows], None
+        return [r[:3] for r in rows[:limit]], rows[limit - 1][3:]
+
+    # Get the features that words can be listed by
+    def features(self, pos):
+        """
+        Gets the columns of the Word Table and Form Table of a Part of Speech, which list_words can filter on
+        :param pos: Part of Speech
+        :return: List of column names (Word Table first), or None if the Part of Speech has no tables
+        """
+        if pos not in self.POS_TABLES:
+            return None
+        table, form_table = self.POS_TABLES[pos]
+        return self.__columns(table) + self.__columns(form_table)
+
+    # List the words of a Part of Speech
+    def list_words(self, pos, chapter=None, features=None):
+        """
+        Lists every word of a Part of Speech, optionally only those of a chapter or with some features.
+        Rows are read a page at a time (continuing from the last rowid read), and each page
+        is read FETCH_SIZE rows at a time, so listing starts at once and holds one page at most
+        :param pos: Part of Speech
+        :param chapter: Chapter the words were learned in (None for every chapter)
+        :param features: List of (Column, Value) that the words must have. Columns come from features(pos)
+        :return: Generator of Word Name, Chapter, Info (as in select)
+        """
+        columns = self.features(pos)
+        if columns is None:
+            raise ValueError("Cannot list " + pos + ".")
+        table, form_table = self.POS_TABLES[pos]
+        word_columns = self.__columns(table)
+        filters = ""; values = []
+        if chapter is not None:
+            filters += " AND F.ChapterLearned == ?"
+            values.append(chapter)
+        for column, value in features or []:
+            # Column names cannot be bound, so only ones read from the table itself go into the query
+            if column not in columns:
+                raise ValueError("Unknown feature: " + column + ".")
+            filters += " AND " + ("T." if column in word_columns else "FT.") + '"' + column + '" == ?'
+            values.append(value)
+        return self.__list_pages(self.SQL_LIST % (table, form_table, filters), pos, values)
+
+    # Suggest words near a word that was not found
+    def suggest(self, word, limit=SUGGESTIONS, max_distance=2):
+        """
+        Finds the words in the database nearest to a (probably misspelled or mis-accented) word.
+        Differences in diacritics cost a tenth of other differences
+        :param word: Word (unicode, or a UTF-8 string)
+        :param limit: Most words to suggest
+        :param max_distance: Most letters that may differ, apart from diacritics
+        :return: List of words (UTF-8 strings), nearest first
+        """
+        if self.__fuzzy is None:
+            cur = self.__conn.cursor()
+            cur.execute(self.SQL_SELECT_NAMES)
+            self.__fuzzy = FuzzyIndex.FuzzyIndex(row[0] for row in cur)
+        return [w.encode("utf-8") for d, w in self.__fuzzy.nearest(word, max_distance, limit)]
+
+    # Find words by their definitions
+    def search_english(self, query, limit=ENGLISH_RESULTS):
+        """
+        Finds the forms whose definitions match an English query, through the Definition Terms index,
+        so a search reads only the rows of the query's terms, however many definitions there are.
+        Each form is ranked by its best definition: the more of the query's terms it has, the more of those
+        it has word for word (teach rather than teaching), and the fewer other terms it has, the better
+        :param query: English words (unicode, or a UTF-8 string)
+        :param limit: Most forms to give back
+        :return: List of (Word Name, Part of Speech, Form ID, Definition), best first
         """
         cur = self.__conn.cursor()
+        scores = {}  # (Form ID, Definition) to [Terms Matched, Words Matched, Terms]
+        for term, word in Glosses.terms(query):
+            cur.execute(self.SQL_SELECT_TERM, (term,))
+            for form_id, definition, found, count in cur.fetchall():
+                score = scores.setdefault((form_id, definition), [0, 0, count])
+                score[0] += 1
+                score[1] += found == word
+        best = {}  # Form ID to the sort key of its best definition
+        for (form_id, definition), (terms, words, count) in scores.iteritems():
+            key = (-terms, -words, count, definition)
+            if form_id not in best or key < best[form_id]:
+                best[form_id] = key
+        results = []
+        for key, form_id in sorted((key, form_id) for form_id, key in best.iteritems())[:limit]:
+            cur.execute(self.SQL_SELECT_FACE, (form_id,))
+            row = cur.fetchone()
+            if row is not None:
+                results.append((row[0], row[1], form_id, key[3]))
+        return results
+
+    # Parse a word that is not in the database
+    def analyze(self, word):
+        """
+        Parses a word by its ending against the paradigms of the forms in the database, for words that
+        select does not find (regular words that the text file does not list). The index is built
+        from the Form Tables on the first analysis, and kept until the next write
+        :param word: Word (unicode, or a UTF-8 string)
+        :return: List of WordRecords, best first (empty if none). Their definitions are read when first used
+        """
+        if self.__analyzer is None:
+            cur = self.__conn.cursor()
+            forms = []
+            for pos, query in self.SQL_SELECT_FORMS.iteritems():
+                cur.execute(query)
+                forms += [(row[0], pos, row[1:]) for row in cur.fetchall()]
+            self.__analyzer = Analyzer.Analyzer(forms)
+        source = _Stored(self.__conn)
+        return [WordRecord(name, pos, form_id, info, form, form_id, source)
+                for name, form_id, pos, info, form in self.__analyzer.analyze(word)]
+
+    # Get the cache counters
+    def cache_stats(self):
+        """
+        Gets the hit and miss counters of the select cache
+        :return: Dictionary of Hits, Misses, Size, Capacity
+        """
+        return self.__cache.stats()
+
+    # Check that every lookup query uses an index
+    def check_query_plans(self):
+        """
+        Runs EXPLAIN QUERY PLAN on every query used by select, select_many, search, the Form ID helpers,
+        the definitions of analyze, search_english and the Word Lookups inserts,
+        and finds the ones that scan a whole table
+        :return: Dictionary mapping each query that scans a whole table to its scans (empty if every lookup
+        uses an index)
+        """
+        queries = [(self.SQL_SELECT_LOOKUP, 1), (self.SQL_SELECT_UNACCENTED_LOOKUP, 1),
+                   (self.SQL_FORM_ID_NOUN, 3), (self.SQL_FORM_ID_VERB, 6),
+                   (self.SQL_FORM_ID_ADJ, 3), (self.SQL_FORM_ID_PRO, 3), (self.SQL_SELECT_DEFINITIONS, 1),
+                   (self.SQL_SELECT_TERM, 1), (self.SQL_SELECT_FACE, 1)]
+        queries += [(self.SQL_SELECT_LOOKUPS, self.IN_SIZE), (self.SQL_SELECT_UNACCENTED_LOOKUPS, self.IN_SIZE)]
+        queries += [(q, 3) for q in self.SQL_INSERT_LOOKUPS.itervalues()]
+        queries += [(self.SQL_SEARCH_WORD, 4), (self.SQL_SEARCH_UNACCENTED_WORD, 4),
+                    (self.SQL_SEARCH_WORD_AFTER, 6), (self.SQL_SEARCH_UNACCENTED_WORD_AFTER, 6)]
 
-        # Get the Word ID, Form ID Part of word
-        cur.execute("SELECT WordID, FormID, PartOfSpeech FROM " + self.WORD_TABLE + " WHERE " +
-                    self.WORD_TABLE + (".UnaccentedWordName" if is_unaccented else ".WordName") +
-                    " == '" + word + "';")
-        ids = cur.fetchone()  # If there is more than one, then there is something wrong (THIS PAIR SHOULD BE UNIQUE)
-        if ids is None:  # If there was no match, word cannot be found
-            return None, None, None
-
-        word_id = ids[0]; form_id = ids[1]; part = ids[2]
-
-        info = None; form = None; defs = None
-
-        table = ""; form_table = ""
-        # Switch to see which Table to look at:
-        if part == Utils.PartOfSpeech.VERB.value:
-            table = self.VERB_TABLE
-            form_table = self.VERB_FORM_TABLE
-        elif part == Utils.PartOfSpeech.NOUN.value:
-            table = self.NOUN_TABLE
-            form_table = self.NOUN_FORM_TABLE
-        elif part == Utils.PartOfSpeech.ADJECTIVE.value:
-            table = self.ADJ_TABLE
-            form_table = self.ADJ_FORM_TABLE
-        elif part == Utils.PartOfSpeech.PRONOUN.value:
-            table = self.PRO_TABLE
-            form_table = self.PRO_FORM_TABLE
-        elif part == Utils.PartOfSpeech.PARTICIPLE.value:
-            table = self.PART_TABLE
-            form_table = self.VERB_FORM_TABLE
-        else:
-            print "MISC TABLE"
-        # Get the INFO for that word from the table
-        cur.execute("SELECT * FROM " + table + " WHERE " +
-                    table + ".WordID == " + str(word_id) + " AND " +
-                    table + ".FormID == " + str(form_id) + ";")
-        info = cur.fetchone()[2:]  # Again, there should ONLY be ONE.
-        #  Ignore the first two (word id and form id)
-
-        # Get Form if verbose
-        if is_verbose:
-            cur.execute("SELECT * FROM " + form_table + " WHERE " +
-                        form_table + ".FormID == " + str(form_id) + ";")
-            form = cur.fetchone()[1:] # Ignore the first column (first id)
-
-        if is_define:
-            cur.execute("SELECT Definition FROM " + self.DEF_TABLE + " WHERE " +
-                        self.DEF_TABLE + ".FormID == " + str(form_id) + ";")
-            defs = cur.fetchall()  # There can be more than one
-
-        return info, form, defs
-
-        # Look up the word in Words (If unaccented, look at unaccented column instead)
-        # Get WordID, FormID, and PartOfSpeech
-        # Based on PartOfSpeech, look at relevant table
-        # Get All from relevant word table (not form table) by matching wordID and formID
-        # If verbose, then look at relevant form table, and select everything by matching formID + Chapter from WordForms
-        # If define, then look at definitions table, and select everything by matching formID
-        # return the triple: Info from Word Table, Form from Verbose, Defs from Define
+        cur = self.__conn.cursor()
+        unindexed = {}
+        for query, n in queries:
+            cur.execute("EXPLAIN QUERY PLAN " + query, ("",) * n)  # The values do not matter to the plan
+            plan = [row[-1] for row in cur.fetchall()]  # The last column is the plan detail
+            # A subquery scan only reads rows the query already found, so only table scans count
+            scans = [p for p in plan if p.startswith("SCAN") and "SUBQUERY" not in p.upper()]
+            if scans:
+                unindexed[query] = scans
+        return unindexed
+
+    # List Helper Methods
+    # Read a list query page by page
+    def __list_pages(self, query, pos, values):
+        """
+        Runs a list query one page at a time, each page continuing after the last rowid of the one before
+        :param query: List query
+        :param pos: Part of Speech
+        :param values: Values of the filters
+        :return: Generator of Word Name, Chapter, Info
+        """
+        cur = self.__conn.cursor()
+        last = -1
+        while True:
+            cur.execute(query, [pos, last] + values + [self.LIST_PAGE_SIZE])
+            count = 0
+            rows = cur.fetchmany(self.FETCH_SIZE)
+            while rows:
+                for row in rows:
+                    yield row[1], row[2], row[5:]  # Ignore the rowid, and the word id and form id
+                count += len(rows)
+                last = rows[-1][0]
+                rows = cur.fetchmany(self.FETCH_SIZE)
+            if count < self.LIST_PAGE_SIZE:
+                return
+
+    # Get the columns of a table
+    def __columns(self, table):
+        """
+        :param table: Table
+        :return: List of the column names of the table, other than the IDs
+        """
+        cur = self.__conn.cursor()
+        cur.execute("PRAGMA table_info(" + table + ");")
+        return [row[1] for row in cur.fetchall() if row[1] not in ("WordID", "FormID")]
 
     # Insert Helper Methods
     # Insert a Noun
     def __insert_noun(self, noun, form):
         """
         Insert a Noun
-        :param noun: Noun - list that contains word info
-        :param form: Noun Form list
+        :param noun: Nouns - word to its parses
+        :param form: Noun Form
         :return: Success
         """
         # Check if the Word Form exists --This must exist, or else fail
@@ -184,29 +803,36 @@ class Lexicon:
         if form_id is None:
             return False
 
-        # Insert every Noun:
+        # Get the next local ID
+        first = word_id = self.__get_local_id(form_id, sum(len(l) for l in noun.itervalues()))
+
+        # Gather every Noun:
+        words = []; nouns = []
         for n, l in noun.iteritems():
             for i in l:
-                # Get the next local ID
-                word_id = self.__get_local_id(form_id)
+                words.append((word_id, form_id, Utils.PartOfSpeech.NOUN.value, n))
+                nouns.append((word_id, form_id, i.case, i.number, i.gender))
+                word_id += 1
 
-                # Insert
-                self.__sql_insert_words(n, word_id, form_id, Utils.PartOfSpeech.NOUN)
-                self.__sql_insert_nouns(word_id, form_id, i[0], i[1], i[2])
+        # Insert
+        self.__sql_insert_words(words)
+        self.__sql_insert_nouns(nouns)
+        self.__sql_insert_lookups(self.NOUN_TABLE, form_id, first, word_id - 1)
 
-        self.__conn.commit()
+        self.__commit()
         return True
 
     # Insert a Noun Form
-    def __insert_noun_form(self, noun):
+    def __insert_noun_form(self, noun, fingerprint=None):
         """
         Insert a Noun Form
         :param noun: Noun Form
+        :param fingerprint: Fingerprint of the entry, or None
         :return: Success
         """
 
         # Check if the Word Form exists --it shouldn't exist or else we are re-adding
-        form_id = self.__get_form_id(noun[:3], Utils.PartOfSpeech.NOUN)
+        form_id = self.__get_form_id(noun, Utils.PartOfSpeech.NOUN)
         if form_id is not None:
             return False
 
@@ -214,17 +840,20 @@ class Lexicon:
         form_id = self.__get_next_form_id()
 
         # Insert into WordForms --FormID, pos
-        self.__sql_insert_word_forms(form_id, Utils.PartOfSpeech.NOUN, noun[7])
+        self.__sql_insert_word_forms(form_id, Utils.PartOfSpeech.NOUN, noun.chapter)
 
-        # Insert into NounForms --Nominative, Genitive, Article, Gender, Dec, Dec2, Irr
-        self.__sql_insert_noun_forms(form_id, noun[0], noun[1], noun[2], noun[3], noun[4], noun[5], noun[6])
+        # Insert into NounForms --Nominative, Genitive, Article, Dec, Dec2, Gender, Irr
+        self.__sql_insert_noun_forms(form_id, noun.nominative, noun.genitive, noun.article, noun.major, noun.minor,
+                                     noun.gender, noun.irregularity)
 
         # Insert into Definitions
-        definitions = noun[8:]
-        for d in definitions:
-            self.__sql_insert_definition(form_id, d)
+        self.__sql_insert_definition([(form_id, d) for d in noun.definitions])
 
-        self.__conn.commit()
+        # Remember which entry the form came from
+        if fingerprint is not None:
+            self.__execute_many(self.SQL_INSERT[self.FINGERPRINT_TABLE], [(fingerprint, form_id)])
+
+        self.__commit()
         return True
 
     # Insert a Verb
@@ -240,27 +869,34 @@ class Lexicon:
         if form_id is None:
             return False
 
+        # Get next local ID
+        first = word_id = self.__get_local_id(form_id, sum(len(l) for l in verb.itervalues()))
+
+        words = []; verbs = []
         for v, l in verb.iteritems():
             for i in l:
-                # Get next local ID
-                word_id = self.__get_local_id(form_id)
+                words.append((word_id, form_id, Utils.PartOfSpeech.VERB.value, v))
+                verbs.append((word_id, form_id, i.person, i.number, i.tense, i.voice, i.mood))
+                word_id += 1
 
-                # Insert
-                self.__sql_insert_words(v, word_id, form_id, Utils.PartOfSpeech.VERB)
-                self.__sql_insert_verbs(word_id, form_id, i[0], i[1], i[2], i[3], i[4])
+        # Insert
+        self.__sql_insert_words(words)
+        self.__sql_insert_verbs(verbs)
+        self.__sql_insert_lookups(self.VERB_TABLE, form_id, first, word_id - 1)
 
-        self.__conn.commit()
+        self.__commit()
         return True
 
     # Insert Verb Form
-    def __insert_verb_form(self, verb):
+    def __insert_verb_form(self, verb, fingerprint=None):
         """
         Insert a Verb Form
         :param verb: Verb Form
+        :param fingerprint: Fingerprint of the entry, or None
         :return: Success
         """
         # Check if word form exists
-        form_id = self.__get_form_id(verb[:6], Utils.PartOfSpeech.VERB)
+        form_id = self.__get_form_id(verb, Utils.PartOfSpeech.VERB)
         if form_id is not None:
             return False
 
@@ -268,18 +904,20 @@ class Lexicon:
         form_id = self.__get_next_form_id()
 
         # Insert into Word Forms
-        self.__sql_insert_word_forms(form_id, Utils.PartOfSpeech.VERB, verb[12])
+        self.__sql_insert_word_forms(form_id, Utils.PartOfSpeech.VERB, verb.chapter)
         # Insert into Verb Forms
-        self.__sql_insert_verb_forms(form_id, verb[0], verb[1], verb[2], verb[3],
-                                     verb[4], verb[5], verb[6], verb[7], verb[8],
-                                     verb[9], verb[10], verb[11])
+        self.__sql_insert_verb_forms(form_id, verb.first, verb.second, verb.third, verb.fourth,
+                                     verb.fifth, verb.sixth, verb.ending, verb.contraction, verb.aorist,
+                                     verb.perfect, verb.deponency, verb.irregularity)
 
         # Insert into Definitions
-        definitions = verb[13:]
-        for d in definitions:
-            self.__sql_insert_definition(form_id, d)
+        self.__sql_insert_definition([(form_id, d) for d in verb.definitions])
 
-        self.__conn.commit()
+        # Remember which entry the form came from
+        if fingerprint is not None:
+            self.__execute_many(self.SQL_INSERT[self.FINGERPRINT_TABLE], [(fingerprint, form_id)])
+
+        self.__commit()
         return True
 
     # Insert Adjective
@@ -296,28 +934,35 @@ class Lexicon:
         if form_id is None:
             return False
 
+        # Get next local ID
+        first = word_id = self.__get_local_id(form_id, sum(len(l) for l in adj.itervalues()))
+
+        words = []; adjs = []
         for a, l in adj.iteritems():
             for i in l:
-                # Get next local ID
-                word_id = self.__get_local_id(form_id)
+                words.append((word_id, form_id, Utils.PartOfSpeech.ADJECTIVE.value, a))
+                adjs.append((word_id, form_id, i.case, i.number, i.gender))
+                word_id += 1
 
-                # Insert
-                self.__sql_insert_words(a, word_id, form_id, Utils.PartOfSpeech.ADJECTIVE)
-                self.__sql_insert_adj(word_id, form_id, i[0], i[1], i[2])
+        # Insert
+        self.__sql_insert_words(words)
+        self.__sql_insert_adj(adjs)
+        self.__sql_insert_lookups(self.ADJ_TABLE, form_id, first, word_id - 1)
 
-        self.__conn.commit()
+        self.__commit()
         return True
 
     # Insert Adjective Form
-    def __insert_adj_form(self, adj):
+    def __insert_adj_form(self, adj, fingerprint=None):
         """
         Insert an Adjective Form
         :param adj: Adj Form
+        :param fingerprint: Fingerprint of the entry, or None
         :return: Success
         """
 
         # Check for Word Form
-        form_id = self.__get_form_id(adj[:3], Utils.PartOfSpeech.ADJECTIVE)
+        form_id = self.__get_form_id(adj, Utils.PartOfSpeech.ADJECTIVE)
         if form_id is not None:
             return False
 
@@ -325,17 +970,20 @@ class Lexicon:
         form_id = self.__get_next_form_id()
 
         # Insert into Word Forms
-        self.__sql_insert_word_forms(form_id, Utils.PartOfSpeech.ADJECTIVE, adj[6])
+        self.__sql_insert_word_forms(form_id, Utils.PartOfSpeech.ADJECTIVE, adj.chapter)
 
         # Insert into Adj Forms
-        self.__sql_insert_adj_forms(form_id, adj[0], adj[1], adj[2], adj[3], adj[4], adj[5])
+        self.__sql_insert_adj_forms(form_id, adj.masculine, adj.feminine, adj.neuter, adj.major, adj.minor,
+                                    adj.irregularity)
 
         # Insert into Definitions
-        definitions = adj[7:]
-        for d in definitions:
-            self.__sql_insert_definition(form_id, d)
+        self.__sql_insert_definition([(form_id, d) for d in adj.definitions])
 
-        self.__conn.commit()
+        # Remember which entry the form came from
+        if fingerprint is not None:
+            self.__execute_many(self.SQL_INSERT[self.FINGERPRINT_TABLE], [(fingerprint, form_id)])
+
+        self.__commit()
         return True
 
     # Insert Pronoun
@@ -352,28 +1000,35 @@ class Lexicon:
         if form_id is None:
             return False
 
+        # Get next local ID
+        first = word_id = self.__get_local_id(form_id, sum(len(l) for l in pro.itervalues()))
+
+        words = []; pros = []
         for p, l in pro.iteritems():
             for i in l:
-                # Get next local ID
-                word_id = self.__get_local_id(form_id)
+                words.append((word_id, form_id, Utils.PartOfSpeech.PRONOUN.value, p))
+                pros.append((word_id, form_id, i.case, i.number, i.gender, i.person))
+                word_id += 1
 
-                # Insert
-                self.__sql_insert_words(p, word_id, form_id, Utils.PartOfSpeech.PRONOUN)
-                self.__sql_insert_pro(word_id, form_id, i[0], i[1], i[2], i[3])
+        # Insert
+        self.__sql_insert_words(words)
+        self.__sql_insert_pro(pros)
+        self.__sql_insert_lookups(self.PRO_TABLE, form_id, first, word_id - 1)
 
-        self.__conn.commit()
+        self.__commit()
         return True
 
     # Insert Pronoun Form
-    def __insert_pronoun_form(self, pro):
+    def __insert_pronoun_form(self, pro, fingerprint=None):
         """
         Insert P Form
         :param pro: P Form
+        :param fingerprint: Fingerprint of the entry, or None
         :return: Success
         """
 
         # Check for Word Form
-        form_id = self.__get_form_id(pro[:3], Utils.PartOfSpeech.PRONOUN)
+        form_id = self.__get_form_id(pro, Utils.PartOfSpeech.PRONOUN)
         if form_id is not None:
             return False
 
@@ -381,17 +1036,19 @@ class Lexicon:
         form_id = self.__get_next_form_id()
 
         # Insert into Word Forms
-        self.__sql_insert_word_forms(form_id, Utils.PartOfSpeech.PRONOUN, pro[5])
+        self.__sql_insert_word_forms(form_id, Utils.PartOfSpeech.PRONOUN, pro.chapter)
 
         # Insert into Pro Forms
-        self.__sql_insert_pro_forms(form_id, pro[0], pro[1], pro[2], pro[3], pro[4])
+        self.__sql_insert_pro_forms(form_id, pro.masculine, pro.feminine, pro.neuter, pro.person, pro.type)
 
         # Insert into Definitions
-        definitions = pro[6:]
-        for d in definitions:
-            self.__sql_insert_definition(form_id, d)
+        self.__sql_insert_definition([(form_id, d) for d in pro.definitions])
 
-        self.__conn.commit()
+        # Remember which entry the form came from
+        if fingerprint is not None:
+            self.__execute_many(self.SQL_INSERT[self.FINGERPRINT_TABLE], [(fingerprint, form_id)])
+
+        self.__commit()
         return True
 
     # Insert Participle
@@ -408,18 +1065,24 @@ class Lexicon:
         if form_id is None:
             return False
 
+        # Get next local ID
+        first = word_id = self.__get_local_id(form_id, sum(len(l) for l in part.itervalues()))
+
+        words = []; parts = []
         for p, l in part.iteritems():
             for i in l:
-                # Get next local ID
-                word_id = self.__get_local_id(form_id)
+                words.append((word_id, form_id, Utils.PartOfSpeech.PARTICIPLE.value, p))
+                parts.append((word_id, form_id, i.case, i.number, i.gender, i.tense, i.voice))
+                word_id += 1
 
-                # Insert into Words
-                self.__sql_insert_words(p, word_id, form_id, Utils.PartOfSpeech.PARTICIPLE)
+        # Insert into Words
+        self.__sql_insert_words(words)
 
-                # Insert into Participles
-                self.__sql_insert_part(word_id, form_id, i[0], i[1], i[2], i[3], i[4])
+        # Insert into Participles
+        self.__sql_insert_part(parts)
+        self.__sql_insert_lookups(self.PART_TABLE, form_id, first, word_id - 1)
 
-        self.__conn.commit()
+        self.__commit()
         return True
 
     # Select Query Helpers
@@ -450,10 +1113,7 @@ class Lexicon:
         :return: ID or None
         """
         cur = self.__conn.cursor()
-        cur.execute("SELECT FormID FROM " + self.NOUN_FORM_TABLE + " WHERE " +
-                    self.NOUN_FORM_TABLE + ".Nominative == '" + form[0] + "' AND " +
-                    self.NOUN_FORM_TABLE + ".Genitive == '" + form[1] + "' AND " +
-                    self.NOUN_FORM_TABLE + ".Article == '" + form[2] + "';")
+        cur.execute(self.SQL_FORM_ID_NOUN, (form.nominative, form.genitive, form.article))
         data = cur.fetchone()  # There should be only one form or None
         return data[0] if data is not None else None
 
@@ -465,13 +1125,8 @@ class Lexicon:
         :return: ID or None
         """
         cur = self.__conn.cursor()
-        cur.execute("SELECT FormID FROM " + self.VERB_FORM_TABLE + " WHERE " +
-                    self.VERB_FORM_TABLE + ".FirstPrincipalPart == '" + form[0] + "' AND " +
-                    self.VERB_FORM_TABLE + ".SecondPrincipalPart == '" + form[1] + "' AND " +
-                    self.VERB_FORM_TABLE + ".ThirdPrincipalPart == '" + form[2] + "' AND " +
-                    self.VERB_FORM_TABLE + ".FourthPrincipalPart == '" + form[3] + "' AND " +
-                    self.VERB_FORM_TABLE + ".FifthPrincipalPart == '" + form[4] + "' AND " +
-                    self.VERB_FORM_TABLE + ".SixthPrincipalPart == '" + form[5] + "';")
+        cur.execute(self.SQL_FORM_ID_VERB, (form.first, form.second, form.third,
+                                            form.fourth, form.fifth, form.sixth))
         data = cur.fetchone()  # There should be only one form or None
         return data[0] if data is not None else None
 
@@ -483,10 +1138,7 @@ class Lexicon:
         :return: ID or None
         """
         cur = self.__conn.cursor()
-        cur.execute("SELECT * FROM " + self.ADJ_FORM_TABLE + " WHERE " +
-                    self.ADJ_FORM_TABLE + ".Masculine == '" + form[0] + "' AND " +
-                    self.ADJ_FORM_TABLE + ".Feminine == '" + form[1] + "' AND " +
-                    self.ADJ_FORM_TABLE + ".Neuter == '" + form[2] + "';")
+        cur.execute(self.SQL_FORM_ID_ADJ, (form.masculine, form.feminine, form.neuter))
         data = cur.fetchone()  # There should be only one form or None
         return data[0] if data is not None else None
 
@@ -498,173 +1150,152 @@ class Lexicon:
         :return: ID or None
         """
         cur = self.__conn.cursor()
-        cur.execute("SELECT * FROM " + self.PRO_FORM_TABLE + " WHERE " +
-                    self.PRO_FORM_TABLE + ".Masculine == '" + form[0] + "' AND " +
-                    self.PRO_FORM_TABLE + ".Feminine == '" + form[1] + "' AND " +
-                    self.PRO_FORM_TABLE + ".Neuter == '" + form[2] + "';")
+        cur.execute(self.SQL_FORM_ID_PRO, (form.masculine, form.feminine, form.neuter))
         data = cur.fetchone()  # There should be only one form or None
         return data[0] if data is not None else None
 
-    # Word ID Select Method
-    def __get_local_id(self, form_id):
+    # Word ID Method
+    def __get_local_id(self, form_id, count=1):
         """
-        Get the next Word ID of a form
+        Get the next Word IDs of a form
         :param form_id: Form ID
-        :return: Word ID or 0 (if there are no words for that form yet)
+        :param count: Number of Word IDs needed
+        :return: The first Word ID, or 0 (if there are no words for that form yet)
         """
-        cur = self.__conn.cursor()
-        cur.execute("SELECT MAX(WordID) FROM " + self.WORD_TABLE + " WHERE " +
-                    self.WORD_TABLE + ".FormID == " + str(form_id) + ";")
-        data = cur.fetchone()  # There should be only one
-        return data[0] + 1 if data[0] is not None else 0
+        return self.__allocator().next_word_id(form_id, count)
 
-    # Next Form ID Select Method
+    # Next Form ID Method
     def __get_next_form_id(self):
         """
         Get the next Form ID
         :return: Form ID or 0 (if there are no forms yet)
         """
+        return self.__allocator().next_form_id()
+
+    # Get the ID Allocator
+    def __allocator(self):
+        """
+        Gets the ID Allocator, seeding it from the database if this is the first insert of the session
+        :return: ID Allocator
+        """
+        if self.__ids is None:
+            self.__ids = IdAllocator(self.__conn)
+        return self.__ids
+
+    # Transaction Helpers
+    # Go back to the profile from before the bulk load
+    def __end_profile(self):
+        """
+        :return: None
+        """
+        if self.__resume is not None:
+            self.apply_profile(self.__resume)
+            self.__resume = None
+
+    # Commit an insert
+    def __commit(self):
+        """
+        Commits an insert, unless a bulk load is holding the transaction open
+        :return: None
+        """
+        if not self.__bulk:
+            self.__conn.commit()
+
+    # Run a batched insert
+    def __execute_many(self, query, rows):
+        """
+        Executes one insert query for a batch of rows
+        :param query: Insert query, with a ? for each column
+        :param rows: List of row tuples
+        :return: None
+        """
+        if not rows:
+            return
         cur = self.__conn.cursor()
-        cur.execute("SELECT MAX(FormID) FROM " + self.WORD_FORM_TABLE + ";")
-        data = cur.fetchone()
-        return (data[0] + 1) if data[0] is not None else 0
+        cur.executemany(query, rows)
+        self.__rows += len(rows)
 
     # SQL Insert Methods
     # Insert Definition SQLite
-    def __sql_insert_definition(self, form_id, definition):
+    def __sql_insert_definition(self, rows):
         """
-        Executes an SQLite insert query for definitions
-        :param form_id: Form
-        :param definition: Defs
+        Executes an SQLite insert query for definitions, and for their terms
+        :param rows: List of (Form ID, Definition)
         :return: None
         """
-        cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.DEF_TABLE + " VALUES( " +
-                    str(form_id) + ", '" +
-                    definition + "');")
+        self.__execute_many(self.SQL_INSERT[self.DEF_TABLE], rows)
+        self.__execute_many(self.SQL_INSERT[self.TERM_TABLE], _term_rows(rows))
 
     # Insert Word SQLite
-    def __sql_insert_words(self, name, word_id, form_id, pos):
+    def __sql_insert_words(self, rows):
         """
-        Executes an SQLite insert query for words
-        :param name: Word String Name
-        :param word_id: Word ID
-        :param form_id: Form ID
-        :param pos: Part of Speech
+        Executes an SQLite insert query for words, adding the Unaccented Name of each
+        :param rows: List of (Word ID, Form ID, Part of Speech, Word String Name)
         :return: None
         """
-        cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.WORD_TABLE + " VALUES( " +
-                    str(word_id) + ", " +
-                    str(form_id) + ", '" +
-                    pos.value + "', '" +
-                    name + "', '" +
-                    self.__deaccentuate(name) + "');")
+        unaccented = Accents.deaccentuate_all([r[3] for r in rows])
+        self.__execute_many(self.SQL_INSERT[self.WORD_TABLE], [r + (u,) for r, u in zip(rows, unaccented)])
 
     # Insert Noun SQLite
-    def __sql_insert_nouns(self, word_id, form_id, case, number, gender):
+    def __sql_insert_nouns(self, rows):
         """
         Executes an SQLite insert query for nouns
-        :param word_id: Word ID
-        :param form_id: Form ID
-        :param case: Case
-        :param number: Number
-        :param gender: Gender
+        :param rows: List of (Word ID, Form ID, Case, Number, Gender)
         :return: None
         """
-        cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.NOUN_TABLE + " VALUES( " +
-                    str(word_id) + ", " +
-                    str(form_id) + ", '" +
-                    case + "', '" +
-                    number + "', '" +
-                    gender + "');")
+        self.__execute_many(self.SQL_INSERT[self.NOUN_TABLE], rows)
 
     # Insert Verbs SQLite
-    def __sql_insert_verbs(self, word_id, form_id, person, number, tense, voice, mood):
+    def __sql_insert_verbs(self, rows):
         """
         Executes an SQLite insert query for verbs
-        :param word_id: Word ID
-        :param form_id: Form ID
-        :param person: Person
-        :param number: Number
-        :param tense: Tense
-        :param voice: Voice
-        :param mood: Mood
+        :param rows: List of (Word ID, Form ID, Person, Number, Tense, Voice, Mood)
         :return: None
         """
-        cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.VERB_TABLE + " VALUES( " +
-                    str(word_id) + ", " +
-                    str(form_id) + ", '" +
-                    person + "', '" +
-                    number + "', '" +
-                    tense + "', '" +
-                    voice + "', '" +
-                    mood + "');")
+        self.__execute_many(self.SQL_INSERT[self.VERB_TABLE], rows)
 
     # Insert Adj SQLite
-    def __sql_insert_adj(self, word_id, form_id, case, number, gender):
+    def __sql_insert_adj(self, rows):
         """
         Executes an SQLite insert query for adj
-        :param word_id: Word ID
-        :param form_id: Form ID
-        :param case: Case
-        :param number: Number
-        :param gender: Gender
+        :param rows: List of (Word ID, Form ID, Case, Number, Gender)
         :return: None
         """
-        cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.ADJ_TABLE + " VALUES( " +
-                    str(word_id) + ", " +
-                    str(form_id) + ", '" +
-                    case + "', '" +
-                    number + "', '" +
-                    gender + "');")
+        self.__execute_many(self.SQL_INSERT[self.ADJ_TABLE], rows)
 
     # Insert Pro SQLite
-    def __sql_insert_pro(self, word_id, form_id, case, number, gender, person):
+    def __sql_insert_pro(self, rows):
         """
         Executes an SQLite insert query for pros
-        :param word_id: Word ID
-        :param form_id: Form ID
-        :param case: Case
-        :param number: Number
-        :param gender: Gender
-        :param person: Person
+        :param rows: List of (Word ID, Form ID, Case, Number, Gender, Person)
         :return: None
         """
-        cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.PRO_TABLE + " VALUES( " +
-                    str(word_id) + ", " +
-                    str(form_id) + ", '" +
-                    case + "', '" +
-                    number + "', '" +
-                    gender + "', '" +
-                    person + "');")
+        self.__execute_many(self.SQL_INSERT[self.PRO_TABLE], rows)
 
     # Insert Part SQLite
-    def __sql_insert_part(self, word_id, form_id, case, number, gender, tense, voice):
+    def __sql_insert_part(self, rows):
         """
         Executes an SQLite insert query for participles
-        :param word_id: Word ID
+        :param rows: List of (Word ID, Form ID, Case, Number, Gender, Tense, Voice)
+        :return: None
+        """
+        self.__execute_many(self.SQL_INSERT[self.PART_TABLE], rows)
+
+    # Insert Word Lookups SQLite
+    def __sql_insert_lookups(self, table, form_id, first, last):
+        """
+        Packs the words just inserted for a form into Word Lookups, straight from the tables they went into
+        :param table: Word Table the words went into
         :param form_id: Form ID
-        :param case: Case
-        :param number: Number
-        :param gender: Gender
-        :param tense: Tense
-        :param voice: Voice
+        :param first: First Word ID inserted
+        :param last: Last Word ID inserted
         :return: None
         """
+        if last < first:
+            return
         cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.PART_TABLE + " VALUES( " +
-                    str(word_id) + ", " +
-                    str(form_id) + ", '" +
-                    case + "', '" +
-                    number + "', '" +
-                    gender + "', '" +
-                    tense + "', '" +
-                    voice + "');")
+        cur.execute(self.SQL_INSERT_LOOKUPS[table], (form_id, first, last))
+        self.__rows += cur.rowcount
 
     # Insert Word Forms
     def __sql_insert_word_forms(self, form_id, pos, c):
@@ -675,36 +1306,24 @@ class Lexicon:
         :param c: Chapter
         :return: None
         """
-        cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.WORD_FORM_TABLE + " VALUES( " +
-                    str(form_id) + ", '" +
-                    pos.value + "', " +
-                    str(c) + ");")
+        self.__execute_many(self.SQL_INSERT[self.WORD_FORM_TABLE], [(form_id, pos.value, c)])
 
     # Insert Noun Forms
-    def __sql_insert_noun_forms(self, form_id, nominative, genitive, article, gender, major, minor, irr):
+    def __sql_insert_noun_forms(self, form_id, nominative, genitive, article, major, minor, gender, irr):
         """
         Executes an SQLite insert query for noun forms
         :param form_id: Form ID
         :param nominative: N
         :param genitive: G
         :param article: A
-        :param gender: Gender
         :param major: Major
         :param minor: Minor
+        :param gender: Gender
         :param irr: Irregular
         :return: None
         """
-        cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.NOUN_FORM_TABLE + " VALUES( " +
-                    str(form_id) + ", '" +
-                    nominative + "', '" +
-                    genitive + "', '" +
-                    article + "', '" +
-                    gender + "', '" +
-                    major + "', '" +
-                    minor + "', '" +
-                    irr + "');")
+        self.__execute_many(self.SQL_INSERT[self.NOUN_FORM_TABLE],
+                            [(form_id, nominative, genitive, article, major, minor, gender, irr)])
 
     # Insert Verb Forms
     def __sql_insert_verb_forms(self, form_id, first, second,
@@ -727,21 +1346,9 @@ class Lexicon:
         :param irr: Whether the verb conjugates regularly
         :return: None
         """
-        cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.VERB_FORM_TABLE + " VALUES( '" +
-                    str(form_id) + "', '" +
-                    first + "', '" +
-                    second + "', '" +
-                    third + "', '" +
-                    fourth + "', '" +
-                    fifth + "', '" +
-                    sixth + "', '" +
-                    ending + "', '" +
-                    contract + "', '" +
-                    aorist + "', '" +
-                    perfect + "', '" +
-                    deponent + "', '" +
-                    irr + "');")
+        self.__execute_many(self.SQL_INSERT[self.VERB_FORM_TABLE],
+                            [(form_id, first, second, third, fourth, fifth, sixth,
+                              ending, contract, aorist, perfect, deponent, irr)])
 
     # Insert Adj Forms
     def __sql_insert_adj_forms(self, form_id, masculine, feminine, neuter, major, minor, irr):
@@ -756,15 +1363,8 @@ class Lexicon:
         :param irr: Irregularity
         :return: None
         """
-        cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.ADJ_FORM_TABLE + " VALUES( " +
-                    str(form_id) + ", '" +
-                    masculine + "', '" +
-                    feminine + "', '" +
-                    neuter + "', '" +
-                    major + "', '" +
-                    minor + "', '" +
-                    irr + "');")
+        self.__execute_many(self.SQL_INSERT[self.ADJ_FORM_TABLE],
+                            [(form_id, masculine, feminine, neuter, major, minor, irr)])
 
     # Insert Pronoun Forms
     def __sql_insert_pro_forms(self, form_id, masculine, feminine, neuter, person, kind):
@@ -778,40 +1378,434 @@ class Lexicon:
         :param kind: type of pronoun
         :return:None
         """
+        self.__execute_many(self.SQL_INSERT[self.PRO_FORM_TABLE],
+                            [(form_id, masculine, feminine, neuter, person, kind)])
+
+
+# Set the PRAGMAs of a profile
+def _apply_pragmas(cur, pragmas):
+    """
+    Sets PRAGMAs in order. A journal_mode change that another connection is blocking is skipped, and the
+    database keeps the journal mode it has; any other failure is raised
+    :param cur: Cursor of the connection
+    :param pragmas: List of (PRAGMA, Value)
+    :return: None
+    """
+    for pragma, value in pragmas:
+        try:
+            cur.execute("PRAGMA " + pragma + " = " + str(value) + ";")
+            cur.fetchall()
+        except sql.OperationalError, e:
+            if pragma != "journal_mode" or "locked" not in str(e) and "busy" not in str(e):
+                raise
+
+
+# Get the Definition Terms rows of some definitions
+def _term_rows(rows):
+    """
+    :param rows: List of (Form ID, Definition)
+    :return: List of (Term, Form ID, Definition, Word, Terms)
+    """
+    out = []
+    for form_id, definition in rows:
+        terms = Glosses.terms(definition)
+        out += [(term, form_id, definition, word, len(terms)) for term, word in terms]
+    return out
+
+
+# Class that holds what select finds for a word
+class WordRecord(object):
+    """
+    WordRecord is what select gives back for a word: its Name (as the database writes it), Part of Speech,
+    Form ID and Info, which are read at once, and its Form and Definitions, which are only unpacked from what
+    the lookup read when they are first used, and then kept. Info, Form and Definitions are tuples of
+    UTF-8 strings (None for NULL), and features and form_features name them.
+    A record is never changed once made, so one record is shared by everyone the cache hands it to.
+    It is a new-style class, since only those can have __slots__
+    """
+    __slots__ = ("name", "part", "form_id", "info", "__packed_form", "__packed_definitions", "__form",
+                 "__definitions", "__source")
+
+    # Constructor
+    def __init__(self, name, part, form_id, info, form, definitions, source):
+        """
+        Constructor for WordRecord
+        :param name: Word Name
+        :param part: Part of Speech
+        :param form_id: Form ID
+        :param info: Tuple of the Word Table columns
+        :param form: Form, as the source keeps it
+        :param definitions: Definitions, as the source keeps them
+        :param source: Anything with unpack_form and unpack_definitions, to unpack them with
+        """
+        self.name = name
+        self.part = part
+        self.form_id = form_id
+        self.info = info
+        self.__packed_form = form
+        self.__packed_definitions = definitions
+        self.__form = _UNREAD
+        self.__definitions = _UNREAD
+        self.__source = source
+
+    # Get the form
+    @property
+    def form(self):
+        """
+        :return: Tuple of the Form Table columns, or None if the word has no form
+        """
+        if self.__form is _UNREAD:  # Two threads may both unpack it, but they get the same thing
+            self.__form = self.__source.unpack_form(self.__packed_form)
+        return self.__form
+
+    # Get the definitions
+    @property
+    def definitions(self):
+        """
+        :return: Tuple of definitions, in order (empty if there are none)
+        """
+        if self.__definitions is _UNREAD:
+            self.__definitions = self.__source.unpack_definitions(self.__packed_definitions)
+        return self.__definitions
+
+    # Get the info by name
+    @property
+    def features(self):
+        """
+        :return: Ordered Dictionary mapping each Word Table column to its value in Info
+        """
+        return OrderedDict(zip(self.__columns(Lexicon.INFO_COLUMNS), self.info))
+
+    # Get the form by name
+    @property
+    def form_features(self):
+        """
+        :return: Ordered Dictionary mapping each Form Table column to its value in Form (empty if there is no form)
+        """
+        return OrderedDict(zip(self.__columns(Lexicon.FORM_COLUMNS), self.form or ()))
+
+    def __repr__(self):
+        return "WordRecord(%r, %r, %r, %r)" % (self.name, self.part, self.form_id, self.info)
+
+    # Get the columns of the record's Part of Speech
+    def __columns(self, columns):
+        """
+        :param columns: INFO_COLUMNS or FORM_COLUMNS
+        :return: List of column names
+        """
+        tables = Lexicon.POS_TABLES.get(self.part)
+        return columns.get(tables[0], []) if tables is not None else []
+
+
+_UNREAD = object()  # Stands for a form or definitions that WordRecord has not unpacked yet
+_UNCACHED = object()  # What the cache gives back for a word it does not have (None is a word that was not found)
+
+
+# Class that unpacks the packed columns of Word Lookups
+class _Packed:
+    """
+    _Packed is the source of the records made from Word Lookups rows
+    """
+    # Unpack a form
+    def unpack_form(self, packed):
+        """
+        :param packed: Packed Form, or None
+        :return: Tuple of columns, or None
+        """
+        if packed is None:
+            return None
+        return tuple(None if v == Lexicon.NULL_MARKER else v for v in packed.split(Lexicon.SEPARATOR))
+
+    # Unpack definitions
+    def unpack_definitions(self, packed):
+        """
+        :param packed: Packed Definitions, or None
+        :return: Tuple of definitions
+        """
+        return tuple(packed.split(Lexicon.SEPARATOR)) if packed is not None else ()
+
+
+_PACKED = _Packed()
+
+
+# Class that reads the definitions of a record from the database
+class _Stored:
+    """
+    _Stored is the source of the records that analyze makes: the form is already there,
+    and the definitions are read by Form ID when they are first used
+    """
+    __conn = None   # Connection to the database
+
+    def __init__(self, conn):
+        self.__conn = conn
+
+    # Unpack a form
+    def unpack_form(self, form):
+        """
+        :param form: Form
+        :return: The same form
+        """
+        return form
+
+    # Read definitions
+    def unpack_definitions(self, form_id):
+        """
+        :param form_id: Form ID
+        :return: Tuple of definitions
+        """
         cur = self.__conn.cursor()
-        cur.execute("INSERT INTO " + self.PRO_FORM_TABLE + " VALUES( " +
-                    str(form_id) + ", '" +
-                    masculine + "', '" +
-                    feminine + "', '" +
-                    neuter + "', '" +
-                    person + "', '" +
-                    kind + "');")
-
-    # Deaccentuate a word (Remove accents and breathing marks)
-    def __deaccentuate(self, word):
-        """
-        This removes accents and breathing marks above letters.
-        This does not remove isolated accents.
-        :param word: The word to deaccentuate
-        :return: Deaccentuated word
-        """
-        unaccented = ""
-        for i in range(len(word)):  # Loop through each character
-            unaccented += self.__deaccentuate_char(word[i])
-        return unaccented
-
-    # Deaccentuate a character (Get an unaccented version of the character)
-    def __deaccentuate_char(self, ch):
-        for a, u in self.ACCENT_MAP.iteritems():
-            if self.__find_unicode(a, ch) >= 0:
-                return u
-        return ch
-
-    def __find_unicode(self, s, c):
-        for i in range(len(s)):
-            if s[i] == c:
-                return i
-        return -1
+        cur.execute(Lexicon.SQL_SELECT_DEFINITIONS, (form_id,))
+        return tuple(row[0] for row in cur.fetchall())
+
+
+# Lookup Helpers (shared by Lexicon and ReaderPool, which each bring their own cursor and cache)
+# Select the info of a word, through a cache
+def _select_cached(cur, cache, word, is_unaccented):
+    """
+    :param cur: Cursor to query with, if the result is not cached
+    :param cache: LRU Cache of select results
+    :param word: Word to query
+    :param is_unaccented: Whether the word is unaccented or not
+    :return: WordRecord, or None
+    """
+    key = (word, is_unaccented)
+    record = cache.get(key, _UNCACHED)
+    if record is _UNCACHED:
+        record = _select(cur, word, is_unaccented)
+        cache.put(key, record)
+    return record
+
+
+# Select the info of many words, through a cache
+def _select_many(cur, cache, words, is_unaccented):
+    """
+    :param cur: Cursor to query with, for the words that are not cached
+    :param cache: LRU Cache of select results
+    :param words: Words to query
+    :param is_unaccented: Whether the words are unaccented or not
+    :return: Ordered Dictionary mapping each word to its WordRecord, or to None if it was not found
+    """
+    results = OrderedDict()
+    missing = []  # Words that are not cached
+    for word in words:
+        if word in results:
+            continue
+        record = cache.get((word, is_unaccented), _UNCACHED)
+        results[word] = record
+        if record is _UNCACHED:
+            missing.append(word)
+
+    for i in range(0, len(missing), Lexicon.IN_SIZE):
+        found = _select_batch(cur, missing[i:i + Lexicon.IN_SIZE], is_unaccented)
+        for word in missing[i:i + Lexicon.IN_SIZE]:
+            name = word.encode("utf-8") if isinstance(word, unicode) else word  # Names come back as UTF-8
+            record = found.get(name)
+            cache.put((word, is_unaccented), record)
+            results[word] = record
+    return results
+
+
+# Select the info of a batch of words from the database
+def _select_batch(cur, words, is_unaccented):
+    """
+    Search the database for the info of at most IN_SIZE words, bypassing the cache
+    :param cur: Cursor to query with
+    :param words: Words to query (no repeats)
+    :param is_unaccented: Whether the words are unaccented or not
+    :return: Dictionary mapping each word found to its WordRecord
+    """
+    cur.execute(Lexicon.SQL_SELECT_UNACCENTED_LOOKUPS if is_unaccented else Lexicon.SQL_SELECT_LOOKUPS,
+                _padded(words))
+    found = {}
+    for row in cur.fetchall():
+        if row[0] not in found:  # The first match of each, just like select
+            found[row[0]] = _unpack(row[1:])
+    return found
+
+
+# Unpack a Word Lookup
+def _unpack(row):
+    """
+    Makes the record of a Word Lookups row. Only the Info is split now, and the rest when it is first used
+    :param row: Word Name, Form ID, Part of Speech, Info, Form, Definitions (packed)
+    :return: WordRecord
+    """
+    name, form_id, part, info, form, defs = row
+    info = tuple(None if v == Lexicon.NULL_MARKER else v for v in info.split(Lexicon.SEPARATOR))
+    return WordRecord(name, part, form_id, info, form, defs, _PACKED)
+
+
+# Pad an IN list
+def _padded(values):
+    """
+    Pads a list of at most IN_SIZE values up to exactly IN_SIZE, by repeating the last one
+    :param values: Values
+    :return: Tuple of IN_SIZE values
+    """
+    return tuple(values) + (values[-1],) * (Lexicon.IN_SIZE - len(values))
+
+
+# Select the info of a word from the database
+def _select(cur, word, is_unaccented):
+    """
+    Search the database for the word's info, bypassing the cache
+    :param cur: Cursor to query with
+    :param word: Word to query
+    :param is_unaccented: Whether the word is unaccented or not
+    :return: WordRecord, or None
+    """
+    # Everything is packed into the one row of the word in Word Lookups (If unaccented, look at unaccented column)
+    cur.execute(Lexicon.SQL_SELECT_UNACCENTED_LOOKUP if is_unaccented else Lexicon.SQL_SELECT_LOOKUP, (word,))
+    row = cur.fetchone()
+    if row is None:  # If there was no match, word cannot be found
+        return None
+    return _unpack(row)
+
+
+# Class that serves lookups to many threads at once
+class ReaderPool:
+    """
+    ReaderPool answers the same lookups as Lexicon.select and Lexicon.select_many, and is safe to call from many
+    threads at once. It holds up to pool_size read-only connections, opened as they are first needed.
+    A lookup checks a connection out for itself, so a connection is only ever used by one thread at a time,
+    and a thread waits for one to come back when all of them are in use.
+    SQLite lets go of the GIL while it runs a query, so lookups on different connections run side by side
+    """
+    __path = None       # Path to the database
+    __profile = None    # Name of the connection profile every connection uses
+    __pool_size = 0     # Most connections to open
+    __conns = None      # Every connection opened so far
+    __idle = None       # Queue of the connections that are not checked out
+    __lock = None       # Lock: Held while opening a connection
+    __cache = None      # LRU Cache of select results, shared by every thread
+    POOL_SIZE = 4       # Default number of connections
+
+    # Constructor
+    def __init__(self, db_path, pool_size=POOL_SIZE, cache_size=Lexicon.CACHE_SIZE, profile=Lexicon.PROFILE_SERVING):
+        """
+        Constructor for ReaderPool. Opens the first connection, upgrading the schema first if the database is old
+        :param db_path: Path to the database
+        :param pool_size: Most connections to open (at least 1)
+        :param cache_size: Number of select results to cache (0 turns the cache off)
+        :param profile: Name of the connection profile every connection uses (one of Lexicon.PROFILES).
+        Connections are made read-only whatever the profile
+        """
+        if profile not in Lexicon.PROFILES:
+            raise ValueError("Unknown profile: " + profile + ".")
+        if pool_size < 1:
+            raise ValueError("A pool needs at least 1 connection.")
+        self.__path = db_path
+        self.__profile = profile
+        self.__pool_size = pool_size
+        self.__conns = []
+        self.__idle = Queue.Queue()
+        self.__lock = threading.Lock()
+        self.__cache = Cache.LRUCache(cache_size)
+
+        conn = self.__open()
+        if conn.execute("PRAGMA user_version;").fetchone()[0] < Lexicon.SCHEMA_VERSION:
+            self.close()
+            with Lexicon(db_path, 0):  # Upgrades the schema, which a read-only connection cannot do
+                pass
+            conn = self.__open()
+        self.__idle.put(conn)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Close every connection
+    def close(self):
+        """
+        Closes every connection. Must not be called while a lookup is running
+        :return: None
+        """
+        with self.__lock:
+            for conn in self.__conns:
+                conn.close()
+            self.__conns = []
+            self.__idle = Queue.Queue()
+
+    # Select the info of a word
+    def select(self, word, is_unaccented=False):
+        """
+        Search the database for the word's info, as Lexicon.select does. Results are cached
+        :param word: Word to query
+        :param is_unaccented: Whether the word is unaccented or not
+        :return: WordRecord, or None if the word was not found
+        """
+        conn = self.__checkout()
+        try:
+            return _select_cached(conn.cursor(), self.__cache, word, is_unaccented)
+        finally:
+            self.__idle.put(conn)
+
+    # Select the info of many words
+    def select_many(self, words, is_unaccented=False):
+        """
+        Search the database for the info of many words at once, as Lexicon.select_many does. Results are cached
+        :param words: Words to query
+        :param is_unaccented: Whether the words are unaccented or not
+        :return: Ordered Dictionary mapping each word to its WordRecord, or to None if it was not found
+        """
+        conn = self.__checkout()
+        try:
+            return _select_many(conn.cursor(), self.__cache, words, is_unaccented)
+        finally:
+            self.__idle.put(conn)
+
+    # Get the pool counters
+    def stats(self):
+        """
+        :return: Dictionary of Connections (opened so far), Idle (not checked out), Pool Size, and the
+        counters of the cache
+        """
+        stats = {"Connections": len(self.__conns), "Idle": self.__idle.qsize(), "Pool Size": self.__pool_size}
+        stats.update(self.__cache.stats())
+        return stats
+
+    # Forget the cached results
+    def clear_cache(self):
+        """
+        Forgets every cached result, for after the database was written to
+        :return: None
+        """
+        self.__cache.clear()
+
+    # Helper Methods
+    # Check a connection out
+    def __checkout(self):
+        """
+        Takes an idle connection, opens a new one if there is none and the pool is not full, or else waits for one
+        :return: Connection
+        """
+        try:
+            return self.__idle.get_nowait()
+        except Queue.Empty:
+            pass
+        with self.__lock:
+            if len(self.__conns) < self.__pool_size:
+                return self.__open()
+        return self.__idle.get()
+
+    # Open a connection
+    def __open(self):
+        """
+        Opens a read-only connection with the pool's profile, and adds it to the pool.
+        The caller must hold the lock, or be the constructor
+        :return: Connection
+        """
+        conn = sql.connect(self.__path, check_same_thread=False,  # Threads take turns, never share at once
+                           cached_statements=Lexicon.STATEMENT_CACHE_SIZE)
+        conn.text_factory = str
+        cur = conn.cursor()
+        _apply_pragmas(cur, Lexicon.PROFILES[self.__profile])
+        cur.execute("PRAGMA query_only = 1;")
+        self.__conns.append(conn)
+        return conn
+
 
 # Old Handler Class
 # Here for reference
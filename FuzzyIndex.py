@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+import unicodedata  # For composing the input
+import Accents      # For the unaccented keys
+
+
+# Edit distance between two words
+def distance(a, b):
+    """
+    Levenshtein distance: the fewest letters to insert, delete or replace to turn one word into the other
+    :param a: Word
+    :param b: Word
+    :return: Distance
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    prev = range(len(b) + 1)
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        for j, cb in enumerate(b, 1):
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (ca != cb)))
+        prev = cur
+    return prev[-1]
+
+
+# Edit distance that treats diacritics as cheap
+def accent_distance(a, b, accent_cost=0.1):
+    """
+    Levenshtein distance where replacing a letter by the same letter with other diacritics
+    (accent, breathing, iota subscript, diaeresis) costs accent_cost instead of a whole edit
+    :param a: Accented word (unicode)
+    :param b: Accented word (unicode)
+    :param accent_cost: Cost of changing the diacritics of a letter
+    :return: Distance
+    """
+    a = _letters(a); b = _letters(b)
+    ua = [Accents.deaccentuate(c) for c in a]; ub = [Accents.deaccentuate(c) for c in b]
+    prev = [float(j) for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        cur = [float(i)]
+        for j in range(1, len(b) + 1):
+            if a[i - 1] == b[j - 1]:
+                sub = 0.0
+            elif ua[i - 1] == ub[j - 1]:
+                sub = accent_cost
+            else:
+                sub = 1.0
+            cur.append(min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + sub))
+        prev = cur
+    return prev[-1]
+
+
+# Split a word into its letters
+def _letters(word):
+    """
+    Splits a word into letters, each with the marks on it. A mark that NFC cannot compose onto its letter
+    (like the acute of ᾱ́) stays with that letter, so every letter deaccentuates to exactly one letter
+    :param word: Word (unicode)
+    :return: List of letters (unicode)
+    """
+    letters = []
+    for c in unicodedata.normalize("NFC", word):
+        if letters and unicodedata.combining(c):
+            letters[-1] += c
+        else:
+            letters.append(c)
+    return letters
+
+
+# Class that finds the nearest words to a misspelled one
+class FuzzyIndex:
+    """
+    FuzzyIndex finds the words nearest to a given one, without computing a distance to every word.
+    Words are keyed by their unaccented form, so a word that is only mis-accented finds its key directly.
+    Each key is indexed under itself and every way to delete one letter from it. Two keys within one edit
+    of each other always share one of these, so a lookup only needs the deletions of the input (and,
+    for two edits, the deletions of every single edit of the input). The few candidates found this way
+    are then ranked by an edit distance where diacritics are cheap
+    """
+    __keys = None       # Keys: Dictionary mapping an unaccented key to its accented words
+    __deletions = None  # Deletions: Dictionary mapping a key, or a key less one letter, to its key (or list of keys)
+    __letters = None    # Letters: Every letter used in a key, for generating edits
+
+    # Constructor
+    def __init__(self, words):
+        """
+        Constructor for FuzzyIndex
+        :param words: Accented words to index (unicode, or UTF-8 strings)
+        """
+        self.__keys = {}
+        self.__deletions = {}
+        letters = set()
+        for word in words:
+            if isinstance(word, str):
+                word = word.decode("utf-8")
+            key = Accents.deaccentuate(word)
+            if key in self.__keys:
+                self.__keys[key].append(word)
+                continue
+            self.__keys[key] = [word]
+            letters.update(key)
+            for d in self.__deleted(key):
+                keys = self.__deletions.get(d)
+                if keys is None:  # Most deletions belong to a single key, so keep those bare to save memory
+                    self.__deletions[d] = key
+                elif isinstance(keys, list):
+                    keys.append(key)
+                else:
+                    self.__deletions[d] = [keys, key]
+        self.__letters = u"".join(sorted(letters))
+
+    def __len__(self):
+        return len(self.__keys)
+
+    # Find the nearest words
+    def nearest(self, word, max_distance=2, limit=5):
+        """
+        Finds the words nearest to a word
+        :param word: Word (unicode, or a UTF-8 string)
+        :param max_distance: Most letters that may differ, apart from diacritics (0, 1 or 2)
+        :param limit: Most words to return
+        :return: List of (Distance, Word), nearest first. Words are unicode
+        """
+        if isinstance(word, str):
+            word = word.decode("utf-8")
+        word = unicodedata.normalize("NFC", word)  # One code point per letter, like the indexed words
+        key = Accents.deaccentuate(word)
+
+        # Find the keys within max_distance of the key
+        candidates = set()
+        if key in self.__keys:
+            candidates.add(key)
+        if max_distance >= 1:
+            probes = set([key])
+            if max_distance >= 2:
+                probes.update(self.__edits(key))
+            for probe in probes:
+                for d in self.__deleted(probe):
+                    keys = self.__deletions.get(d)
+                    if isinstance(keys, list):
+                        candidates.update(keys)
+                    elif keys is not None:
+                        candidates.add(keys)
+        keys = [k for k in candidates if distance(key, k) <= max_distance]
+
+        # Rank their words by how close they are, with diacritics cheap
+        ranked = sorted((accent_distance(word, w), w) for k in keys for w in self.__keys[k])
+        return ranked[:limit]
+
+    # Helper Methods
+    # Get the key and every way to delete one letter from it
+    def __deleted(self, key):
+        """
+        :param key: Key
+        :return: Set of the key, and the key less each of its letters
+        """
+        out = set([key])
+        for i in range(len(key)):
+            out.add(key[:i] + key[i + 1:])
+        return out
+
+    # Get every single edit of a key
+    def __edits(self, key):
+        """
+        :param key: Key
+        :return: Set of every string one deletion, swap, replacement or insertion away from the key
+        """
+        splits = [(key[:i], key[i:]) for i in range(len(key) + 1)]
+        out = set(l + r[1:] for l, r in splits if r)
+        out.update(l + r[1] + r[0] + r[2:] for l, r in splits if len(r) > 1)
+        out.update(l + c + r[1:] for l, r in splits if r for c in self.__letters)
+        out.update(l + c + r for l, r in splits for c in self.__letters)
+        return out
+
+
+# Regression checks: python FuzzyIndex.py
+if __name__ == "__main__":
+    # ᾱ́ keeps its acute as a combining mark, since NFC has no single code point for it
+    assert accent_distance(u"ἄξιος", u"ᾱ́ξιος") == 0.1
+    assert FuzzyIndex([u"ἄξιος"]).nearest(u"ᾱ́ξιος") == [(0.1, u"ἄξιος")]
+    assert FuzzyIndex([u"ᾱ́ξιος"]).nearest(u"αξιος") == [(0.1, u"ᾱ́ξιος")]
+    assert FuzzyIndex([u"ἄξιος"]).nearest(u"ᾱ́ξιοςζζ") == [(2.1, u"ἄξιος")]
+    print "FuzzyIndex checks passed."
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import re   # For tokenizing
+
+# English Glosses
+# A definition is indexed by its terms, so that Greek words can be found by what they mean.
+# Annotations in brackets, like (MIDDLE) or (someone), are dropped, and the rest is split into lower case words.
+# Stop words are dropped too, unless nothing else is left ("be" is a gloss of its own).
+# Each word is then stemmed, so that teach, teaches and teaching share the term "teach".
+# The stemmer only strips the common inflections, the same way for every word, and that is all it needs to do:
+# a term is only ever compared to another term made the same way.
+
+ANNOTATION = re.compile(r"\([^)]*\)|\[[^\]]*\]")
+WORD = re.compile(r"[a-z]+(?:'[a-z]+)?")
+STOP_WORDS = frozenset(["a", "an", "the", "to", "of", "and", "or", "in", "on", "at", "by", "for", "with", "from",
+                        "as", "one", "oneself", "someone", "something"])
+VOWELS = "aeiouy"
+SIBILANTS = ("ches", "shes", "sses", "xes", "zes")
+UNDOUBLED = "lsz"   # Doubled letters that are kept when an ending comes off (calling is call, not cal)
+
+
+# Split a definition into words
+def words(definition):
+    """
+    :param definition: Definition (unicode, or a UTF-8 string)
+    :return: List of lower case words (str), without annotations, and without stop words unless they are all there is
+    """
+    if isinstance(definition, unicode):
+        definition = definition.encode("utf-8")
+    found = WORD.findall(ANNOTATION.sub(" ", definition.lower()))
+    kept = [w for w in found if w not in STOP_WORDS]
+    return kept or found
+
+
+# Stem an English word
+def stem(word):
+    """
+    Strips plural and verb endings, a final -ly and a final e: teaches, teaching, taught and teach give
+    teach, teach, taught and teach
+    :param word: Lower case word
+    :return: Stem
+    """
+    if len(word) <= 3:
+        return word
+    if word.endswith("ies") or word.endswith("ied"):
+        word = word[:-3] + "y" if len(word) > 4 else word[:-1]
+    elif word.endswith(SIBILANTS):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith(("ss", "us", "is")):
+        word = word[:-1]
+    else:
+        for ending in ("ing", "ed"):
+            rest = word[:-len(ending)]
+            if word.endswith(ending) and len(rest) >= 3 and any(c in VOWELS for c in rest):
+                word = rest
+                if word[-1] == word[-2] and word[-1] not in UNDOUBLED + VOWELS:
+                    word = word[:-1]  # Stopped is stop
+                break
+    if word.endswith("ly") and len(word) > 5:
+        word = word[:-2]
+    if word.endswith("e") and len(word) > 3:
+        word = word[:-1]  # So that love and loved meet at lov
+    return word
+
+
+# Get the terms of a definition
+def terms(definition):
+    """
+    :param definition: Definition (unicode, or a UTF-8 string)
+    :return: List of distinct (Term, Word), in the order they first appear. Each term is given with the first
+    word that made it
+    """
+    out = []; seen = set()
+    for w in words(definition):
+        t = stem(w)
+        if t not in seen:
+            seen.add(t)
+            out.append((t, w))
+    return out
@@ -1,6 +1,11 @@
 from __future__ import print_function
+import os
+import sys
+import time
 import DatabaseManager as dB
 import TextFileParser as tp
+import Snapshot
+import PassageAnalyzer
 import Utils
 from enum import Enum
 
@@ -14,8 +19,13 @@ class Command(Enum):
     Values are lists of applicable user inputs
     """
     INFO = ["info", "i"]            # Search for the word, and display info.
-    LIST = ["list", "li", "l"]      # List all words of a particular type.
+    SEARCH = ["search", "se", "s"]  # List the words starting with a prefix, or matching a wildcard pattern.
+    LIST = ["list", "li", "l"]      # List all words of a Part of Speech, by Chapter=N and Feature=Value.
+    ANALYZE = ["analyze", "an", "a"]  # Look up every word of a passage of Greek text.
+    ENGLISH = ["english", "en", "e"]  # Find the words whose definitions match some English words.
     UPDATE = ["update", "up", "u"]  # Update the database from the text file.
+    STATS = ["stats", "st"]         # Display the lookup cache counters.
+    COMPILE = ["compile", "co"]     # Compile the database into a read-only snapshot.
     HELP = ["help", "h", "?"]       # List Commands and their Parameters.
     QUIT = ["quit", "q"]            # Quit the program.
 
@@ -28,7 +38,12 @@ class Parameter(Enum):
     # Use with INFO Command. Default: Lists the basic form info.
     VERBOSE = ["verbose", "v"]          # Lists the full form info of the word.
     DEFINE = ["define", "def", "d"]     # Lists the definition of the word.
-    UNACCENTED = ["unaccent", "u"]      # Ignore the accents on the input word.
+    UNACCENTED = ["unaccent", "u"]      # Ignore the accents on the input word. (Also with SEARCH, ANALYZE)
+    # Use with ANALYZE Command (as well as VERBOSE and DEFINE). Default: Analyzes the text given as arguments.
+    FILE = ["file", "f"]                # Analyze the text file given as the argument, in parallel.
+    # Use with UPDATE Command. Default: Rebuilds the whole database.
+    INCREMENTAL = ["incremental", "inc"]  # Only apply the entries that were added, deleted or changed.
+    PARALLEL = ["parallel", "par", "p"]     # Parse the text file across every core.
 
 
 class LexiconSearcher:
@@ -37,23 +52,50 @@ class LexiconSearcher:
     """
     __lexicon = None                # Lexicon: Database Handler
     __name = None                   # Name: Name of the Database
-    __FILE_NAME = "Lexicon.txt"     # File Name: Name of the Text File
+    __cache_size = 0                # Cache Size: Number of lookups the Database Handler caches
+    __profile = None                # Profile: Connection profile of the Database Handler
+    __search = None                 # Search: Pattern, Unaccent and Key of the next page of the last search
+    __backend = None                # Backend: Which of BACKENDS answers INFO lookups
+    __reader = None                 # Reader: The Database Handler, or the Snapshot, that answers INFO lookups
+    __pool = None                   # Pool: Reader Pool for analyzing files in parallel, opened on first use
+    BACKEND_SQLITE = "sqlite"       # SQLite Backend: Lookups go to the database
+    BACKEND_SNAPSHOT = "snapshot"   # Snapshot Backend: Lookups go to a compiled snapshot of the database
+    BACKENDS = [BACKEND_SQLITE, BACKEND_SNAPSHOT]
+    __file_name = None              # File Name: Name of the Text File
+    __out = None                    # Out: File that every result and message is written to
+    FILE_NAME = "Lexicon.txt"       # Default Name of the Text File
     __PARAM_INDICATOR = "-"         # Parameter Indicator: A symbol to indicate that something is a parameter
+    __COMMENT_INDICATOR = "#"       # Comment Indicator: A symbol to indicate that a batch line is a comment
 
     # Core Methods
-    def __init__(self, database_name):
+    def __init__(self, database_name, cache_size=dB.Lexicon.CACHE_SIZE, backend=BACKEND_SQLITE,
+                 profile=dB.Lexicon.PROFILE_DEFAULT, file_name=FILE_NAME, out=None):
         """
         Constructor for Lexicon Searcher
         :param database_name: Name of the database to connect to
+        :param cache_size: Number of lookups to cache (0 turns the cache off)
+        :param backend: Which of BACKENDS answers INFO lookups. Every other command uses the database
+        :param profile: Connection profile of the database (one of Lexicon.PROFILES). Updates use bulk-load
+        :param file_name: Name of the text file that UPDATE reads
+        :param out: File to write results and messages to (None for standard output)
         :return: None
         """
+        if backend not in self.BACKENDS:
+            raise ValueError("Unknown backend: " + backend + ".")
         self.__name = database_name
+        self.__file_name = file_name
+        self.__out = out if out is not None else sys.stdout
+        self.__cache_size = cache_size
+        self.__backend = backend
+        self.__profile = profile
 
     # Used with With:
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
+        self.__close_snapshot()
+        self.__close_pool()
         if self.__lexicon:
             self.__lexicon.__exit__(exc_type, exc_value, traceback)
 
@@ -64,21 +106,72 @@ class LexiconSearcher:
         :return: None
         """
         # Connect to the database, and create a handler
-        with dB.Lexicon(self.__name) as self.__lexicon:
+        with dB.Lexicon(self.__name, self.__cache_size, self.__profile) as self.__lexicon:
+            self.__open_reader()
             q = False
             while not q:
                 # Poll for user input, and get it
                 inp = self.__get_user_input()
-                # Parse user input, and execute any commands in it
-                cmd, params, args = self.__parse_user_input(inp)
-                # Executes the command with the parameters and arguments
-                res = self.__execute_command(cmd, params, args)
+                # Parse user input, execute the command, and display any error
+                q = self.__run_command(inp) == Utils.Error.QUIT
+
+    # Batch Loop Method
+    def run_batch(self, stream):
+        """
+        Runs the commands in a stream, one per line, without prompting. Blank lines, and lines starting
+        with the Comment Indicator, are skipped. Stops at the end of the stream, or at QUIT.
+        Each command that fails is also reported on standard error, by line number. A command that raises
+        an exception fails as EXCEPTION, and the commands after it still run
+        :param stream: File of commands (such as standard input)
+        :return: Exit status: 0 if every command succeeded, 1 if any failed
+        """
+        failed = 0
+        with dB.Lexicon(self.__name, self.__cache_size, self.__profile) as self.__lexicon:
+            self.__open_reader()
+            for number, line in enumerate(stream, 1):
+                line = line.strip()
+                if not line or line.startswith(self.__COMMENT_INDICATOR):
+                    continue
+                detail = ""
+                try:
+                    res = self.__run_command(line)
+                except Exception, e:  # A command that raises fails like any other, and the rest still run
+                    res = Utils.Error.EXCEPTION
+                    detail = " " + type(e).__name__ + ": " + str(e)
+                if res == Utils.Error.QUIT:
+                    break
                 if res.value > 0:
-                    self.__error(res, cmd, params, args)
-                elif res.value == -1:
-                    q = True
+                    failed += 1
+                    print("Line " + str(number) + ": " + line + " (" + res.name + ")" + detail, end="\n",
+                          file=sys.stderr)
+        self.__out.flush()
+        return 1 if failed else 0
 
     # Private Methods, Helper Methods
+    # Answers lookups from the backend
+    def __open_reader(self):
+        """
+        Sets the reader of INFO lookups to the backend, once connected
+        :return: None
+        """
+        self.__reader = self.__lexicon
+        if self.__backend == self.BACKEND_SNAPSHOT:
+            self.__open_snapshot()
+
+    # Run one command
+    def __run_command(self, inp):
+        """
+        Parses a line of input, executes its command, and displays any error
+        :param inp: Line of input
+        :return: Error
+        """
+        cmd, params, args = self.__parse_user_input(inp)
+        # Executes the command with the parameters and arguments
+        res = self.__execute_command(cmd, params, args)
+        if res.value > 0:
+            self.__error(res, cmd, params, args)
+        return res
+
     # Get User Input
     def __get_user_input(self):
         """
@@ -114,28 +207,96 @@ class LexiconSearcher:
         # Switch to check what the command is
         # If the command is INFO
         if cmd.lower() in Command.INFO.value:
-            if len(args) != 1:
+            if len(args) < 1:
                 return Utils.Error.BAD_ARGS
-            # INFO only requires a single argument, so get the first one
-            info, form, defs, check = self.__info(params, args[0])
-            if check != Utils.Error.SUCCESS:
-                return check
-            self.__display(info, form, defs)
+            # With a single argument, display that word
+            if len(args) == 1:
+                record, check = self.__info(params, args[0])
+                if check != Utils.Error.SUCCESS:
+                    return check
+                self.__display(record, *self.__info_options(params)[:2])
+            # With many arguments, look them all up at once, and report each word that was not found
+            else:
+                results, check = self.__info_many(params, args)
+                if check != Utils.Error.SUCCESS:
+                    return check
+                verbose, define, unaccent = self.__info_options(params)
+                for word, record in results.iteritems():
+                    print(word + ":", end="\n", file=self.__out)
+                    if record is None:
+                        print("Word not found.", end="\n", file=self.__out)
+                        if not self.__parse(params, word):
+                            self.__suggest(word)
+                    else:
+                        self.__display(record, verbose, define)
+        # If the command is SEARCH
+        elif cmd.lower() in Command.SEARCH.value:
+            # SEARCH takes one pattern. Without one, it shows the next page of the last search
+            if len(args) > 1:
+                return Utils.Error.BAD_ARGS
+            res = self.__search_words(params, args[0] if args else None)
+            if res != Utils.Error.SUCCESS:
+                return res
         # If the command is LIST
         elif cmd.lower() in Command.LIST.value:
-            print("List self", end="\n")
+            # LIST takes a Part of Speech, and then any number of Feature=Value filters
+            if len(args) < 1:
+                return Utils.Error.BAD_ARGS
+            res = self.__list(args[0], args[1:])
+            if res != Utils.Error.SUCCESS:
+                return res
+        # If the command is ANALYZE
+        elif cmd.lower() in Command.ANALYZE.value:
+            # ANALYZE takes the passage, or with FILE the name of a text file
+            if len(args) < 1:
+                return Utils.Error.BAD_ARGS
+            res = self.__analyze(params, args)
+            if res != Utils.Error.SUCCESS:
+                return res
+        # If the command is ENGLISH
+        elif cmd.lower() in Command.ENGLISH.value:
+            # ENGLISH takes the English words to match, and no parameters
+            if len(args) < 1:
+                return Utils.Error.BAD_ARGS
+            res = self.__english(" ".join(args))
+            if res != Utils.Error.SUCCESS:
+                return res
         # If the command is UPDATE
         elif cmd.lower() in Command.UPDATE.value:
-            # Update takes no parameters and no arguments, so ignore them all
-            res = self.__update()
+            # Update takes no arguments, so ignore them all
+            incremental = False; parallel = False
+            for p in params:
+                if p[1:] in Parameter.INCREMENTAL.value:
+                    incremental = True
+                elif p[1:] in Parameter.PARALLEL.value:
+                    parallel = True
+                else:
+                    return Utils.Error.UNKNOWN_PARAMETER
+            # A missing text file would otherwise empty the database
+            if not os.path.isfile(self.__file_name):
+                print("Text file not found: " + self.__file_name + ".", end="\n", file=self.__out)
+                return Utils.Error.BAD_ARGS
+            self.__close_pool()  # Its cached lookups are about to go stale
+            res = self.__sync(parallel) if incremental else self.__update(parallel)
             if res != Utils.Error.SUCCESS:
                 return res
+            # Keep the snapshot in step with the database
+            if self.__backend == self.BACKEND_SNAPSHOT:
+                self.__compile()
+        # If the command is COMPILE
+        elif cmd.lower() in Command.COMPILE.value:
+            # Compile takes no parameters and no arguments, so ignore them all
+            self.__compile()
+        # If the command is STATS
+        elif cmd.lower() in Command.STATS.value:
+            # Stats takes no parameters and no arguments, so ignore them all
+            self.__stats()
         # If the command is HELP
         elif cmd.lower() in Command.HELP.value:
-            print("Help self", end="\n")
+            print("Help self", end="\n", file=self.__out)
         # If the command is QUIT
         elif cmd.lower() in Command.QUIT.value:
-            print("Quit self", end="\n")
+            print("Quit self", end="\n", file=self.__out)
             return Utils.Error.QUIT
         # If the command is not recognized (Not in the command class)
         else:
@@ -173,10 +334,46 @@ class LexiconSearcher:
         """
         # Unknown Command Error
         if error_code == Utils.Error.UNKNOWN_COMMAND:
-            print("Unknown Command: " + cmd + ".", end="\n")
+            print("Unknown Command: " + cmd + ".", end="\n", file=self.__out)
         # Bad Insert Error
         elif error_code == Utils.Error.BAD_INSERT:
-            print("Bad Insert.", end="\n")
+            print("Bad Insert.", end="\n", file=self.__out)
+        # Word Not Found Error: Parse the word given to INFO by its ending, or else suggest the nearest words to it
+        elif error_code == Utils.Error.WORD_NOT_FOUND and cmd.lower() in Command.INFO.value:
+            print("Word not found: " + args[0] + ".", end="\n", file=self.__out)
+            if not self.__parse(params, args[0]):
+                self.__suggest(args[0])
+        # Word Not Found Error: Nothing is defined by the words given to ENGLISH
+        elif error_code == Utils.Error.WORD_NOT_FOUND and cmd.lower() in Command.ENGLISH.value:
+            print("No definitions match: " + " ".join(args) + ".", end="\n", file=self.__out)
+
+    # Parses a word that was not found by its ending
+    def __parse(self, params, word):
+        """
+        Displays every way the word can be made from the paradigms of the forms in the database
+        :param params: INFO parameters
+        :param word: Word that was not found
+        :return: Whether the word could be parsed
+        """
+        options = self.__info_options(params)
+        if options is None:
+            return False
+        records = self.__lexicon.analyze(word)
+        for record in records:
+            print("Parsed as " + record.name + ":", end="\n", file=self.__out)
+            self.__display(record, options[0], options[1])
+        return len(records) > 0
+
+    # Suggests words near a word that was not found
+    def __suggest(self, word):
+        """
+        Displays the nearest words in the database to a word
+        :param word: Word that was not found
+        :return: None
+        """
+        suggestions = self.__lexicon.suggest(word)
+        if suggestions:
+            print("Did you mean: " + ", ".join(suggestions) + "?", end="\n", file=self.__out)
 
     # Searches the Database for the word, and returns the info
     def __info(self, params, word):
@@ -184,9 +381,35 @@ class LexiconSearcher:
         Gets the info for the word
         :param params: Any parameters to modify how to get info
         :param word: The word to search for
-        :return: The info string
+        :return: WordRecord (None if not found), Error
+        """
+        options = self.__info_options(params)
+        if options is None:
+            return None, Utils.Error.UNKNOWN_PARAMETER
+        verbose, define, unaccent = options
+        record = self.__reader.select(word, unaccent)
+        return record, Utils.Error.SUCCESS if record is not None else Utils.Error.WORD_NOT_FOUND
+
+    # Gets the info of many words
+    def __info_many(self, params, words):
+        """
+        Gets the info for many words with a single batch lookup
+        :param params: Any parameters to modify how to get info
+        :param words: The words to search for
+        :return: Ordered Dictionary mapping each word to its WordRecord (or None if not found), Error
+        """
+        options = self.__info_options(params)
+        if options is None:
+            return None, Utils.Error.UNKNOWN_PARAMETER
+        return self.__reader.select_many(words, options[2]), Utils.Error.SUCCESS
+
+    # Reads the INFO parameters
+    def __info_options(self, params):
+        """
+        Looks through the params for the INFO parameters
+        :param params: Parameters
+        :return: Verbose, Define, Unaccent - or None if there is an unknown parameter
         """
-        # Look through the params for the INFO parameters
         verbose = False; define = False; unaccent = False;
         for p in params:
             if p[1:] in Parameter.VERBOSE.value:
@@ -196,51 +419,352 @@ class LexiconSearcher:
             elif p[1:] in Parameter.UNACCENTED.value:
                 unaccent = True
             else:
-                return None, None, None, Utils.Error.UNKNOWN_PARAMETER
-        i, f, d = self.__lexicon.select(word, verbose, define, unaccent)
-        check = True
-        if i is None:
-            check = False
-        elif verbose and f is None:
-            check = False
-        elif define and d is None:
-            check = False
-        return i, f, d, Utils.Error.SUCCESS if check else Utils.Error.WORD_NOT_FOUND
+                return None
+        return verbose, define, unaccent
+
+    # Searches the Database for words matching a pattern, and displays a page of them
+    def __search_words(self, params, pattern):
+        """
+        Displays the first page of words matching the pattern, or the next page of the last search
+        :param params: Any parameters to modify how to search
+        :param pattern: The prefix or wildcard pattern (None for the next page of the last search)
+        :return: Error
+        """
+        unaccent = False
+        for p in params:
+            if p[1:] in Parameter.UNACCENTED.value:
+                unaccent = True
+            else:
+                return Utils.Error.UNKNOWN_PARAMETER
+        if pattern is not None:
+            self.__search = (pattern, unaccent, None)
+        elif self.__search is None or self.__search[2] is None:
+            return Utils.Error.BAD_ARGS
+        pattern, unaccent, after = self.__search
+        words, after = self.__lexicon.search(pattern, unaccent, after=after)
+        if not words:
+            return Utils.Error.WORD_NOT_FOUND
+        for name, part, form_id in words:
+            print(name + " (" + part + ")", end="\n", file=self.__out)
+        if after is not None:
+            print("More results: enter " + Command.SEARCH.value[0] + " again to see them.", end="\n", file=self.__out)
+        self.__search = (pattern, unaccent, after)
+        return Utils.Error.SUCCESS
+
+    # Lists the words of a Part of Speech
+    def __list(self, pos, filters):
+        """
+        Displays every word of a Part of Speech that passes the filters, as they are read
+        :param pos: Part of Speech
+        :param filters: Filters, as Feature=Value (or Chapter=Number)
+        :return: Error
+        """
+        parts = [p.value for p in Utils.PartOfSpeech if p.value.lower() == pos.lower()]
+        if not parts or self.__lexicon.features(parts[0]) is None:
+            return Utils.Error.BAD_ARGS
+        pos = parts[0]
+        columns = dict((c.lower(), c) for c in self.__lexicon.features(pos))
+        chapter = None; features = []
+        for f in filters:
+            name, sep, value = f.partition("=")
+            if not sep:
+                return Utils.Error.BAD_ARGS
+            if name.lower() == "chapter":
+                if not value.isdigit():
+                    return Utils.Error.BAD_ARGS
+                chapter = int(value)
+            elif name.lower() in columns:
+                features.append((columns[name.lower()], value))
+            else:
+                return Utils.Error.BAD_ARGS
+        count = 0
+        for name, chap, info in self.__lexicon.list_words(pos, chapter, features):
+            print(name + " (Chapter " + str(chap) + "): " + ", ".join(str(i) for i in info), end="\n", file=self.__out)
+            count += 1
+        print(str(count) + " words.", end="\n", file=self.__out)
+        return Utils.Error.SUCCESS
+
+    # Finds words by their definitions
+    def __english(self, query):
+        """
+        Displays the words whose definitions best match an English query, each with its best matching definition
+        :param query: English words
+        :return: Error
+        """
+        results = self.__lexicon.search_english(query)
+        if not results:
+            return Utils.Error.WORD_NOT_FOUND
+        for name, part, form_id, definition in results:
+            print(name + " (" + part + "): " + definition, end="\n", file=self.__out)
+        return Utils.Error.SUCCESS
+
+    # Analyzes a passage
+    def __analyze(self, params, args):
+        """
+        Displays the analysis of every word of a passage, as it is looked up.
+        A file is read as it is analyzed, and its words are looked up in parallel
+        :param params: Any parameters to modify how to analyze
+        :param args: The passage, or with FILE the name of a text file
+        :return: Error
+        """
+        is_file = False; info_params = []
+        for p in params:
+            if p[1:] in Parameter.FILE.value:
+                is_file = True
+            else:
+                info_params.append(p)
+        options = self.__info_options(info_params)
+        if options is None:
+            return Utils.Error.UNKNOWN_PARAMETER
+        if is_file and not os.path.isfile(args[0]):
+            print("Text file not found: " + args[0] + ".", end="\n", file=self.__out)
+            return Utils.Error.BAD_ARGS
+
+        # A bulk-load connection keeps the database to itself, so only it can read
+        workers = 1
+        reader = self.__reader
+        if is_file and self.__profile != dB.Lexicon.PROFILE_BULK_LOAD:
+            workers = dB.ReaderPool.POOL_SIZE
+            if reader is self.__lexicon:  # A snapshot is safe to share between threads, the handler is not
+                reader = self.__open_pool()
+        analyzer = PassageAnalyzer.PassageAnalyzer(reader, workers)
+        text = open(args[0]) if is_file else [" ".join(args)]
+        parsed = {}  # Token to its analyses, for every token that was not found
+        try:
+            for token, word, record in analyzer.analyze(PassageAnalyzer.tokenize(text), options[2]):
+                if word is None:
+                    # Parse it by its ending instead, on this thread (the handler is not shared)
+                    if token not in parsed:
+                        parsed[token] = self.__lexicon.analyze(PassageAnalyzer.normalize(token.decode("utf-8")))
+                    if not parsed[token]:
+                        print(token + ": Word not found.", end="\n", file=self.__out)
+                    for record in parsed[token]:
+                        print(token + " (parsed as " + record.name + "):", end="\n", file=self.__out)
+                        self.__display(record, options[0], options[1])
+                    continue
+                print(token + (" (" + word + ")" if word != token else "") + ":", end="\n", file=self.__out)
+                self.__display(record, options[0], options[1])
+        finally:
+            if is_file:
+                text.close()
+        print(str(analyzer.tokens) + " words, " + str(analyzer.unique) + " distinct, " +
+              str(analyzer.missing) + " not found, " + str(sum(1 for a in parsed.itervalues() if a)) +
+              " of them parsed by their endings.", end="\n", file=self.__out)
+        return Utils.Error.SUCCESS
 
     # Updates the database
-    def __update(self):
+    def __update(self, parallel=False):
         """
         Updates the database by deleting all info, and then inserting every word from the text file
+        The whole update is a single bulk load, so a bad insert rolls the database back to how it was
+        :param parallel: Whether to parse the text file across a process pool
         :return: None
         """
-        self.__lexicon.reset()  # Reset the database
-        # Create a Text File Parser
-        with tp.Parser(self.__FILE_NAME) as parser:
-            # Read in an entire word
-            form, words, part, check = parser.read()
-            while check:  # Did it successfully read in an entire word?
-                # Try to insert that word form into the database
-                res = self.__lexicon.insert(part, form=form)
-                if not res:  # If fail, error: BAD INSERT
-                    return Utils.Error.BAD_INSERT
-                # Try to insert the word into the database
-                res = self.__lexicon.insert(part, words, form)
-                if not res:  # Again, if fail, error: BAD INSERT
+        start = time.time()
+        self.__lexicon.begin_bulk_load()
+        try:
+            self.__lexicon.reset()  # Reset the database
+            # Stream the entries of the text file to the database a chunk at a time
+            for batch in self.__fingerprinted(tp.chunked(self.__read_entries(parallel))):
+                if not self.__lexicon.insert_entries(batch):  # If fail, error: BAD INSERT
+                    self.__lexicon.abort_bulk_load()
                     return Utils.Error.BAD_INSERT
+            rows = self.__lexicon.end_bulk_load()
+        except tp.BadEntry, e:  # An entry the parser rejected is a bad insert, and nothing is loaded
+            self.__lexicon.abort_bulk_load()
+            print("Bad entry: " + str(e) + ".", end="\n", file=self.__out)
+            return Utils.Error.BAD_INSERT
+        except:  # Anything else (a bad line, an interrupt) must not leave the load open either
+            self.__lexicon.abort_bulk_load()
+            raise
+        self.__report_load(rows, start)
+        return Utils.Error.SUCCESS
 
-                form, words, part, check = parser.read()  # Read in the next word
+    # Updates only the changed entries
+    def __sync(self, parallel=False):
+        """
+        Updates the database by comparing the fingerprint of every entry in the text file with the stored ones.
+        Forms whose entries were deleted or changed are deleted, and new or changed entries are inserted.
+        Entries that did not change are not touched
+        :param parallel: Whether to parse the text file across a process pool
+        :return: None
+        """
+        start = time.time()
+        self.__lexicon.begin_bulk_load()
+        try:
+            stored = self.__lexicon.fingerprints()  # Fingerprint to Form ID
+            kept = set()  # Form IDs of the unchanged entries
+            added = []  # Entries to insert, with their fingerprints
+            seen = set()  # Fingerprints read so far
+            for batch in self.__fingerprinted(tp.chunked(self.__read_entries(parallel))):
+                for entry, fp in batch:
+                    if fp in seen:  # A duplicated entry is a bad insert, just as it is for a full update
+                        self.__lexicon.abort_bulk_load()
+                        return Utils.Error.BAD_INSERT
+                    seen.add(fp)
+                    if fp in stored:
+                        kept.add(stored[fp])
+                    else:
+                        added.append((entry, fp))
+
+            # Delete first, as a changed entry usually keeps the same face as its old form
+            # Forms with no fingerprint (stored before fingerprints existed) are replaced as well
+            deleted = self.__lexicon.form_ids() - kept
+            for form_id in deleted:
+                self.__lexicon.delete_form(form_id)
+            if not self.__lexicon.insert_entries(added):
+                self.__lexicon.abort_bulk_load()
+                return Utils.Error.BAD_INSERT
+            rows = self.__lexicon.end_bulk_load()
+        except tp.BadEntry, e:  # An entry the parser rejected is a bad insert, and nothing is loaded
+            self.__lexicon.abort_bulk_load()
+            print("Bad entry: " + str(e) + ".", end="\n", file=self.__out)
+            return Utils.Error.BAD_INSERT
+        except:  # Anything else (a bad line, an interrupt) must not leave the load open either
+            self.__lexicon.abort_bulk_load()
+            raise
+        print("Added " + str(len(added)) + ", deleted " + str(len(deleted)) + ", kept " +
+              str(len(kept)) + " entries.", end="\n", file=self.__out)
+        self.__report_load(rows, start)
         return Utils.Error.SUCCESS
 
-    def __display(self, info, form, defs):
-        # For now, just display everything
-        for i in info:
-            print(i, end=", ")
-        print(end="\n")
-        if form is not None:
-            for f in form:
-                print(f, end=", ")
-            print(end="\n")
-        if defs is not None:
-            for d in defs:
-                print(d, end=", ")
-            print(end="\n")
+    # Reads the entries of the text file
+    def __read_entries(self, parallel):
+        """
+        Pipeline source: every entry of the text file, in file order, with its regular paradigm filled in
+        :param parallel: Whether to parse across a process pool instead of in this process
+        :return: Generator of Entries
+        """
+        if parallel:
+            for entry in tp.parse_parallel(self.__file_name, expand=True):
+                yield entry
+        else:
+            with tp.Parser(self.__file_name, expand=True) as parser:
+                for entry in parser:
+                    yield entry
+
+    # Pairs every entry with its fingerprint
+    def __fingerprinted(self, batches):
+        """
+        Pipeline stage that fingerprints each batch of entries as it goes by
+        :param batches: Generator of lists of Entries
+        :return: Generator of lists of (Entry, Fingerprint) pairs
+        """
+        for batch in batches:
+            yield [(entry, tp.fingerprint(*entry)) for entry in batch]
+
+    # Reports the speed of a load
+    def __report_load(self, rows, start):
+        """
+        Displays how many rows were inserted, and how fast
+        :param rows: Number of rows inserted
+        :param start: Time the load started
+        :return: None
+        """
+        elapsed = time.time() - start
+        print("Inserted " + str(rows) + " rows in " + "%.3f" % elapsed + "s (" +
+              "%.0f" % (rows / elapsed if elapsed > 0 else rows) + " rows/s).", end="\n", file=self.__out)
+
+    # Displays the lookup counters
+    def __stats(self):
+        """
+        Displays the backend, the connection profile and its settings, the hit and miss counters of the lookup cache,
+        and any lookup query that does not use an index
+        :return: None
+        """
+        print("Backend: " + self.__backend + ".", end="\n", file=self.__out)
+        print("Profile: " + self.__lexicon.profile() + " (" +
+              ", ".join(k + "=" + str(v) for k, v in self.__lexicon.settings().iteritems()) + ").", end="\n", file=self.__out)
+        stats = self.__lexicon.cache_stats()
+        lookups = stats["Hits"] + stats["Misses"]
+        print("Cache: " + str(stats["Hits"]) + " hits, " + str(stats["Misses"]) + " misses (" +
+              "%.1f" % (100.0 * stats["Hits"] / lookups if lookups else 0) + "% hit rate), " +
+              str(stats["Size"]) + "/" + str(stats["Capacity"]) + " entries.", end="\n", file=self.__out)
+        unindexed = self.__lexicon.check_query_plans()
+        if not unindexed:
+            print("Query Plans: every lookup uses an index.", end="\n", file=self.__out)
+        for query, scans in sorted(unindexed.iteritems()):
+            print("Query Plans: " + query.strip() + " scans " + ", ".join(scans) + ".", end="\n", file=self.__out)
+
+    # Compiles the snapshot
+    def __compile(self):
+        """
+        Compiles the database into its snapshot, and answers lookups from the new one if using the snapshot backend
+        :return: None
+        """
+        start = time.time()
+        self.__close_snapshot()  # The old snapshot is replaced, so let go of it first
+        count = Snapshot.compile_snapshot(self.__name)
+        print("Compiled " + str(count) + " words into " + Snapshot.path_for(self.__name) +
+              " in " + "%.3f" % (time.time() - start) + "s.", end="\n", file=self.__out)
+        if self.__backend == self.BACKEND_SNAPSHOT:
+            self.__open_snapshot()
+
+    # Opens the snapshot
+    def __open_snapshot(self):
+        """
+        Answers lookups from the snapshot of the database, compiling it first if there is none
+        :return: None
+        """
+        if not os.path.exists(Snapshot.path_for(self.__name)):
+            self.__compile()  # This opens the snapshot once it is compiled
+            return
+        try:
+            self.__reader = Snapshot.SnapshotLexicon(Snapshot.path_for(self.__name))
+        except ValueError:  # A snapshot of an older version
+            self.__compile()
+
+    # Closes the snapshot
+    def __close_snapshot(self):
+        """
+        Closes the snapshot if it is open, and answers lookups from the database until it is opened again
+        :return: None
+        """
+        if self.__reader is not None and self.__reader is not self.__lexicon:
+            self.__reader.close()
+        self.__reader = self.__lexicon
+
+    # Opens the reader pool
+    def __open_pool(self):
+        """
+        Opens the reader pool on the database, if it is not open yet. It reads with the serving profile
+        if the handler does, and the default one otherwise
+        :return: Reader Pool
+        """
+        if self.__pool is None:
+            profile = dB.Lexicon.PROFILE_SERVING if self.__profile == dB.Lexicon.PROFILE_SERVING \
+                else dB.Lexicon.PROFILE_DEFAULT
+            self.__pool = dB.ReaderPool(self.__name, cache_size=self.__cache_size, profile=profile)
+        return self.__pool
+
+    # Closes the reader pool
+    def __close_pool(self):
+        """
+        Closes the reader pool if it is open
+        :return: None
+        """
+        if self.__pool is not None:
+            self.__pool.close()
+            self.__pool = None
+
+    # Displays a word
+    def __display(self, record, verbose=False, define=False):
+        """
+        Displays the info of a word, and its form and definitions if asked for.
+        The record only unpacks what is displayed
+        :param record: WordRecord
+        :param verbose: Whether to display the form
+        :param define: Whether to display the definitions
+        :return: None
+        """
+        for i in record.info:
+            print(i, end=", ", file=self.__out)
+        print(end="\n", file=self.__out)
+        if verbose and record.form is not None:
+            for f in record.form:
+                print(f, end=", ", file=self.__out)
+            print(end="\n", file=self.__out)
+        if define:
+            for d in record.definitions:
+                print(d, end=", ", file=self.__out)
+            print(end="\n", file=self.__out)
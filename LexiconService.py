@@ -0,0 +1,524 @@
+# -*- coding: utf-8 -*-
+import sys                      # For the exit status
+import json                     # For the request and response bodies
+import time                     # For the load test
+import socket                   # For telling a closed connection apart
+import httplib                  # For the client
+import urllib                   # For the client's query strings
+import urlparse                 # For the server's query strings
+import argparse                 # For the command line
+import threading                # For the in-flight lookups and the load test
+import BaseHTTPServer           # For the server
+import SocketServer             # For a thread per connection
+from collections import OrderedDict
+import DatabaseManager as dB    # For the lookups
+import Utils                    # For Part of Speech
+
+# Local Lexicon Service
+# Serves lookups over HTTP/1.1 with JSON bodies, to localhost only. Connections are kept alive between requests.
+#   GET  /info?word=W[&verbose=1][&define=1][&unaccented=1]   Info of one word
+#   POST /info  {"words": [W, ...], "verbose": b, "define": b, "unaccented": b}   Info of many words
+#   GET  /list?pos=P[&chapter=N][&Feature=Value ...]   Every word of a Part of Speech, as a chunked stream
+#        of JSON lines, one word per line
+# A word's info is {"word": W, "found": b, "info": [...], "form": [...], "definitions": [...]}.
+# Each connection has a thread of its own, which only parses and writes. Lookups run on the connections of a
+# ReaderPool, so no more than pool_size of them hit SQLite at once, and lookups of a word that is already being
+# looked up wait for that lookup instead of running again
+
+HOST = "127.0.0.1"
+PORT = 8765
+TIMEOUT = 30    # Seconds an idle kept-alive connection is held open
+FALSE = ("", "0", "false", "no")
+
+
+# Class that runs each lookup only once while it is in flight
+class InFlight:
+    """
+    InFlight runs lookups by key. If a key is already being looked up, the caller waits for that lookup
+    and shares its result instead of running it again. Results are not kept once their lookup is done
+    """
+    __lock = None       # Lock: Held while the calls change
+    __calls = None      # Calls: Dictionary mapping a key in flight to its _Call
+    joined = 0          # Joined: Number of keys that waited on a lookup already in flight
+
+    # Constructor
+    def __init__(self):
+        """
+        Constructor for InFlight
+        """
+        self.__lock = threading.Lock()
+        self.__calls = {}
+
+    # Look up one key
+    def run(self, key, func):
+        """
+        :param key: Key
+        :param func: Function from the key to its result
+        :return: Result
+        """
+        return self.run_many([key], lambda keys: {keys[0]: func(keys[0])})[key]
+
+    # Look up many keys
+    def run_many(self, keys, func):
+        """
+        Looks up the keys that are not in flight with one call, then waits for the ones that are.
+        A caller never waits before its own lookup is done, so two callers cannot wait on each other
+        :param keys: Keys (no repeats)
+        :param func: Function from a list of keys to a dictionary mapping each of them to its result
+        :return: Dictionary mapping each key to its result
+        """
+        mine = []; theirs = []
+        with self.__lock:
+            for key in keys:
+                call = self.__calls.get(key)
+                if call is None:
+                    call = self.__calls[key] = _Call()
+                    mine.append((key, call))
+                else:
+                    theirs.append((key, call))
+                    self.joined += 1
+
+        results = {}
+        try:
+            if mine:
+                found = func([key for key, call in mine])
+                for key, call in mine:
+                    call.result = results[key] = found[key]
+        except Exception, e:
+            for key, call in mine:
+                call.error = e
+            raise
+        finally:
+            with self.__lock:
+                for key, call in mine:
+                    del self.__calls[key]
+            for key, call in mine:
+                call.done.set()
+
+        for key, call in theirs:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            results[key] = call.result
+        return results
+
+
+class _Call:
+    """
+    _Call is a lookup in flight
+    """
+    done = None     # Done: Event set once the result (or error) is in
+    result = None   # Result of the lookup
+    error = None    # Error the lookup raised, if any
+
+    def __init__(self):
+        self.done = threading.Event()
+
+
+# Class that serves the lexicon
+class LexiconServer(SocketServer.ThreadingMixIn, BaseHTTPServer.HTTPServer):
+    """
+    LexiconServer serves lookups on a database to localhost, with a thread per connection
+    """
+    daemon_threads = True       # Do not hold up exiting on a kept-alive connection
+    allow_reuse_address = True
+    db_path = None              # Path to the database
+    pool = None                 # Reader Pool the lookups run on
+    in_flight = None            # In Flight lookups
+
+    # Constructor
+    def __init__(self, db_path, port=PORT, pool_size=dB.ReaderPool.POOL_SIZE, cache_size=dB.Lexicon.CACHE_SIZE):
+        """
+        Constructor for LexiconServer. Binds to HOST only
+        :param db_path: Path to the database
+        :param port: Port to listen on (0 for any free port)
+        :param pool_size: Most lookups to run on SQLite at once
+        :param cache_size: Number of lookup results to cache
+        """
+        self.db_path = db_path
+        self.pool = dB.ReaderPool(db_path, pool_size, cache_size)
+        self.in_flight = InFlight()
+        BaseHTTPServer.HTTPServer.__init__(self, (HOST, port), _Handler)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.server_close()
+
+    # Stop listening
+    def server_close(self):
+        """
+        Stops listening, and closes the reader pool
+        :return: None
+        """
+        BaseHTTPServer.HTTPServer.server_close(self)
+        self.pool.close()
+
+    # Look up many words
+    def lookup(self, words, is_unaccented):
+        """
+        Looks up words on the reader pool, joining any lookup of the same word already in flight
+        (whatever the other request wants shown of it)
+        :param words: Words (UTF-8 strings, no repeats)
+        :param is_unaccented: Whether the words are unaccented or not
+        :return: Dictionary mapping each word to its WordRecord, or to None if it was not found
+        """
+        def select(keys):
+            found = self.pool.select_many([key[0] for key in keys], is_unaccented)
+            return dict((key, found[key[0]]) for key in keys)
+        results = self.in_flight.run_many([(w, is_unaccented) for w in words], select)
+        return dict((key[0], res) for key, res in results.iteritems())
+
+    # Get the counters
+    def stats(self):
+        """
+        :return: Dictionary of the reader pool counters, and Joined (lookups that joined one in flight)
+        """
+        stats = self.pool.stats()
+        stats["Joined"] = self.in_flight.joined
+        return stats
+
+
+# Class that handles the requests of one connection
+class _Handler(BaseHTTPServer.BaseHTTPRequestHandler):
+    """
+    _Handler answers the requests on one kept-alive connection, in order
+    """
+    protocol_version = "HTTP/1.1"   # Keep the connection alive between requests
+    timeout = TIMEOUT
+    wbufsize = -1                   # Buffer each response, and send it in one go once it is written
+    disable_nagle_algorithm = True  # Do not hold the response back waiting on the client's acknowledgement
+
+    def log_message(self, format, *args):
+        pass  # Load tests would drown in one line per request
+
+    def do_GET(self):
+        url = urlparse.urlparse(self.path)
+        query = urlparse.parse_qs(url.query)
+        if url.path == "/info":
+            if "word" not in query:
+                return self.__send_error(400, "Missing word.")
+            is_verbose, is_define, is_unaccented = self.__flags(query)
+            word = query["word"][0]
+            record = self.server.lookup([word], is_unaccented)[word]
+            self.__send_json(_word_json(word, record, is_verbose, is_define))
+        elif url.path == "/list":
+            self.__list(query)
+        elif url.path == "/stats":
+            self.__send_json(self.server.stats())
+        else:
+            self.__send_error(404, "Unknown path: " + url.path + ".")
+
+    def do_POST(self):
+        url = urlparse.urlparse(self.path)
+        try:
+            body = json.loads(self.rfile.read(int(self.headers.getheader("Content-Length", 0))))
+            words = [w.encode("utf-8") for w in body["words"]]
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return self.__send_error(400, "Expected {\"words\": [...]}.")
+        if url.path != "/info":
+            return self.__send_error(404, "Unknown path: " + url.path + ".")
+        is_verbose, is_define, is_unaccented = [bool(body.get(f)) for f in ("verbose", "define", "unaccented")]
+        unique = list(OrderedDict.fromkeys(words))
+        found = self.server.lookup(unique, is_unaccented)
+        self.__send_json({"results": [_word_json(w, found[w], is_verbose, is_define) for w in words]})
+
+    # Helper Methods
+    # Stream a list
+    def __list(self, query):
+        """
+        Streams every word of a Part of Speech that passes the filters, as chunks of JSON lines.
+        Listing reads one page at a time off its own connection, so it is not run on the reader pool
+        :param query: Query string: pos, and optionally chapter and Feature=Value filters
+        :return: None
+        """
+        query = dict((k, v[0]) for k, v in query.iteritems())
+        pos = query.pop("pos", "").lower()
+        parts = [p.value for p in Utils.PartOfSpeech if p.value.lower() == pos]
+        if not parts:
+            return self.__send_error(400, "Unknown or missing pos.")
+        chapter = query.pop("chapter", None)
+        if chapter is not None and not chapter.isdigit():
+            return self.__send_error(400, "Chapter must be a number.")
+        with dB.Lexicon(self.server.db_path, 0, dB.Lexicon.PROFILE_SERVING) as lexicon:
+            columns = dict((c.lower(), c) for c in lexicon.features(parts[0]) or [])
+            unknown = [k for k in query if k.lower() not in columns]
+            if not columns or unknown:
+                return self.__send_error(400, "Cannot list " + parts[0] + (" by " + unknown[0] if unknown else "") + ".")
+            features = [(columns[k.lower()], v) for k, v in query.iteritems()]
+            words = lexicon.list_words(parts[0], int(chapter) if chapter is not None else None, features)
+
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson; charset=utf-8")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            lines = []
+            for name, chap, info in words:
+                lines.append(json.dumps({"word": name, "chapter": chap, "info": info}) + "\n")
+                if len(lines) == dB.Lexicon.FETCH_SIZE:
+                    self.__send_chunk("".join(lines))
+                    lines = []
+            if lines:
+                self.__send_chunk("".join(lines))
+            self.__send_chunk("")  # The empty chunk ends the stream
+
+    # Read the flags of a query
+    def __flags(self, query):
+        """
+        :param query: Parsed query string
+        :return: Whether verbose, define, unaccented
+        """
+        return [query.get(f, [""])[0].lower() not in FALSE for f in ("verbose", "define", "unaccented")]
+
+    # Send a JSON body
+    def __send_json(self, value, code=200):
+        """
+        :param value: Value to send
+        :param code: Status code
+        :return: None
+        """
+        body = json.dumps(value)
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))  # Needed to keep the connection alive
+        self.end_headers()
+        self.wfile.write(body)
+
+    # Send an error
+    def __send_error(self, code, message):
+        """
+        :param code: Status code
+        :param message: Message
+        :return: None
+        """
+        self.__send_json({"error": message}, code)
+
+    # Send one chunk of a chunked body
+    def __send_chunk(self, data):
+        """
+        :param data: Chunk ("" ends the body)
+        :return: None
+        """
+        self.wfile.write("%x\r\n%s\r\n" % (len(data), data))
+        self.wfile.flush()
+
+
+# Turn a word's info into JSON
+def _word_json(word, record, is_verbose, is_define):
+    """
+    :param word: Word
+    :param record: WordRecord, or None if the word was not found
+    :param is_verbose: Whether to include the form
+    :param is_define: Whether to include the definitions
+    :return: Dictionary of Word, Found, Info, Form, Definitions
+    """
+    if record is None:
+        return {"word": word, "found": False, "info": None, "form": None, "definitions": None}
+    return {"word": word, "found": True, "info": record.info, "form": record.form if is_verbose else None,
+            "definitions": record.definitions if is_define else None}
+
+
+# Serve a database
+def serve(db_path, port=PORT, pool_size=dB.ReaderPool.POOL_SIZE, cache_size=dB.Lexicon.CACHE_SIZE):
+    """
+    Serves a database to localhost until interrupted
+    :param db_path: Path to the database
+    :param port: Port to listen on
+    :param pool_size: Most lookups to run on SQLite at once
+    :param cache_size: Number of lookup results to cache
+    :return: None
+    """
+    with LexiconServer(db_path, port, pool_size, cache_size) as server:
+        print "Serving " + db_path + " on http://%s:%d" % server.server_address
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+# Class that talks to a Lexicon Server
+class LexiconClient:
+    """
+    LexiconClient sends requests to a LexiconServer over one kept-alive connection. It is not thread-safe:
+    give each thread a client of its own
+    """
+    __host = None   # Host of the server
+    __port = 0      # Port of the server
+    __conn = None   # HTTP Connection, reopened if the server closed it
+
+    # Constructor
+    def __init__(self, port=PORT, host=HOST):
+        """
+        Constructor for LexiconClient
+        :param port: Port of the server
+        :param host: Host of the server
+        """
+        self.__host = host
+        self.__port = port
+        self.__conn = httplib.HTTPConnection(host, port, timeout=TIMEOUT)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    # Close the connection
+    def close(self):
+        """
+        :return: None
+        """
+        self.__conn.close()
+
+    # Look up a word
+    def info(self, word, is_verbose=False, is_define=False, is_unaccented=False):
+        """
+        :param word: Word (unicode, or a UTF-8 string)
+        :param is_verbose: Whether to include the form
+        :param is_define: Whether to include the definitions
+        :param is_unaccented: Whether the word is unaccented or not
+        :return: Dictionary of Word, Found, Info, Form, Definitions
+        """
+        if isinstance(word, unicode):
+            word = word.encode("utf-8")
+        query = urllib.urlencode([("word", word), ("verbose", int(is_verbose)), ("define", int(is_define)),
+                                  ("unaccented", int(is_unaccented))])
+        return json.loads(self.__request("GET", "/info?" + query).read())
+
+    # Look up many words
+    def info_many(self, words, is_verbose=False, is_define=False, is_unaccented=False):
+        """
+        :param words: Words (unicode, or UTF-8 strings)
+        :param is_verbose: Whether to include the form
+        :param is_define: Whether to include the definitions
+        :param is_unaccented: Whether the words are unaccented or not
+        :return: List of Dictionaries of Word, Found, Info, Form, Definitions, one per word
+        """
+        body = json.dumps({"words": words, "verbose": is_verbose, "define": is_define, "unaccented": is_unaccented})
+        return json.loads(self.__request("POST", "/info", body).read())["results"]
+
+    # List the words of a Part of Speech
+    def list_words(self, pos, chapter=None, features=None):
+        """
+        The list must be read to the end before the client sends another request
+        :param pos: Part of Speech
+        :param chapter: Chapter the words were learned in (None for every chapter)
+        :param features: List of (Feature, Value) that the words must have
+        :return: Generator of Dictionaries of Word, Chapter, Info
+        """
+        query = [("pos", pos)] + ([("chapter", chapter)] if chapter is not None else []) + list(features or [])
+        response = self.__request("GET", "/list?" + urllib.urlencode(query))
+        rest = ""
+        while True:
+            data = response.read(8192)
+            if not data:
+                break
+            lines = (rest + data).split("\n")
+            rest = lines.pop()
+            for line in lines:
+                yield json.loads(line)
+
+    # Get the server counters
+    def stats(self):
+        """
+        :return: Dictionary of the server's counters
+        """
+        return json.loads(self.__request("GET", "/stats").read())
+
+    # Helper Methods
+    # Send a request
+    def __request(self, method, path, body=None):
+        """
+        Sends a request, reconnecting once if the server closed the kept-alive connection
+        :param method: GET or POST
+        :param path: Path and query string
+        :param body: Body, if any
+        :return: Response (raises ValueError on an error status)
+        """
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        try:
+            self.__conn.request(method, path, body, headers)
+            response = self.__conn.getresponse()
+        except (httplib.BadStatusLine, socket.error):  # An idle connection timed out on the server
+            self.__conn.close()
+            self.__conn = httplib.HTTPConnection(self.__host, self.__port, timeout=TIMEOUT)
+            self.__conn.request(method, path, body, headers)
+            response = self.__conn.getresponse()
+        if response.status != 200:
+            raise ValueError(json.loads(response.read())["error"])
+        return response
+
+
+# Load test a server
+def load_test(words, port=PORT, clients=8, requests=2000, batch=1):
+    """
+    Sends lookups from many clients at once, each on its own kept-alive connection, and reports how it went
+    :param words: Words to look up, in turn
+    :param port: Port of the server
+    :param clients: Number of clients (each on its own thread)
+    :param requests: Number of requests each client sends
+    :param batch: Words per request (1 uses GET /info, more use POST /info)
+    :return: Dictionary of Requests, Seconds, Per Second, and the 50th, 90th and 99th percentile latency in ms
+    """
+    latencies = []
+    lock = threading.Lock()
+
+    def run(offset):
+        times = []
+        with LexiconClient(port) as client:
+            for i in range(requests):
+                start = offset + i * batch
+                chunk = [words[(start + j) % len(words)] for j in range(batch)]
+                began = time.time()
+                if batch == 1:
+                    client.info(chunk[0], True, True)
+                else:
+                    client.info_many(chunk, True, True)
+                times.append(time.time() - began)
+        with lock:
+            latencies.extend(times)
+
+    threads = [threading.Thread(target=run, args=(c * requests * batch,)) for c in range(clients)]
+    began = time.time()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    seconds = time.time() - began
+    latencies.sort()
+    count = len(latencies)
+    return {"Requests": count, "Seconds": seconds, "Per Second": count / seconds if seconds > 0 else 0,
+            "p50": latencies[count // 2] * 1000, "p90": latencies[count * 9 // 10] * 1000,
+            "p99": latencies[min(count - 1, count * 99 // 100)] * 1000}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a lexicon database to localhost, or load test a server.")
+    commands = parser.add_subparsers(dest="command")
+    serve_parser = commands.add_parser("serve", help="Serve a database")
+    serve_parser.add_argument("--db", default="Lexicon.db", help="Database to serve")
+    serve_parser.add_argument("--port", type=int, default=PORT)
+    serve_parser.add_argument("--pool-size", type=int, default=dB.ReaderPool.POOL_SIZE,
+                              help="Most lookups to run on SQLite at once")
+    serve_parser.add_argument("--cache-size", type=int, default=dB.Lexicon.CACHE_SIZE)
+    load_parser = commands.add_parser("load", help="Load test a running server with the words of a database")
+    load_parser.add_argument("--db", default="Lexicon.db", help="Database to read the words to look up from")
+    load_parser.add_argument("--port", type=int, default=PORT)
+    load_parser.add_argument("--clients", type=int, default=8)
+    load_parser.add_argument("--requests", type=int, default=2000, help="Requests per client")
+    load_parser.add_argument("--batch", type=int, default=1, help="Words per request")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args.db, args.port, args.pool_size, args.cache_size)
+    else:
+        conn = dB.sql.connect(args.db)
+        conn.text_factory = str
+        sample = [row[0] for row in conn.execute("SELECT WordName FROM " + dB.Lexicon.WORD_TABLE + ";")]
+        conn.close()
+        if not sample:
+            sys.exit("No words in " + args.db + ".")
+        stats = load_test(sample, args.port, args.clients, args.requests, args.batch)
+        print ("%(Requests)d requests in %(Seconds).2fs: %(Per Second).0f /s, "
+               "p50 %(p50).2fms, p90 %(p90).2fms, p99 %(p99).2fms") % stats
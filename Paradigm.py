@@ -0,0 +1,848 @@
+# -*- coding: utf-8 -*-
+import unicodedata              # For taking accents off and putting them back on
+from collections import OrderedDict, namedtuple
+import Utils                    # For the Part of Speech
+import Accents                  # For comparing type fields written with accents
+import Records                  # For the parse records
+
+# Paradigm Expansion
+# Regular words are generated from the form of their entry, so the text file only has to list irregular ones.
+#   Verbs: Ω verbs, from their six principal parts. Present, Imperfect, Future, Aorist, Perfect and Pluperfect, in
+#          every voice and mood those tenses have, for as many principal parts as are given. Verbs contracting in
+#          ἀω, ἐω or ὀω are contracted in the present system, and verbs contracting in the Future in the future.
+#   Nouns: First and Second Declension, from the nominative and genitive.
+#   Adjectives: First and Second Declension, from the masculine, feminine (or none) and neuter.
+# Words listed in the text file override every generated word with the same parse, so only the irregular ones
+# need to be listed. ΜΙ verbs, Third Declension, and anything marked Full irregular are not generated at all.
+# Accents are recessive for verbs, and persistent for nouns and adjectives (kept on the syllable of the
+# first face word, as far as the length of the last syllable allows).
+
+ACUTE = u"\u0301"
+GRAVE = u"\u0300"
+CIRCUMFLEX = u"\u0342"
+MACRON = u"\u0304"      # Marks a long α, ι or υ while generating. Never written out
+BREVE = u"\u0306"
+SMOOTH = u"\u0313"
+ROUGH = u"\u0314"
+SUBSCRIPT = u"\u0345"
+DIAERESIS = u"\u0308"
+VOWELS = u"αεηιουω"
+DIPHTHONGS = (u"αι", u"ει", u"οι", u"υι", u"αυ", u"ευ", u"ηυ", u"ου")
+MISSING = (u"", u"-", u"\u2014", u"None")  # What a principal part the verb does not have is written as
+A_LONG = u"α" + MACRON
+
+# Verb Parses
+PERSONS = [(u"1", u"Singular"), (u"2", u"Singular"), (u"3", u"Singular"), (u"2", u"Dual"), (u"3", u"Dual"),
+           (u"1", u"Plural"), (u"2", u"Plural"), (u"3", u"Plural")]
+ACTIVE = (u"Active",)
+MIDDLE = (u"Middle",)
+PASSIVE = (u"Passive",)
+MIDDLE_PASSIVE = (u"Middle", u"Passive")
+
+# Verb Endings, one for each of PERSONS (None where the mood has no such person). | separates alternatives
+PRESENT_ACTIVE = [u"ω", u"εις", u"ει", u"ετον", u"ετον", u"ομεν", u"ετε", u"ουσι|ουσιν"]
+PRESENT_MP = [u"ομαι", u"ῃ|ει", u"εται", u"εσθον", u"εσθον", u"ομεθα", u"εσθε", u"ονται"]
+IMPERFECT_ACTIVE = [u"ον", u"ες", u"ε|εν", u"ετον", u"ετην", u"ομεν", u"ετε", u"ον"]
+IMPERFECT_MP = [u"ομην", u"ου", u"ετο", u"εσθον", u"εσθην", u"ομεθα", u"εσθε", u"οντο"]
+AORIST_ACTIVE = [u"α", u"ας", u"ε|εν", u"ατον", u"ατην", u"αμεν", u"ατε", u"αν"]
+AORIST_MIDDLE = [u"αμην", u"ω", u"ατο", u"ασθον", u"ασθην", u"αμεθα", u"ασθε", u"αντο"]
+AORIST_PASSIVE = [u"ην", u"ης", u"η", u"ητον", u"ητην", u"ημεν", u"ητε", u"ησαν"]
+PERFECT_ACTIVE = [u"α", u"ας", u"ε|εν", u"ατον", u"ατον", u"αμεν", u"ατε", A_LONG + u"σι|" + A_LONG + u"σιν"]
+PERFECT_MP = [u"μαι", u"σαι", u"ται", u"σθον", u"σθον", u"μεθα", u"σθε", u"νται"]
+PLUPERFECT_ACTIVE = [u"η", u"ης", u"ει|ειν", u"ετον", u"ετην", u"εμεν", u"ετε", u"εσαν"]
+PLUPERFECT_MP = [u"μην", u"σο", u"το", u"σθον", u"σθην", u"μεθα", u"σθε", u"ντο"]
+SUBJUNCTIVE_ACTIVE = [u"ω", u"ῃς", u"ῃ", u"ητον", u"ητον", u"ωμεν", u"ητε", u"ωσι|ωσιν"]
+SUBJUNCTIVE_MP = [u"ωμαι", u"ῃ", u"ηται", u"ησθον", u"ησθον", u"ωμεθα", u"ησθε", u"ωνται"]
+OPTATIVE_ACTIVE = [u"οιμι", u"οις", u"οι", u"οιτον", u"οιτην", u"οιμεν", u"οιτε", u"οιεν"]
+OPTATIVE_MP = [u"οιμην", u"οιο", u"οιτο", u"οισθον", u"οισθην", u"οιμεθα", u"οισθε", u"οιντο"]
+AORIST_OPTATIVE_ACTIVE = [u"αιμι", u"αις", u"αι", u"αιτον", u"αιτην", u"αιμεν", u"αιτε", u"αιεν"]
+AORIST_OPTATIVE_MIDDLE = [u"αιμην", u"αιο", u"αιτο", u"αισθον", u"αισθην", u"αιμεθα", u"αισθε", u"αιντο"]
+AORIST_OPTATIVE_PASSIVE = [u"ειην", u"ειης", u"ειη", u"ειτον", u"ειτην", u"ειμεν", u"ειτε", u"ειεν"]
+PRESENT_IMPERATIVE_ACTIVE = [None, u"ε", u"ετω", u"ετον", u"ετων", None, u"ετε", u"οντων"]
+PRESENT_IMPERATIVE_MP = [None, u"ου", u"εσθω", u"εσθον", u"εσθων", None, u"εσθε", u"εσθων"]
+AORIST_IMPERATIVE_ACTIVE = [None, u"ον", u"ατω", u"ατον", u"ατων", None, u"ατε", u"αντων"]
+AORIST_IMPERATIVE_MIDDLE = [None, u"αι", u"ασθω", u"ασθον", u"ασθων", None, u"ασθε", u"ασθων"]
+AORIST_IMPERATIVE_PASSIVE = [None, u"ητι", u"ητω", u"ητον", u"ητων", None, u"ητε", u"εντων"]
+
+# Contraction: Contract Vowel to the vowel it meets, to what the two become
+CONTRACTIONS = {
+    u"ε": {u"ω": u"ω", u"ει": u"ει", u"ε": u"ει", u"ο": u"ου", u"ου": u"ου", u"η": u"η", u"ῃ": u"ῃ", u"οι": u"οι"},
+    u"α": {u"ω": u"ω", u"ει": u"ᾳ", u"ε": A_LONG, u"ο": u"ω", u"ου": u"ω", u"η": A_LONG, u"ῃ": u"ᾳ", u"οι": u"ῳ"},
+    u"ο": {u"ω": u"ω", u"ει": u"οι", u"ε": u"ου", u"ο": u"ου", u"ου": u"ου", u"η": u"ω", u"ῃ": u"οι", u"οι": u"οι"},
+}
+SPURIOUS = {u"ε": u"ει", u"α": A_LONG, u"ο": u"ου"}  # The infinitive's ει is a contraction itself
+
+# Temporal Augment: Starting vowel, to what it lengthens to (without marks)
+TEMPORAL = [(u"αι", u"η"), (u"ει", u"η"), (u"οι", u"ω"), (u"αυ", u"ηυ"), (u"ευ", u"ηυ"),
+            (u"α", u"η"), (u"ε", u"η"), (u"ο", u"ω"), (u"ι", u"ι"), (u"υ", u"υ"), (u"η", u"η"), (u"ω", u"ω")]
+
+# Noun Parses and Endings: Singular and Plural, each Nominative, Genitive, Dative, Accusative, Vocative
+CASES = (u"Nominative", u"Genitive", u"Dative", u"Accusative", u"Vocative")
+NUMBERS = (u"Singular", u"Plural")
+FIRST_PLURAL = [u"αι", u"ων", u"αις", A_LONG + u"ς", u"αι"]
+FIRST_ETA = ([u"η", u"ης", u"ῃ", u"ην", u"η"], FIRST_PLURAL)
+FIRST_ALPHA = ([A_LONG, A_LONG + u"ς", u"ᾳ", A_LONG + u"ν", A_LONG], FIRST_PLURAL)
+FIRST_SHORT_ALPHA = ([u"α", A_LONG + u"ς", u"ᾳ", u"αν", u"α"], FIRST_PLURAL)
+FIRST_SHORT_ALPHA_ETA = ([u"α", u"ης", u"ῃ", u"αν", u"α"], FIRST_PLURAL)
+FIRST_MASCULINE_ETA = ([u"ης", u"ου", u"ῃ", u"ην", u"η"], FIRST_PLURAL)
+FIRST_MASCULINE_TES = ([u"ης", u"ου", u"ῃ", u"ην", u"α"], FIRST_PLURAL)
+FIRST_MASCULINE_ALPHA = ([A_LONG + u"ς", u"ου", u"ᾳ", A_LONG + u"ν", A_LONG], FIRST_PLURAL)
+SECOND = ([u"ος", u"ου", u"ῳ", u"ον", u"ε"], [u"οι", u"ων", u"οις", u"ους", u"οι"])
+SECOND_NEUTER = ([u"ον", u"ου", u"ῳ", u"ον", u"ον"], [u"α", u"ων", u"οις", u"α", u"α"])
+
+# A run of verbs sharing a stem: Stem, Endings (one for each of PERSONS, or one for an infinitive), Tense, Voices, Mood,
+# Position and Mark of the accent (see accentuate), and whether the stem ends in a vowel that contracts with the endings
+Slot = namedtuple("Slot", ["stem", "endings", "tense", "voices", "mood", "position", "mark", "contract"])
+# One gender of a noun or adjective: Stem, Singular and Plural Endings, Gender, Face word whose accent is kept,
+# and whether it is a First Declension noun (whose genitive plural is always ῶν)
+Declension = namedtuple("Declension", ["stem", "endings", "gender", "face", "is_first_noun"])
+
+# Noun Groups: Major Declension, Nominative Ending, Genitive Ending, Endings (None: by the length of the α)
+NOUN_GROUPS = [
+    (u"First", u"η", u"ης", FIRST_ETA),
+    (u"First", u"α", u"ης", FIRST_SHORT_ALPHA_ETA),
+    (u"First", u"α", u"ας", None),
+    (u"First", u"ης", u"ου", FIRST_MASCULINE_ETA),
+    (u"First", u"ας", u"ου", FIRST_MASCULINE_ALPHA),
+    (u"Second", u"ος", u"ου", SECOND),
+    (u"Second", u"ον", u"ου", SECOND_NEUTER),
+]
+
+
+# Expand an entry
+def expand(entry):
+    """
+    Fills in the words of an entry with its generated paradigm. Words listed in the entry override
+    every generated word with the same parse
+    :param entry: Entry
+    :return: Entry with the generated words added, or entry itself if it has no regular paradigm
+    """
+    generate = GENERATORS.get(entry.part)
+    if generate is None or not entry.form:
+        return entry
+    generated = generate(entry.form)
+    if not generated:
+        return entry
+    return entry._replace(words=merge(generated, entry.words or OrderedDict()))
+
+
+# Merge generated words with listed words
+def merge(generated, listed):
+    """
+    :param generated: Generated words (word to list of parses)
+    :param listed: Listed words (word to tuple of parses)
+    :return: OrderedDict of the listed words, then every generated word whose parse was not listed
+    (word to tuple of parses)
+    """
+    overridden = set(tuple(info) for infos in listed.itervalues() for info in infos)
+    words = OrderedDict()
+    for name, infos in listed.iteritems():
+        words[name] = list(infos)
+    for name, infos in generated.iteritems():
+        for info in infos:
+            if tuple(info) not in overridden:
+                _add(words, name, info)
+    for name in words:
+        words[name] = tuple(words[name])
+    return words
+
+
+# Conjugate a verb
+def conjugate(form):
+    """
+    :param form: Verb Form: Six Principal Parts, Ending, Contract, Aorist, Perfect, Deponent, Irr Type, ...
+    :return: OrderedDict of generated words (word to list of parses), empty if the verb is not regular
+    """
+    return _generate(verb_slots(form))
+
+
+# Decline a noun
+def decline_noun(form):
+    """
+    :param form: Noun Form: Nominative, Genitive, Article, Major, Minor, Gender, Irr Type, ...
+    :return: OrderedDict of generated words (word to list of parses), empty if the noun is not regular
+    """
+    return _generate(noun_slots(form))
+
+
+# Decline an adjective
+def decline_adjective(form):
+    """
+    :param form: Adjective Form: Masculine, Feminine (or blank), Neuter, Major, Minor, Irr Type, ...
+    :return: OrderedDict of generated words (word to list of parses), empty if the adjective is not regular
+    """
+    return _generate(adjective_slots(form))
+
+
+# Get the slots of a verb
+def verb_slots(form):
+    """
+    :param form: Verb Form: Six Principal Parts, Ending, Contract, Aorist, Perfect, Deponent, Irr Type, ...
+    :return: List of Slots, empty if the verb is not regular
+    """
+    slots = []
+    if len(form) < 12 or form[6].strip().upper() != u"Ω" or form[11].strip() == u"Full":
+        return slots
+    parts = [None if p.strip() in MISSING else _plain(p.strip()) for p in form[:6]]
+    contract = Accents.deaccentuate(form[7].strip())
+    vowel = contract[0] if contract in (u"αω", u"εω", u"οω") else None
+
+    # Aorist stems, which also show how the verb is augmented
+    aorist, aorist_kind, aorist_active = None, None, False
+    if parts[2] is not None:
+        for ending, kind, is_active in ((u"α", 1, True), (u"ον", 2, True), (u"αμην", 1, False), (u"ομην", 2, False)):
+            aorist = _strip(parts[2], ending)
+            if aorist is not None:
+                aorist_kind, aorist_active = kind, is_active
+                break
+    passive = _strip(parts[5], u"ην") if parts[5] is not None else None
+    present, present_active = _present_stem(parts[0], vowel)
+    augment = None
+    if present is not None:
+        augment = _augment(present, aorist) if aorist is not None else None
+        if augment is None and passive is not None:
+            augment = _augment(present, passive)
+
+    # Present and Imperfect
+    if present is not None:
+        c = vowel is not None
+        imperfect = _augmented(present, augment)
+        if present_active:
+            _slot(slots, present, PRESENT_ACTIVE, u"Present", ACTIVE, u"Indicative", contract=c)
+            _slot(slots, present, SUBJUNCTIVE_ACTIVE, u"Present", ACTIVE, u"Subjunctive", contract=c)
+            _slot(slots, present, OPTATIVE_ACTIVE, u"Present", ACTIVE, u"Optative", contract=c)
+            _slot(slots, present, PRESENT_IMPERATIVE_ACTIVE, u"Present", ACTIVE, u"Imperative", contract=c)
+            _slot(slots, present, u"ειν", u"Present", ACTIVE, u"Infinitive", contract=c)
+            if imperfect is not None:
+                _slot(slots, imperfect, IMPERFECT_ACTIVE, u"Imperfect", ACTIVE, u"Indicative", contract=c)
+        _slot(slots, present, PRESENT_MP, u"Present", MIDDLE_PASSIVE, u"Indicative", contract=c)
+        _slot(slots, present, SUBJUNCTIVE_MP, u"Present", MIDDLE_PASSIVE, u"Subjunctive", contract=c)
+        _slot(slots, present, OPTATIVE_MP, u"Present", MIDDLE_PASSIVE, u"Optative", contract=c)
+        _slot(slots, present, PRESENT_IMPERATIVE_MP, u"Present", MIDDLE_PASSIVE, u"Imperative", contract=c)
+        _slot(slots, present, u"εσθαι", u"Present", MIDDLE_PASSIVE, u"Infinitive", contract=c)
+        if imperfect is not None:
+            _slot(slots, imperfect, IMPERFECT_MP, u"Imperfect", MIDDLE_PASSIVE, u"Indicative", contract=c)
+
+    # Future
+    if parts[1] is not None:
+        c = form[7].strip() == u"Future"
+        future, future_active = _future_stem(parts[1], c)
+        if future is not None:
+            if future_active:
+                _slot(slots, future, PRESENT_ACTIVE, u"Future", ACTIVE, u"Indicative", contract=c)
+                _slot(slots, future, OPTATIVE_ACTIVE, u"Future", ACTIVE, u"Optative", contract=c)
+                _slot(slots, future, u"ειν", u"Future", ACTIVE, u"Infinitive", contract=c)
+            _slot(slots, future, PRESENT_MP, u"Future", MIDDLE, u"Indicative", contract=c)
+            _slot(slots, future, OPTATIVE_MP, u"Future", MIDDLE, u"Optative", contract=c)
+            _slot(slots, future, u"εσθαι", u"Future", MIDDLE, u"Infinitive", contract=c)
+
+    # Aorist
+    if aorist is not None:
+        bare = _unaugmented(aorist, augment)
+        if aorist_kind == 1:
+            if aorist_active:
+                _slot(slots, aorist, AORIST_ACTIVE, u"Aorist", ACTIVE, u"Indicative")
+            _slot(slots, aorist, AORIST_MIDDLE, u"Aorist", MIDDLE, u"Indicative")
+            if bare is not None:
+                if aorist_active:
+                    _slot(slots, bare, SUBJUNCTIVE_ACTIVE, u"Aorist", ACTIVE, u"Subjunctive")
+                    _slot(slots, bare, AORIST_OPTATIVE_ACTIVE, u"Aorist", ACTIVE, u"Optative")
+                    _slot(slots, bare, AORIST_IMPERATIVE_ACTIVE, u"Aorist", ACTIVE, u"Imperative")
+                    _slot(slots, bare, u"αι", u"Aorist", ACTIVE, u"Infinitive", position=1)
+                _slot(slots, bare, SUBJUNCTIVE_MP, u"Aorist", MIDDLE, u"Subjunctive")
+                _slot(slots, bare, AORIST_OPTATIVE_MIDDLE, u"Aorist", MIDDLE, u"Optative")
+                _slot(slots, bare, AORIST_IMPERATIVE_MIDDLE, u"Aorist", MIDDLE, u"Imperative")
+                _slot(slots, bare, u"ασθαι", u"Aorist", MIDDLE, u"Infinitive")
+        else:
+            if aorist_active:
+                _slot(slots, aorist, IMPERFECT_ACTIVE, u"Aorist", ACTIVE, u"Indicative")
+            _slot(slots, aorist, IMPERFECT_MP, u"Aorist", MIDDLE, u"Indicative")
+            if bare is not None:
+                if aorist_active:
+                    _slot(slots, bare, SUBJUNCTIVE_ACTIVE, u"Aorist", ACTIVE, u"Subjunctive")
+                    _slot(slots, bare, OPTATIVE_ACTIVE, u"Aorist", ACTIVE, u"Optative")
+                    _slot(slots, bare, PRESENT_IMPERATIVE_ACTIVE, u"Aorist", ACTIVE, u"Imperative")
+                    _slot(slots, bare, u"ειν", u"Aorist", ACTIVE, u"Infinitive", position=0, mark=CIRCUMFLEX)
+                _slot(slots, bare, SUBJUNCTIVE_MP, u"Aorist", MIDDLE, u"Subjunctive")
+                _slot(slots, bare, OPTATIVE_MP, u"Aorist", MIDDLE, u"Optative")
+                # The second singular is accented on its ending: λιποῦ
+                _slot(slots, bare, PRESENT_IMPERATIVE_MP[:2], u"Aorist", MIDDLE, u"Imperative",
+                       position=0, mark=CIRCUMFLEX)
+                _slot(slots, bare, [None, None] + PRESENT_IMPERATIVE_MP[2:], u"Aorist", MIDDLE, u"Imperative")
+                _slot(slots, bare, u"εσθαι", u"Aorist", MIDDLE, u"Infinitive", position=1)
+
+    # Aorist Passive and Future Passive
+    if passive is not None:
+        _slot(slots, passive, AORIST_PASSIVE, u"Aorist", PASSIVE, u"Indicative")
+        bare = _unaugmented(passive, augment)
+        if bare is not None:
+            _slot(slots, bare + u"ε", SUBJUNCTIVE_ACTIVE, u"Aorist", PASSIVE, u"Subjunctive", contract=True)
+            _slot(slots, bare, AORIST_OPTATIVE_PASSIVE, u"Aorist", PASSIVE, u"Optative", position=1)
+            _slot(slots, bare, AORIST_IMPERATIVE_PASSIVE, u"Aorist", PASSIVE, u"Imperative")
+            _slot(slots, bare, u"ηναι", u"Aorist", PASSIVE, u"Infinitive", position=1)
+            _slot(slots, bare + u"ησ", PRESENT_MP, u"Future", PASSIVE, u"Indicative")
+            _slot(slots, bare + u"ησ", OPTATIVE_MP, u"Future", PASSIVE, u"Optative")
+            _slot(slots, bare + u"ησ", u"εσθαι", u"Future", PASSIVE, u"Infinitive")
+
+    # Perfect and Pluperfect Active
+    perfect = _strip(parts[3], u"α") if parts[3] is not None else None
+    if perfect is not None:
+        _slot(slots, perfect, PERFECT_ACTIVE, u"Perfect", ACTIVE, u"Indicative")
+        _slot(slots, _pluperfect(perfect), PLUPERFECT_ACTIVE, u"Pluperfect", ACTIVE, u"Indicative")
+        _slot(slots, perfect, u"εναι", u"Perfect", ACTIVE, u"Infinitive", position=1)
+
+    # Perfect and Pluperfect Middle/Passive. Only stems ending in a vowel take the endings as they are
+    perfect = _strip(parts[4], u"μαι") if parts[4] is not None else None
+    if perfect is not None and _letters(perfect)[-1][0].lower() in VOWELS:
+        _slot(slots, perfect, PERFECT_MP, u"Perfect", MIDDLE_PASSIVE, u"Indicative")
+        _slot(slots, _pluperfect(perfect), PLUPERFECT_MP, u"Pluperfect", MIDDLE_PASSIVE, u"Indicative")
+        _slot(slots, perfect, u"σθαι", u"Perfect", MIDDLE_PASSIVE, u"Infinitive", position=1)
+    return slots
+
+
+# Get the slots of a noun
+def noun_slots(form):
+    """
+    :param form: Noun Form: Nominative, Genitive, Article, Major, Minor, Gender, Irr Type, ...
+    :return: List of Declensions (one at most), empty if the noun is not regular
+    """
+    if len(form) < 7 or form[6].strip() == u"Full":
+        return []
+    nominative, genitive, major, gender = form[0].strip(), form[1].strip(), form[3].strip(), form[5].strip()
+    for group_major, nom_ending, gen_ending, endings in NOUN_GROUPS:
+        stem = _strip(_plain(nominative), nom_ending)
+        if group_major != major or stem is None or _strip(_plain(genitive), gen_ending) is None:
+            continue
+        if endings is None:  # α is short if the nominative is accented as if it were: μοῖρα, γέφυρα
+            index, is_circumflex = _accent_of(nominative)
+            syllables = len(_nuclei(_letters(nominative)))
+            short = index is not None and (syllables - 1 - index == 2 or (syllables - 1 - index == 1 and is_circumflex))
+            endings = FIRST_SHORT_ALPHA if short else FIRST_ALPHA
+        elif endings is FIRST_MASCULINE_ETA and _bare(_letters(stem)).endswith(u"τ"):  # πολίτης, ὦ πολῖτα
+            endings = FIRST_MASCULINE_TES
+        return [Declension(stem, endings, gender, nominative, major == u"First")]
+    return []
+
+
+# Get the slots of an adjective
+def adjective_slots(form):
+    """
+    :param form: Adjective Form: Masculine, Feminine (or blank), Neuter, Major, Minor, Irr Type, ...
+    :return: List of Declensions (one for each gender), empty if the adjective is not regular
+    """
+    if len(form) < 6 or form[5].strip() == u"Full":
+        return []
+    masculine, feminine, neuter = form[0].strip(), (form[1] or u"").strip(), form[2].strip()
+    stem = _strip(_plain(masculine), u"ος")
+    if stem is None or _strip(_plain(neuter), u"ον") is None:
+        return []
+    if feminine in MISSING:  # Two endings: the feminine is the masculine
+        female = SECOND
+    elif _strip(_plain(feminine), u"η") is not None:
+        female = FIRST_ETA
+    elif _strip(_plain(feminine), u"α") is not None:
+        female = FIRST_ALPHA
+    else:
+        return []
+    # Every gender keeps the accent of the masculine: ἄξιος, ἀξία, ἄξιαι
+    return [Declension(stem, SECOND, u"Masculine", masculine, False),
+            Declension(stem, female, u"Feminine", masculine, False),
+            Declension(stem, SECOND_NEUTER, u"Neuter", masculine, False)]
+
+
+GENERATORS = {
+    Utils.PartOfSpeech.VERB.value: conjugate,
+    Utils.PartOfSpeech.NOUN.value: decline_noun,
+    Utils.PartOfSpeech.ADJECTIVE.value: decline_adjective,
+}
+SLOTS = {
+    Utils.PartOfSpeech.VERB.value: verb_slots,
+    Utils.PartOfSpeech.NOUN.value: noun_slots,
+    Utils.PartOfSpeech.ADJECTIVE.value: adjective_slots,
+}
+
+
+# Get every word of a slot, without accents
+def outputs(slot):
+    """
+    :param slot: Slot or Declension
+    :return: List of (Ending, Parse) for each word of the slot, in order. inflect gives the word itself
+    """
+    out = []
+    if isinstance(slot, Declension):
+        for number, cases in zip(NUMBERS, slot.endings):
+            for case, ending in zip(CASES, cases):
+                out.append((ending, Records.CaseParse(case, number, slot.gender)))
+        return out
+    if isinstance(slot.endings, basestring):
+        persons = [((u"None", u"None"), slot.endings)]
+    else:
+        persons = zip(PERSONS, slot.endings)
+    for (person, number), ending in persons:
+        if ending is None:
+            continue
+        for e in ending.split(u"|"):
+            if slot.contract and e == u"εν":  # A contracted third singular takes no movable ν: ἐποίει
+                continue
+            for voice in slot.voices:
+                out.append((e, Records.VerbParse(person, number, slot.tense, voice, slot.mood)))
+    return out
+
+
+# Make one word of a slot
+def inflect(slot, ending, info):
+    """
+    :param slot: Slot or Declension
+    :param ending: Ending, as outputs gives it
+    :param info: Parse, as outputs gives it
+    :return: Accented word (unicode, NFC)
+    """
+    if isinstance(slot, Declension):
+        return _decline(slot, ending, info[0], info[1])
+    is_optative = slot.mood == u"Optative"
+    if slot.contract:
+        return _contract(slot.stem, ending, slot.position, slot.mark, is_optative)
+    return accentuate(slot.stem + ending, slot.position, slot.mark, is_optative)
+
+
+# Get the class of a slot
+def slot_class(slot):
+    """
+    Slots of one class differ only in their stems, so they share their written endings
+    :param slot: Slot or Declension
+    :return: Hashable class
+    """
+    if isinstance(slot, Declension):
+        return tuple(tuple(cases) for cases in slot.endings), slot.gender, slot.is_first_noun
+    endings = slot.endings if isinstance(slot.endings, basestring) else tuple(slot.endings)
+    vowel = _letters(slot.stem)[-1][0].lower() if slot.contract else None
+    return endings, slot.tense, slot.voices, slot.mood, slot.position, slot.mark, vowel
+
+
+# Get the stem of a slot as it is written
+def stem_key(slot):
+    """
+    :param slot: Slot or Declension
+    :return: Unaccented lower case stem, without the vowel it contracts (ποι for ποιε)
+    """
+    stem = key(slot.stem)
+    return stem[:-1] if isinstance(slot, Slot) and slot.contract else stem
+
+
+# Get the endings of a slot as they are written
+def written_endings(slot):
+    """
+    :param slot: Slot or Declension
+    :return: List of (Written Ending, Ending, Parse), as outputs gives them. The written ending is unaccented
+    and lower case, and takes in what the stem contracts with, so stem_key(slot) + Written Ending is the word
+    """
+    if isinstance(slot, Declension):
+        dummy = slot._replace(stem=u"τ", face=u"τ" + slot.endings[0][0])
+    else:
+        dummy = slot._replace(stem=u"τ" + (slot_class(slot)[-1] or u""))
+    return [(key(inflect(dummy, ending, info))[1:], ending, info) for ending, info in outputs(dummy)]
+
+
+# Get the key of a word
+def key(word):
+    """
+    :param word: Word (unicode)
+    :return: Unaccented lower case word, without breathings, iota subscripts and other marks
+    """
+    return _bare(_letters(word))
+
+
+# Accent a word
+def accentuate(word, position=None, mark=None, is_optative=False):
+    """
+    Puts an accent on an unaccented word, following the rules on the length of the last two syllables
+    :param word: Unaccented word (unicode). A macron marks a long α, ι or υ, and is taken off
+    :param position: Syllable to accent, counted from the end (0 is the last). None is as far back as allowed
+    :param mark: CIRCUMFLEX to ask for one where it is allowed. Otherwise the rules choose
+    :param is_optative: Whether a final οι or αι counts as long
+    :return: Accented word (unicode, NFC)
+    """
+    letters = _letters(word)
+    nuclei = _nuclei(letters)
+    if nuclei:
+        index, mark = _place(letters, nuclei, position, mark, is_optative)
+        letters[nuclei[index][1]][1] += mark
+    return _render(letters)
+
+
+# Helper Methods
+# Add a parse of a word
+def _add(words, name, info):
+    """
+    :param words: Word to list of parses
+    :param name: Word
+    :param info: Parse
+    :return: None
+    """
+    infos = words.setdefault(name, [])
+    if info not in infos:
+        infos.append(info)
+
+
+# Add a slot
+def _slot(slots, stem, endings, tense, voices, mood, position=None, mark=None, contract=False):
+    """
+    :param slots: Slots, to add to
+    :param stem: Stem (unaccented)
+    :param endings: Endings, one for each of PERSONS, or a single ending for an infinitive
+    :param tense: Tense
+    :param voices: Voices the words are parsed as
+    :param mood: Mood
+    :param position: Syllable to accent, counted from the end (None is recessive)
+    :param mark: CIRCUMFLEX to ask for one
+    :param contract: Whether the stem ends in a vowel that contracts with the endings
+    :return: None
+    """
+    slots.append(Slot(stem, endings, tense, voices, mood, position, mark, contract))
+
+
+# Generate the words of some slots
+def _generate(slots):
+    """
+    :param slots: Slots or Declensions
+    :return: OrderedDict of words (word to list of parses)
+    """
+    words = OrderedDict()
+    for slot in slots:
+        names = {}  # A verb's ending gives the same word in every voice
+        for ending, info in outputs(slot):
+            name = names.get(ending) if isinstance(slot, Slot) else None
+            if name is None:
+                name = names[ending] = inflect(slot, ending, info)
+            _add(words, name, info)
+    return words
+
+
+# Decline one word
+def _decline(declension, ending, case, number):
+    """
+    :param declension: Declension
+    :param ending: Ending
+    :param case: Case
+    :param number: Number
+    :return: Accented word (unicode, NFC)
+    """
+    index, is_circumflex = _accent_of(declension.face)
+    word = declension.stem + ending
+    position, mark = None, None
+    if index is not None:
+        position = max(len(_nuclei(_letters(word))) - 1 - index, 0)
+        if declension.is_first_noun and number == u"Plural" and case == u"Genitive":
+            position, mark = 0, CIRCUMFLEX
+        elif index == len(_nuclei(_letters(declension.face))) - 1 and (is_circumflex or case in (u"Genitive", u"Dative")):
+            mark = CIRCUMFLEX
+    return accentuate(word, position, mark)
+
+
+# Contract a stem with an ending
+def _contract(stem, ending, position, mark, is_optative):
+    """
+    Accents the uncontracted word, then contracts it. An accent on the first of the two vowels
+    becomes a circumflex, and one on the second an acute
+    :param stem: Stem, ending in ε, α or ο
+    :param ending: Ending
+    :param position: Syllable to accent, counted from the end (None is recessive)
+    :param mark: CIRCUMFLEX to ask for one
+    :param is_optative: Whether a final οι or αι counts as long
+    :return: Accented word (unicode, NFC)
+    """
+    head = _letters(stem)
+    letters = head + _letters(ending)
+    nuclei = _nuclei(letters)
+    k = len(head) - 1
+    s = [i for i, (first, last) in enumerate(nuclei) if first <= k <= last]
+    if not s or s[0] + 1 >= len(nuclei) or nuclei[s[0] + 1][0] != k + 1:
+        return accentuate(stem + ending, position, mark, is_optative)
+    s = s[0]
+    first, last = nuclei[s + 1]
+    meets = unicodedata.normalize("NFC", u"".join(b.lower() + m.replace(MACRON, u"")
+                                                   for b, m in letters[first:last + 1]))
+    vowel = letters[k][0].lower()
+    if ending == u"ειν":
+        result = SPURIOUS.get(vowel)
+    else:
+        result = CONTRACTIONS.get(vowel, {}).get(meets)
+    if result is None:
+        return accentuate(stem + ending, position, mark, is_optative)
+    index, _ = _place(letters, nuclei, position, mark, is_optative)
+    is_final = last == len(letters) - 1  # A final οι from a contraction is long: δηλοῖ
+    letters = letters[:k] + _letters(result) + letters[last + 1:]
+    mark = None
+    if index == s:
+        mark = CIRCUMFLEX
+    elif index > s:
+        index -= 1
+    nuclei = _nuclei(letters)
+    index, mark = _place(letters, nuclei, len(nuclei) - 1 - index, mark, is_optative or is_final)
+    letters[nuclei[index][1]][1] += mark
+    return _render(letters)
+
+
+# Choose the syllable and the accent
+def _place(letters, nuclei, position, mark, is_optative):
+    """
+    :param letters: Letters
+    :param nuclei: Vowels of each syllable
+    :param position: Syllable to accent, counted from the end (None is as far back as allowed)
+    :param mark: CIRCUMFLEX to ask for one
+    :param is_optative: Whether a final οι or αι counts as long
+    :return: Index of the syllable from the start, and ACUTE or CIRCUMFLEX
+    """
+    n = len(nuclei)
+    ultima_long = _is_long(letters, nuclei[-1], not is_optative)
+    if position is None:
+        position = 1 if ultima_long else 2
+    position = max(0, min(position, n - 1))
+    if position == 2 and ultima_long:
+        position = 1
+    index = n - 1 - position
+    is_long = _is_long(letters, nuclei[index], position == 0 and not is_optative)
+    if mark == CIRCUMFLEX and is_long and (position == 0 or (position == 1 and not ultima_long)):
+        return index, CIRCUMFLEX
+    if position == 1 and is_long and not ultima_long:
+        return index, CIRCUMFLEX
+    return index, ACUTE
+
+
+# Whether a syllable is long
+def _is_long(letters, nucleus, is_final_short):
+    """
+    :param letters: Letters
+    :param nucleus: First and last letter of the syllable's vowels
+    :param is_final_short: Whether a final οι or αι counts as short
+    :return: Whether the syllable is long
+    """
+    first, last = nucleus
+    if first != last:
+        vowels = (letters[first][0] + letters[last][0]).lower()
+        return not (is_final_short and last == len(letters) - 1 and vowels in (u"αι", u"οι"))
+    base, marks = letters[first]
+    return base.lower() in u"ηω" or (base.lower() in u"αιυ" and (MACRON in marks or SUBSCRIPT in marks))
+
+
+# Split a word into letters
+def _letters(word):
+    """
+    :param word: Word (unicode)
+    :return: List of [Letter, Marks], without accents. A circumflex on α, ι or υ is kept as a macron
+    """
+    letters = []
+    for ch in unicodedata.normalize("NFD", word):
+        if not unicodedata.combining(ch):
+            letters.append([ch, u""])
+        elif not letters:
+            continue
+        elif ch == CIRCUMFLEX:
+            if letters[-1][0].lower() in u"αιυ" and MACRON not in letters[-1][1]:
+                letters[-1][1] += MACRON
+        elif ch not in (ACUTE, GRAVE):
+            letters[-1][1] += ch
+    return letters
+
+
+# Find the vowels of each syllable
+def _nuclei(letters):
+    """
+    :param letters: Letters
+    :return: List of (First, Last) letter indices of the vowel or diphthong of each syllable
+    """
+    nuclei = []
+    i = 0
+    while i < len(letters):
+        base, marks = letters[i]
+        if base.lower() in VOWELS:
+            if (i + 1 < len(letters) and (base + letters[i + 1][0]).lower() in DIPHTHONGS and
+                    DIAERESIS not in letters[i + 1][1] and SUBSCRIPT not in marks and MACRON not in marks):
+                nuclei.append((i, i + 1))
+                i += 2
+                continue
+            nuclei.append((i, i))
+        i += 1
+    return nuclei
+
+
+# Find the accent of a word
+def _accent_of(word):
+    """
+    :param word: Accented word
+    :return: Index of the accented syllable from the start, and whether it is a circumflex. (None, False) if unaccented
+    """
+    letter = -1
+    for ch in unicodedata.normalize("NFD", word):
+        if not unicodedata.combining(ch):
+            letter += 1
+        elif ch in (ACUTE, GRAVE, CIRCUMFLEX):
+            for i, (first, last) in enumerate(_nuclei(_letters(word))):
+                if first <= letter <= last:
+                    return i, ch == CIRCUMFLEX
+    return None, False
+
+
+# Join letters back into a word
+def _join(letters):
+    """
+    :param letters: Letters
+    :return: Word (unicode, decomposed)
+    """
+    return u"".join(b + m for b, m in letters)
+
+
+# Write letters out
+def _render(letters):
+    """
+    :param letters: Letters
+    :return: Word (unicode, NFC), without length marks
+    """
+    return unicodedata.normalize("NFC", u"".join(b + m.replace(MACRON, u"").replace(BREVE, u"") for b, m in letters))
+
+
+# Letters without marks
+def _bare(letters):
+    """
+    :param letters: Letters
+    :return: The lower case letters alone
+    """
+    return u"".join(b.lower() for b, m in letters)
+
+
+# Take the accents off a word
+def _plain(word):
+    """
+    Takes the accents off, and any breathing not on the first syllable (a typing slip like πεπαἰδευκα)
+    :param word: Word
+    :return: Unaccented word (unicode, decomposed)
+    """
+    letters = _letters(word)
+    nuclei = _nuclei(letters)
+    start = nuclei[0][1] if nuclei else -1
+    for letter in letters[start + 1:]:
+        letter[1] = letter[1].replace(SMOOTH, u"").replace(ROUGH, u"")
+    return _join(letters)
+
+
+# Take an ending off a word
+def _strip(word, ending):
+    """
+    :param word: Unaccented word
+    :param ending: Ending
+    :return: What is left of the word, or None if the word does not end with ending
+    """
+    letters = _letters(word)
+    tail = _bare(_letters(ending))
+    if len(letters) <= len(tail) or _bare(letters[-len(tail):]) != tail:
+        return None
+    return _join(letters[:-len(tail)])
+
+
+# Find the present stem
+def _present_stem(part, vowel):
+    """
+    :param part: First principal part (unaccented), or None
+    :param vowel: Contract vowel, or None
+    :return: Stem (with its contract vowel), and whether the verb has an active. (None, False) if it does not fit
+    """
+    if part is None:
+        return None, False
+    endings = [(u"ω", True), (u"ομαι", False)]
+    if vowel is not None:  # Contracted first principal parts: ποιῶ, ποιοῦμαι, τιμῶμαι
+        endings += [(u"ουμαι", False), (u"ωμαι", False)]
+    for ending, is_active in endings:
+        stem = _strip(part, ending)
+        if stem is not None:
+            if vowel is not None and _letters(stem)[-1][0].lower() != vowel:
+                stem += vowel
+            return stem, is_active
+    return None, False
+
+
+# Find the future stem
+def _future_stem(part, is_contract):
+    """
+    :param part: Second principal part (unaccented)
+    :param is_contract: Whether the future contracts (μενῶ)
+    :return: Stem (with ε if it contracts), and whether the verb has a future active. (None, False) if it does not fit
+    """
+    endings = [(u"ω", True), (u"ουμαι", False), (u"ομαι", False)] if is_contract else [(u"ω", True), (u"ομαι", False)]
+    for ending, is_active in endings:
+        stem = _strip(part, ending)
+        if stem is not None:
+            return (stem + u"ε" if is_contract else stem), is_active
+    return None, False
+
+
+# Work out the augment
+def _augment(present, augmented):
+    """
+    Compares the start of the present stem with an augmented stem
+    :param present: Present stem
+    :param augmented: Augmented stem (Aorist, or Aorist Passive)
+    :return: (Augmented Start, Unaugmented Start), or None if the augment is not regular
+    """
+    p, a = _letters(present), _letters(augmented)
+    bp, ba = _bare(p), _bare(a)
+    if not bp or len(ba) < 2:
+        return None
+    # Syllabic: ἐ before the first consonant
+    if bp[0] not in VOWELS and ba[0] == u"ε" and ba[1] == bp[0]:
+        return _join(a[:1]), u""
+    # Temporal: the first vowel lengthened
+    for short, long_ in TEMPORAL:
+        if (bp.startswith(short) and ba.startswith(long_) and len(bp) > len(short) and len(ba) > len(long_) and
+                bp[len(short)] == ba[len(long_)]):
+            return _join(a[:len(long_)]), _join(p[:len(short)])
+    # Compound: ἐ after the prefix, which loses its last vowel (ἀπο- ἀπε-) or keeps its consonant (προσ- προσε-)
+    i = 0
+    while i < min(len(bp), len(ba)) and bp[i] == ba[i]:
+        i += 1
+    if 2 <= i < len(bp) and i + 1 < len(ba) and ba[i] == u"ε":
+        if bp[i] in VOWELS and bp[i + 1:i + 2] == ba[i + 1:i + 2]:
+            return _join(a[:i + 1]), _join(p[:i + 1])
+        if bp[i] == ba[i + 1]:
+            return _join(a[:i + 1]), _join(p[:i])
+    return None
+
+
+# Augment a stem
+def _augmented(stem, augment):
+    """
+    :param stem: Unaugmented stem
+    :param augment: (Augmented Start, Unaugmented Start)
+    :return: Augmented stem, or None if it cannot be augmented
+    """
+    if augment is None:
+        return None
+    letters, start = _letters(stem), _letters(augment[1])
+    if _bare(letters[:len(start)]) != _bare(start):
+        return None
+    return augment[0] + _join(letters[len(start):])
+
+
+# Take the augment off a stem
+def _unaugmented(stem, augment):
+    """
+    :param stem: Augmented stem
+    :param augment: (Augmented Start, Unaugmented Start)
+    :return: Unaugmented stem, or None if it cannot be unaugmented
+    """
+    if augment is None:
+        return None
+    letters, start = _letters(stem), _letters(augment[0])
+    if _bare(letters[:len(start)]) != _bare(start):
+        return None
+    return augment[1] + _join(letters[len(start):])
+
+
+# Augment a perfect stem
+def _pluperfect(stem):
+    """
+    :param stem: Perfect stem
+    :return: Pluperfect stem: ἐ before a stem that starts with a consonant, the stem itself otherwise
+    """
+    if _bare(_letters(stem))[:1] in VOWELS:
+        return stem
+    return u"ἐ" + stem
@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+import re                       # For tokenizing
+import unicodedata              # For moving accents around
+from collections import deque   # For the window of chunks being looked up
+from multiprocessing.pool import ThreadPool  # For looking up chunks in parallel
+import Accents                  # For the unaccented fallback
+
+# Passage Analysis
+# A passage is split into tokens: runs of letters, with an elision mark if one follows them.
+# Punctuation (including the Greek · and ;) and numbers are dropped.
+# Each distinct token is looked up once, trying in turn:
+#   1. The token as written, then with its accents as the dictionary writes them (a grave turned back
+#      into an acute, and the extra accent a word takes before an enclitic dropped), then in lower case.
+#   2. The same, without accents (the UnaccentedWordName path, as INFO -u does). This also finds enclitics,
+#      which lose or gain their accent depending on the word before them.
+#   3. For an elided token, the token with each short vowel put back, without accents
+#      (with the aspirated consonant an elision leaves before a rough breathing turned back: ἀφ’ is ἀπό).
+
+ELISION = u"\u2019'\u1fbd\u02bc\u1fbf"  # Right quote, apostrophe, koronis, modifier apostrophe, psili
+TOKEN = re.compile(u"[^\\W\\d_]+[" + ELISION + u"]?", re.UNICODE)
+ELIDED_VOWELS = u"αεοι"
+DEASPIRATE = {u"φ": u"π", u"θ": u"τ", u"χ": u"κ"}
+ACUTE = u"\u0301"
+GRAVE = u"\u0300"
+CIRCUMFLEX = u"\u0342"
+CHUNK_SIZE = 2000   # Tokens looked up at a time
+
+
+# Split text into tokens
+def tokenize(lines):
+    """
+    :param lines: Lines of text (unicode, or UTF-8 strings), or a single string
+    :return: Generator of tokens (unicode, NFC), in the order they appear
+    """
+    if isinstance(lines, basestring):
+        lines = [lines]
+    for line in lines:
+        if isinstance(line, str):
+            line = line.decode("utf-8")
+        for token in TOKEN.findall(unicodedata.normalize("NFC", line)):
+            yield token
+
+
+# Put a token's accents back as the dictionary writes them
+def normalize(token):
+    """
+    Turns a grave into an acute, and drops the second accent a word takes before an enclitic
+    (ἄνθρωπός τις is ἄνθρωπος). Tokens with neither are returned as they are
+    :param token: Token (unicode, NFC, without an elision mark)
+    :return: Token (unicode, NFC)
+    """
+    marks = unicodedata.normalize("NFD", token)
+    if GRAVE not in marks and sum(marks.count(a) for a in (ACUTE, CIRCUMFLEX)) < 2:
+        return token
+    marks = marks.replace(GRAVE, ACUTE)
+    if sum(marks.count(a) for a in (ACUTE, CIRCUMFLEX)) >= 2:
+        last = marks.rfind(ACUTE)
+        marks = marks[:last] + marks[last + 1:]
+    return unicodedata.normalize("NFC", marks)
+
+
+# Get what to look a token up as
+def candidates(token):
+    """
+    :param token: Token (unicode, NFC)
+    :return: List of accented words, then list of unaccented words, to look up in that order (UTF-8 strings)
+    """
+    elided = token[-1] in ELISION
+    word = token[:-1] if elided else token
+    accented = []
+    for w in (word, normalize(word), normalize(word).lower()):
+        if w not in accented:
+            accented.append(w)
+    unaccented = []
+    for w in Accents.deaccentuate_all(accented):
+        if w not in unaccented:
+            unaccented.append(w)
+    if elided:  # Put the vowel back. Where it went, and so the accent, is unknown, so these are unaccented
+        stem = unaccented[-1]
+        stems = [stem] + ([stem[:-1] + DEASPIRATE[stem[-1]]] if stem[-1] in DEASPIRATE else [])
+        unaccented += [s + v for s in stems for v in ELIDED_VOWELS]
+    return [w.encode("utf-8") for w in accented], [w.encode("utf-8") for w in unaccented]
+
+
+# Class that looks up every token of a passage
+class PassageAnalyzer:
+    """
+    PassageAnalyzer looks up every token of a passage, each distinct token only once.
+    Tokens are looked up a chunk at a time, with one select_many per kind of candidate, and results are
+    given back in text order as soon as their chunk is done. With more than one worker, up to twice as many
+    chunks as workers are looked up at once, so the reader must be safe to call from many threads
+    (a ReaderPool, or a SnapshotLexicon)
+    """
+    __reader = None         # Reader: Anything with Lexicon's select_many
+    __workers = 1           # Workers: Number of chunks looked up at once
+    __chunk_size = 0        # Chunk Size: Tokens per chunk
+    tokens = 0              # Tokens: Number of tokens analyzed so far
+    unique = 0              # Unique: Number of distinct tokens looked up so far
+    missing = 0             # Missing: Number of distinct tokens that were not found
+
+    # Constructor
+    def __init__(self, reader, workers=1, chunk_size=CHUNK_SIZE):
+        """
+        Constructor for PassageAnalyzer
+        :param reader: Lexicon, ReaderPool or SnapshotLexicon to look tokens up in
+        :param workers: Number of chunks to look up at once (1 looks them up one after another, on this thread)
+        :param chunk_size: Tokens per chunk
+        """
+        self.__reader = reader
+        self.__workers = workers
+        self.__chunk_size = chunk_size
+
+    # Analyze a passage
+    def analyze(self, tokens, is_unaccented=False):
+        """
+        Looks up every token
+        :param tokens: Tokens (as tokenize gives them)
+        :param is_unaccented: Whether to skip straight to the unaccented lookups
+        :return: Generator of (Token, Word, WordRecord) in text order. Token and Word are UTF-8 strings.
+        Word is what the token was found as; Word and the record are None if it was not found
+        """
+        results = {}    # Token to (Word, Record), for every token already looked up
+        claimed = set()  # Tokens already handed to a chunk
+        pool = ThreadPool(self.__workers) if self.__workers > 1 else None
+        window = deque()  # Chunks being looked up, in text order
+        try:
+            for chunk in self.__chunks(tokens):
+                new = [t for t in set(chunk) if t not in claimed]
+                claimed.update(new)
+                if pool is None:
+                    window.append((chunk, _Done(self.__lookup(new, is_unaccented))))
+                else:
+                    window.append((chunk, pool.apply_async(self.__lookup, (new, is_unaccented))))
+                # Hand back the chunks at the front that are done, and wait on the first if the window is full
+                while window and (window[0][1].ready() or len(window) >= 2 * self.__workers):
+                    for item in self.__finish(window.popleft(), results):
+                        yield item
+            while window:
+                for item in self.__finish(window.popleft(), results):
+                    yield item
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+    # Helper Methods
+    # Split the tokens into chunks
+    def __chunks(self, tokens):
+        """
+        :param tokens: Tokens
+        :return: Generator of lists of at most chunk_size tokens
+        """
+        chunk = []
+        for token in tokens:
+            chunk.append(token)
+            if len(chunk) == self.__chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    # Hand back the results of a chunk
+    def __finish(self, item, results):
+        """
+        Waits for a chunk to be looked up, and gives back the result of each of its tokens.
+        Every token of the chunk was looked up by it or by a chunk before it, which have all finished
+        :param item: Chunk, and the result of its lookup
+        :param results: Token to (Word, Record), for every token already looked up
+        :return: Generator of (Token, Word, Record)
+        """
+        chunk, found = item
+        found = found.get()
+        results.update(found)
+        self.unique += len(found)
+        self.missing += sum(1 for word, record in found.itervalues() if word is None)
+        for token in chunk:
+            word, record = results[token]
+            self.tokens += 1
+            yield token.encode("utf-8"), word, record
+
+    # Look up distinct tokens
+    def __lookup(self, tokens, is_unaccented):
+        """
+        Looks up every candidate of the tokens, one kind of candidate at a time, and keeps the first hit of each
+        :param tokens: Distinct tokens
+        :param is_unaccented: Whether to skip straight to the unaccented lookups
+        :return: Dictionary mapping each token to (Word, Record), or to (None, None) if it was not found
+        """
+        found = {}
+        options = dict((t, candidates(t)) for t in tokens)
+        for kind in ((1,) if is_unaccented else (0, 1)):
+            left = [t for t in tokens if t not in found]
+            words = [w for t in left for w in options[t][kind]]
+            if not words:
+                continue
+            hits = self.__reader.select_many(words, kind == 1)
+            for t in left:
+                for w in options[t][kind]:
+                    if hits.get(w) is not None:
+                        found[t] = (w, hits[w])
+                        break
+        for t in tokens:
+            found.setdefault(t, (None, None))
+        return found
+
+
+class _Done:
+    """
+    _Done holds a result that is already in, like a finished asynchronous result
+    """
+    __value = None
+
+    def __init__(self, value):
+        self.__value = value
+
+    def ready(self):
+        return True
+
+    def get(self):
+        return self.__value
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+import Utils    # For the Part of Speech
+from collections import namedtuple
+
+# Entry Records
+# The parser reads each entry into a Form record and a Parse record per listed word, rather than into flat lists.
+# The fields of a Form up to its chapter are the columns of its Form Table, in order, so a Form can still be
+# indexed like a Form Table row. A Parse holds the columns of its Word Table, in order.
+# Feature strings (types, chapters and parses) come from a small vocabulary, so each one is interned: every
+# "Singular" read in shares one string, instead of each line of the file keeping its own copy.
+
+# Forms
+VerbForm = namedtuple("VerbForm", ["first", "second", "third", "fourth", "fifth", "sixth", "ending", "contraction",
+                                   "aorist", "perfect", "deponency", "irregularity", "chapter", "definitions"])
+NounForm = namedtuple("NounForm", ["nominative", "genitive", "article", "major", "minor", "gender", "irregularity",
+                                   "chapter", "definitions"])
+AdjectiveForm = namedtuple("AdjectiveForm", ["masculine", "feminine", "neuter", "major", "minor", "irregularity",
+                                             "chapter", "definitions"])
+PronounForm = namedtuple("PronounForm", ["masculine", "feminine", "neuter", "person", "type", "chapter",
+                                         "definitions"])
+ParticipleForm = namedtuple("ParticipleForm", ["first", "second", "third", "fourth", "fifth", "sixth", "chapter",
+                                               "definitions"])  # A participle entry has no chapter or definitions
+MiscForm = namedtuple("MiscForm", ["word", "chapter", "definitions"])
+
+# Parses
+VerbParse = namedtuple("VerbParse", ["person", "number", "tense", "voice", "mood"])
+CaseParse = namedtuple("CaseParse", ["case", "number", "gender"])  # Nouns and Adjectives
+PronounParse = namedtuple("PronounParse", ["case", "number", "gender", "person"])
+ParticipleParse = namedtuple("ParticipleParse", ["case", "number", "gender", "tense", "voice"])
+
+# Records of each Part of Speech: Part to (Form, Parse). Any other part is a MiscForm, with tuples for parses
+RECORDS = {
+    Utils.PartOfSpeech.VERB.value: (VerbForm, VerbParse),
+    Utils.PartOfSpeech.NOUN.value: (NounForm, CaseParse),
+    Utils.PartOfSpeech.ADJECTIVE.value: (AdjectiveForm, CaseParse),
+    Utils.PartOfSpeech.PRONOUN.value: (PronounForm, PronounParse),
+    Utils.PartOfSpeech.PARTICIPLE.value: (ParticipleForm, ParticipleParse),
+}
+TYPES = {   # Part to the number of leading columns that are not types (principal parts or headwords)
+    Utils.PartOfSpeech.VERB.value: 6,
+    Utils.PartOfSpeech.NOUN.value: 3,
+    Utils.PartOfSpeech.ADJECTIVE.value: 3,
+    Utils.PartOfSpeech.PRONOUN.value: 3,
+    Utils.PartOfSpeech.PARTICIPLE.value: 6,
+}
+
+_FEATURES = {}  # Features: Every interned feature string, mapping to itself
+
+
+# Intern a feature string
+def feature(value):
+    """
+    :param value: Feature string (unicode or str), or None
+    :return: The one shared copy of the string
+    """
+    if value is None:
+        return None
+    return _FEATURES.setdefault(value, value)
+
+
+# Build a form
+def make_form(part, columns, chapter=None, definitions=()):
+    """
+    :param part: Part of Speech
+    :param columns: Form Table columns as read: principal parts or headwords, then types. Missing columns are None,
+    and extra ones are dropped
+    :param chapter: Chapter
+    :param definitions: Definitions
+    :return: Form record of the part, with its types and chapter interned
+    """
+    cls = RECORDS[part][0] if part in RECORDS else MiscForm
+    count = len(cls._fields) - 2
+    columns = list(columns[:count]) + [None] * (count - len(columns))
+    words = TYPES.get(part, count)
+    columns[words:] = [feature(t) for t in columns[words:]]
+    return cls._make(columns + [feature(chapter), tuple(definitions)])
+
+
+# Build a parse
+def make_parse(part, values):
+    """
+    :param part: Part of Speech
+    :param values: Word Table columns as read
+    :return: Parse record of the part (a tuple for the other parts), with every value interned
+    :raise ValueError: If there are not exactly as many values as the Word Table has columns
+    """
+    if part not in RECORDS:
+        return tuple(feature(v) for v in values)
+    cls = RECORDS[part][1]
+    if len(values) != len(cls._fields):
+        raise ValueError("a " + part + " is parsed by " + str(len(cls._fields)) + " values (" +
+                         ", ".join(cls._fields) + "), not " + str(len(values)))
+    return cls._make([feature(v) for v in values])
+
+
+# Get the columns of a form
+def columns(form):
+    """
+    :param form: Form record
+    :return: Tuple of its Form Table columns
+    """
+    return form[:-2]
+
+
+# Flatten a form
+def values(form):
+    """
+    :param form: Form record
+    :return: List of its values in file order: columns, chapter, then each definition. Missing values are left out
+    """
+    return [v for v in form[:-1] if v is not None] + list(form.definitions)
@@ -0,0 +1,324 @@
+# -*- coding: utf-8 -*-
+import os                       # For replacing the snapshot file
+import mmap                     # For mapping the snapshot file
+import struct                   # For the binary layout
+import sqlite3 as sql           # For reading the database
+from collections import OrderedDict
+import DatabaseManager as dB    # For the table names
+
+# Snapshot File Layout (little-endian, every number is an unsigned 32-bit integer):
+# Header:     Magic "GHLX", Version, then Offset and Count of each of the 4 sections below
+# Strings:    Count + 1 Starts, then the String Pool. String i is Pool[Starts[i]:Starts[i + 1]] (UTF-8)
+# Tuples:     Count + 1 Starts, then the Items. Tuple i is Items[Starts[i]:Starts[i + 1]], a list of String IDs
+# Words:      Count Records of (Name Start, Name End, Word Name, Form ID, Part, Info, Form, Definitions), sorted by
+#             the bytes of Name. The Name is Pool[Name Start:Name End], Word Name and Part are String IDs, and the
+#             rest are Tuple IDs (Form is NULL for a word without one). Definitions is one String ID per definition
+# Unaccented: Same as Words, but Name is the Unaccented Word Name (and Word Name is still the accented one)
+# Every value is a String ID, so a feature like "Singular" is stored once and is just its ID everywhere else.
+# A String ID of NULL stands for a NULL in the database.
+
+MAGIC = "GHLX"
+VERSION = 2
+NULL = 0xFFFFFFFF
+EXTENSION = ".snap"
+HEADER = struct.Struct("<4sI8I")
+RECORD = struct.Struct("<8I")
+NUMBER = struct.Struct("<I")
+PAIR = struct.Struct("<2I")
+
+
+# Get the default snapshot file of a database
+def path_for(db_path):
+    """
+    :param db_path: Path of the database
+    :return: Path of its snapshot file
+    """
+    return os.path.splitext(db_path)[0] + EXTENSION
+
+
+# Compile a snapshot
+def compile_snapshot(db_path, snapshot_path=None):
+    """
+    Compiles the database into a read-only snapshot file, which SnapshotLexicon can answer lookups from
+    :param db_path: Path of the database
+    :param snapshot_path: Path of the snapshot file (None for path_for(db_path))
+    :return: Number of words in the snapshot
+    """
+    if snapshot_path is None:
+        snapshot_path = path_for(db_path)
+    conn = sql.connect(db_path)
+    conn.text_factory = str
+    cur = conn.cursor()
+    strings = _Table(); tuples = _Table()
+
+    # Info rows: (Table, Word ID, Form ID) to Tuple ID. Form rows: (Form Table, Form ID) to Tuple ID
+    infos = {}; forms = {}; form_tables = set()
+    for table, form_table in sorted(dB.Lexicon.POS_TABLES.itervalues()):
+        cur.execute("SELECT * FROM " + table + ";")
+        for row in cur:
+            infos[(table, row[0], row[1])] = tuples.add(tuple(strings.add(v) for v in row[2:]))
+        if form_table not in form_tables:  # Verbs and Participles share a Form Table
+            form_tables.add(form_table)
+            cur.execute("SELECT * FROM " + form_table + ";")
+            for row in cur:
+                forms[(form_table, row[0])] = tuples.add(tuple(strings.add(v) for v in row[1:]))
+
+    # Definitions: Form ID to Tuple ID, in the same order select gives them
+    defs = {}
+    cur.execute("SELECT FormID, Definition FROM " + dB.Lexicon.DEF_TABLE + " ORDER BY FormID, Definition;")
+    for form_id, definition in cur:
+        defs.setdefault(form_id, []).append(strings.add(definition))
+    defs = dict((form_id, tuples.add(tuple(d))) for form_id, d in defs.iteritems())
+    empty = tuples.add(())
+
+    # Words: The first word (in rowid order) of each name wins, just like select
+    words = {}; unaccented = {}
+    cur.execute("SELECT WordName, UnaccentedWordName, WordID, FormID, PartOfSpeech FROM " +
+                dB.Lexicon.WORD_TABLE + " ORDER BY rowid;")
+    for name, bare, word_id, form_id, part in cur:
+        if part not in dB.Lexicon.POS_TABLES:
+            continue
+        table, form_table = dB.Lexicon.POS_TABLES[part]
+        if (table, word_id, form_id) not in infos:
+            continue
+        record = (strings.add(name), form_id, strings.add(part), infos[(table, word_id, form_id)],
+                  forms.get((form_table, form_id), NULL), defs.get(form_id, empty))
+        words.setdefault(name, record)
+        unaccented.setdefault(bare, record)
+    conn.close()
+
+    words = _records(words, strings)
+    unaccented = _records(unaccented, strings)
+    starts = _starts(strings.values)
+    words = [(starts[r[0]], starts[r[0] + 1]) + r[1:] for r in words]
+    unaccented = [(starts[r[0]], starts[r[0] + 1]) + r[1:] for r in unaccented]
+    sections = [_pack_table(strings.values), _pack_table(tuples.values, True),
+                "".join(RECORD.pack(*r) for r in words), "".join(RECORD.pack(*r) for r in unaccented)]
+    counts = [len(strings.values), len(tuples.values), len(words), len(unaccented)]
+
+    # Write the file next to the old one, and then swap it in
+    header = []
+    offset = HEADER.size
+    for section, count in zip(sections, counts):
+        header += [offset, count]
+        offset += len(section)
+    temp_path = snapshot_path + ".tmp"
+    with open(temp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, *header))
+        for section in sections:
+            f.write(section)
+    if os.path.exists(snapshot_path):
+        os.remove(snapshot_path)
+    os.rename(temp_path, snapshot_path)
+    return len(words)
+
+
+# Compile Helpers
+# Class that numbers distinct values
+class _Table:
+    """
+    _Table hands out an ID per distinct value, in the order they were first added
+    """
+    values = None   # Values: List of values, by ID
+    __ids = None    # IDs: Dictionary mapping a value to its ID
+
+    def __init__(self):
+        self.values = []
+        self.__ids = {}
+
+    def add(self, value):
+        """
+        :param value: Value (None, for a String Table, is NULL)
+        :return: ID of the value
+        """
+        if value is None:
+            return NULL
+        if isinstance(value, unicode):
+            value = value.encode("utf-8")
+        elif not isinstance(value, (str, tuple)):
+            value = str(value)  # The snapshot only stores text
+        i = self.__ids.get(value)
+        if i is None:
+            i = self.__ids[value] = len(self.values)
+            self.values.append(value)
+        return i
+
+
+def _records(words, strings):
+    """
+    :param words: Dictionary mapping a name to its record, less the name
+    :param strings: String Table
+    :return: List of Records, sorted by the bytes of the name
+    """
+    return [(strings.add(name),) + record for name, record in sorted(words.iteritems())]
+
+
+def _starts(values):
+    """
+    :param values: List of strings, or of tuples
+    :return: List of where each value starts once they are all joined, and then where the last one ends
+    """
+    starts = [0]
+    for v in values:
+        starts.append(starts[-1] + len(v))
+    return starts
+
+
+def _pack_table(values, is_tuples=False):
+    """
+    :param values: List of strings, or of tuples of String IDs
+    :param is_tuples: Whether the values are tuples
+    :return: Starts, then the values, as bytes
+    """
+    starts = _starts(values)
+    body = struct.pack("<%dI" % starts[-1], *[i for v in values for i in v]) if is_tuples else "".join(values)
+    return struct.pack("<%dI" % len(starts), *starts) + body
+
+
+# Class that answers lookups from a snapshot
+class SnapshotLexicon:
+    """
+    SnapshotLexicon answers the same lookups as Lexicon.select, from a memory-mapped snapshot file.
+    Opening it only maps the file, and a lookup is a binary search over the sorted names.
+    The records it gives back read their form and definitions from the map when they are first used
+    """
+    __file = None       # File: Snapshot file
+    __map = None        # Map: Memory map of the file
+    __sections = None   # Sections: List of (Offset, Count) of Strings, Tuples, Words, Unaccented
+    __strings = 0       # Strings: Offset of the String Starts
+    __pool = 0          # Pool: Offset of the String Pool
+    __tuples = 0        # Tuples: Offset of the Tuple Starts
+    __items = 0         # Items: Offset of the Tuple Items
+
+    # Constructor
+    def __init__(self, snapshot_path):
+        """
+        Constructor for SnapshotLexicon
+        :param snapshot_path: Path of the snapshot file
+        """
+        self.__file = open(snapshot_path, "rb")
+        self.__map = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        header = HEADER.unpack_from(self.__map, 0)
+        if header[0] != MAGIC or header[1] != VERSION:
+            self.close()
+            raise ValueError(snapshot_path + " is not a snapshot of version " + str(VERSION) + ".")
+        self.__sections = [header[i:i + 2] for i in range(2, len(header), 2)]
+        self.__strings, count = self.__sections[0]
+        self.__pool = self.__strings + (count + 1) * NUMBER.size
+        self.__tuples, count = self.__sections[1]
+        self.__items = self.__tuples + (count + 1) * NUMBER.size
+
+    # Used with With:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __len__(self):
+        return self.__sections[2][1]
+
+    # Close the snapshot
+    def close(self):
+        """
+        Unmaps and closes the snapshot file
+        :return: None
+        """
+        if self.__map is not None:
+            self.__map.close()
+            self.__map = None
+        if self.__file is not None:
+            self.__file.close()
+            self.__file = None
+
+    # Select the info of a word
+    def select(self, word, is_unaccented=False):
+        """
+        Search the snapshot for the word's info
+        :param word: Word to query (unicode, or a UTF-8 string)
+        :param is_unaccented: Whether the word is unaccented or not
+        :return: WordRecord, as Lexicon.select gives it, or None if the word was not found
+        """
+        if isinstance(word, unicode):
+            word = word.encode("utf-8")
+        record = self.__find(word, self.__sections[3 if is_unaccented else 2])
+        if record is None:
+            return None
+        name, form_id, part, info, form, defs = record[2:]
+        return dB.WordRecord(self.__string(name), self.__string(part), form_id, self.__tuple(info), form, defs, self)
+
+    # Select the info of many words
+    def select_many(self, words, is_unaccented=False):
+        """
+        Search the snapshot for the info of many words
+        :param words: Words to query
+        :param is_unaccented: Whether the words are unaccented or not
+        :return: Ordered Dictionary mapping each word to its WordRecord, or to None if it was not found
+        """
+        results = OrderedDict()
+        for word in words:
+            if word not in results:
+                results[word] = self.select(word, is_unaccented)
+        return results
+
+    # Record Methods (used by WordRecord)
+    # Unpack a form
+    def unpack_form(self, i):
+        """
+        :param i: Tuple ID of the form, or NULL
+        :return: Tuple of strings, or None
+        """
+        return self.__tuple(i) if i != NULL else None
+
+    # Unpack definitions
+    def unpack_definitions(self, i):
+        """
+        :param i: Tuple ID of the definitions
+        :return: Tuple of strings
+        """
+        return self.__tuple(i)
+
+    # Helper Methods
+    # Find the record of a name
+    def __find(self, name, section):
+        """
+        Binary searches a Words section for a name
+        :param name: Name (UTF-8 string)
+        :param section: (Offset, Count) of the section
+        :return: Record, or None if the name is not there
+        """
+        offset, count = section
+        data = self.__map; pool = self.__pool; unpack = RECORD.unpack_from; size = RECORD.size
+        lo = 0; hi = count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            record = unpack(data, offset + mid * size)
+            key = data[pool + record[0]:pool + record[1]]
+            if key < name:
+                lo = mid + 1
+            elif key > name:
+                hi = mid
+            else:
+                return record
+        return None
+
+    # Get a string
+    def __string(self, i):
+        """
+        :param i: String ID
+        :return: String, or None for NULL
+        """
+        if i == NULL:
+            return None
+        start, end = PAIR.unpack_from(self.__map, self.__strings + i * NUMBER.size)
+        return self.__map[self.__pool + start:self.__pool + end]
+
+    # Get a tuple of strings
+    def __tuple(self, i):
+        """
+        :param i: Tuple ID
+        :return: Tuple of strings
+        """
+        start, end = PAIR.unpack_from(self.__map, self.__tuples + i * NUMBER.size)
+        ids = struct.unpack_from("<%dI" % (end - start), self.__map, self.__items + start * NUMBER.size)
+        return tuple(self.__string(s) for s in ids)
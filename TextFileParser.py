@@ -1,20 +1,52 @@
 # -*- coding: utf-8 -*-
-import io       # For file operations
-import Utils    # For the Part of Speech
-from collections import defaultdict
+import io               # For file operations
+import hashlib          # For entry fingerprints
+import multiprocessing  # For parsing in parallel
+import Utils            # For the Part of Speech
+import Paradigm         # For expanding regular paradigms
+import Records          # For the form and parse records
+from collections import OrderedDict, namedtuple
+
+# A single entry of the text file: Part of Speech, Form, Individual Words
+# The Form is a Records form, and the Words map each word to a tuple of its Records parses
+Entry = namedtuple("Entry", ["part", "form", "words"])
+
+
+# Error for an entry of the text file that cannot be read
+class BadEntry(ValueError):
+    """
+    BadEntry is raised by the parser for an entry it cannot make records of, like a word with the wrong number
+    of parse values. The message is a UTF-8 string
+    """
+    pass
 
 
 class Parser:
     """
-    Parser class will parse in a text file and create usable words for inserting into the database
+    Parser class will parse in a text file and create usable words for inserting into the database.
+    It is a lazy iterator of Entry records, so only one entry (or one chunk) is held at a time
     """
-    __fi = None     # File: File IO
+    __fi = None             # File: File IO
+    __expand = False        # Expand: Whether entries are filled in with their generated paradigms
+    BUFFER_SIZE = 1 << 16   # Buffer Size: Bytes read from the file at a time
+    CHUNK_SIZE = 500        # Chunk Size: Default number of entries in a chunk
 
     # Constructor
-    def __init__(self, file_name):
+    def __init__(self, file_name, buffer_size=BUFFER_SIZE, stream=None, expand=False):
+        """
+        Constructor for Parser
+        :param file_name: Name of the text file
+        :param buffer_size: Bytes read from the file at a time
+        :param stream: Already open text stream to read instead of the file (file_name is then ignored)
+        :param expand: Whether to fill in each entry with its generated paradigm (see Paradigm)
+        """
+        self.__expand = expand
+        if stream is not None:
+            self.__fi = stream
+            return
         # Try to open the file
         try:
-            self.__fi = io.open(file_name, 'r', encoding='utf8')
+            self.__fi = io.open(file_name, 'r', buffer_size, encoding='utf8')
         except IOError:
             print "Could not open file!"
             self.__fi = None
@@ -26,22 +58,44 @@ class Parser:
         if self.__fi:
             self.__fi.close()
 
-    # Core Method
+    # Iterator Methods
+    def __iter__(self):
+        return self
+
+    def next(self):
+        """
+        Reads in the next entry
+        :return: Entry
+        """
+        w, mode = self.__read_one_word()  # Helper method to read in a word
+        if w is None or mode is None:
+            raise StopIteration
+        form = w[0]  # The form is the first of w pair
+        words = w[1] if len(w) == 2 else None  # If there is another, the words is the second
+        entry = Entry(mode, form, words)
+        return Paradigm.expand(entry) if self.__expand else entry
+
+    __next__ = next
+
+    # Core Methods
+    # Read in entries a chunk at a time
+    def chunks(self, size=CHUNK_SIZE):
+        """
+        Reads in the entries as lists of at most size entries
+        :param size: Number of entries in a chunk
+        :return: Generator of lists of Entries
+        """
+        return chunked(self, size)
+
     # Read in an entire word
     def read(self):
         """
         Try to read an entire word from the text file
         :return: The entire word tuple: Form, Individual Words, Part of Speech, Success
         """
-        w, mode = self.__read_one_word()  # Helper method to read in a word
-        if w is None or mode is None:
-            return None, None, None, False
-        form = w[0]  # The form is the first of w pair
-        if len(w) == 2:
-            words = w[1]  # If there is another, the words is the second
-        else:
-            words = None  # Else, there are no Words
-        return form, words, mode, True  # Return the successfully read in word
+        for entry in self:
+            return entry.form, entry.words, entry.part, True  # Return the successfully read in word
+        return None, None, None, False
 
     # Helper Methods
     # Helper method for readin in a word
@@ -116,9 +170,9 @@ class Parser:
         :param c: Chapter
         :return: Form, Words
         """
-        # Create the list and dictionary
-        form = []
-        words = defaultdict(list)
+        # Create the lists and dictionary
+        form = []; defs = []
+        words = OrderedDict()  # Keeps the file order, so Word IDs do not depend on hashing
         # Read in Form
         # Read in Six Principal Parts
         line = self.__get_line(",")
@@ -130,15 +184,13 @@ class Parser:
         # Read in Types
         self.__load_types(form)
 
-        form.append(c)  # Append chapter
-
         # Read in Definitions
-        self.__load_defs(n, form)
+        self.__load_defs(n, defs)
 
         # Read in Words
-        self.__load_words(words)
+        self.__load_words(words, Utils.PartOfSpeech.VERB.value)
 
-        return form, words
+        return Records.make_form(Utils.PartOfSpeech.VERB.value, form, c, defs), words
 
     # Read in Noun
     def __read_noun(self, n, c):
@@ -159,8 +211,8 @@ class Parser:
         :param c: Chapter
         :return: Form, Words
         """
-        form = []
-        words = defaultdict(list)
+        form = []; defs = []
+        words = OrderedDict()  # Keeps the file order, so Word IDs do not depend on hashing
         # Read in Form
         # Read in N, G, A
         line = self.__get_line(",")
@@ -172,15 +224,13 @@ class Parser:
         # Read in Types
         self.__load_types(form)
 
-        form.append(c)
-
         # Read in Definitions
-        self.__load_defs(n, form)
+        self.__load_defs(n, defs)
 
         # Read in Words
-        self.__load_words(words)
+        self.__load_words(words, Utils.PartOfSpeech.NOUN.value)
 
-        return form, words
+        return Records.make_form(Utils.PartOfSpeech.NOUN.value, form, c, defs), words
 
     # Read in Adjective
     def __read_adj(self, n, c):
@@ -197,8 +247,8 @@ class Parser:
         :param c: Chapter
         :return: Form, Words
         """
-        form = []
-        words = defaultdict(list)
+        form = []; defs = []
+        words = OrderedDict()  # Keeps the file order, so Word IDs do not depend on hashing
         # Read in Form
         # Read in M, F, N
         line = self.__get_line(",")
@@ -210,15 +260,13 @@ class Parser:
         # Read in Types
         self.__load_types(form)
 
-        form.append(c)
-
         # Read in Definitions
-        self.__load_defs(n, form)
+        self.__load_defs(n, defs)
 
         # Read in Words
-        self.__load_words(words)
+        self.__load_words(words, Utils.PartOfSpeech.ADJECTIVE.value)
 
-        return form, words
+        return Records.make_form(Utils.PartOfSpeech.ADJECTIVE.value, form, c, defs), words
 
     # Read in Pronoun
     def __read_pro(self, n, c):
@@ -236,8 +284,8 @@ class Parser:
         :param c: Chapter
         :return: Form, Words
         """
-        form = []
-        words = defaultdict(list)
+        form = []; defs = []
+        words = OrderedDict()  # Keeps the file order, so Word IDs do not depend on hashing
         # Read in Form
         # Read in M, F, N
         line = self.__get_line(",")
@@ -249,15 +297,13 @@ class Parser:
         # Read in Types
         self.__load_types(form)
 
-        form.append(c)
-
         # Read in Definitions
-        self.__load_defs(n, form)
+        self.__load_defs(n, defs)
 
         # Read in Words
-        self.__load_words(words)
+        self.__load_words(words, Utils.PartOfSpeech.PRONOUN.value)
 
-        return form, words
+        return Records.make_form(Utils.PartOfSpeech.PRONOUN.value, form, c, defs), words
 
     # Read Participle
     def __read_part(self):
@@ -271,7 +317,7 @@ class Parser:
         :return: Form, Words
         """
         form = []
-        words = defaultdict(list)
+        words = OrderedDict()  # Keeps the file order, so Word IDs do not depend on hashing
         # Read in Form
         # Read in M, F, N
         line = self.__get_line(",")
@@ -281,9 +327,9 @@ class Parser:
             form.append(p)
 
         # Read in Words
-        self.__load_words(words)
+        self.__load_words(words, Utils.PartOfSpeech.PARTICIPLE.value)
 
-        return form, words
+        return Records.make_form(Utils.PartOfSpeech.PARTICIPLE.value, form), words
 
     # Read All Others
     def __read_misc(self, n, c):
@@ -299,25 +345,21 @@ class Parser:
         :param p:
         :return:
         """
-        form = []
-        words = defaultdict(list)
+        defs = []
+        words = OrderedDict()  # Keeps the file order, so Word IDs do not depend on hashing
         # Read in Form
         # Read in Primary Word String
         line = self.__get_line()
         if len(line) == 0:
             return [], {}
-        for p in line:
-            form.append(p)
-
-        form.append(c)
 
         # Read in Definitions
-        self.__load_defs(n, form)
+        self.__load_defs(n, defs)
 
         # Read in Words
-        self.__load_words(words)
+        self.__load_words(words, None)
 
-        return form, words
+        return Records.MiscForm(line, Records.feature(c), tuple(defs)), words
 
     # Get a single line
     def __get_line(self, d=None):
@@ -356,21 +398,31 @@ class Parser:
         return True
 
     # Load Words
-    def __load_words(self, f):
+    def __load_words(self, f, part):
         """
         Loads words into f
         :param f: Where to load
+        :param part: Part of Speech, for the parse records
         :return: Success
+        :raise BadEntry: If a word has the wrong number of parse values
         """
+        success = True
         while True:  # As long as you can...
             wo = self.__get_line()  # Get the Word Name
             if wo[0] == "!" or len(wo) == 0:  # Separation Between Forms/End of Form
                 break  # Stop, as there are no more words
             line = self.__get_line(",")  # Get Info on Word
             if len(line) == 0:  # If no info (There must be info directly following a word string)
-                return False  # Bad format
-            f[wo].append(line)  # Dictionary mapping a word string to its info
-        return True
+                success = False  # Bad format
+                break
+            try:
+                parse = Records.make_parse(part, line)
+            except ValueError, e:
+                raise BadEntry((wo + u": " + u",".join(line) + u": ").encode("utf-8") + str(e))
+            f.setdefault(wo, []).append(parse)  # Dictionary mapping a word string to its info
+        for wo in f:  # Each word keeps its parses as a tuple, which is smaller than a list
+            f[wo] = tuple(f[wo])
+        return success
 
     # Load Types
     def __load_types(self, f):
@@ -386,6 +438,108 @@ class Parser:
             f.append(t)
         return True
 
+
+# Group entries into chunks
+def chunked(entries, size=Parser.CHUNK_SIZE):
+    """
+    Groups a stream of entries into lists of at most size entries
+    :param entries: Iterable of Entries
+    :param size: Number of entries in a chunk
+    :return: Generator of lists of Entries
+    """
+    chunk = []
+    for entry in entries:
+        chunk.append(entry)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# Split a text file into shards
+def shard(file_name, count):
+    """
+    Splits the text file into about count byte ranges. Every range ends right after
+    a terminating ! line, so no entry is ever split across two ranges
+    :param file_name: Name of the text file
+    :param count: Number of shards wanted
+    :return: List of (Start, End) byte offsets, in file order
+    """
+    with io.open(file_name, 'rb') as fi:
+        fi.seek(0, io.SEEK_END)
+        size = fi.tell()
+        bounds = [0]
+        for i in range(1, count):
+            target = max(size * i // count, bounds[-1])
+            fi.seek(target)
+            if target > 0:
+                fi.readline()  # Skip to the start of the next line
+            line = fi.readline()
+            while line and line[:1] != b"!":  # Find the end of the entry
+                line = fi.readline()
+            if fi.tell() > bounds[-1]:
+                bounds.append(fi.tell())
+        if bounds[-1] < size:
+            bounds.append(size)
+    return zip(bounds[:-1], bounds[1:])
+
+
+# Parse a single shard
+def _parse_shard(job):
+    """
+    Parses one byte range of a text file (run in a worker process)
+    :param job: (File Name, Start, End, Expand)
+    :return: List of Entries in the range
+    """
+    file_name, start, end, expand = job
+    with io.open(file_name, 'rb') as fi:
+        fi.seek(start)
+        text = fi.read(end - start).decode("utf-8")
+    with Parser(None, stream=io.StringIO(text), expand=expand) as parser:
+        return list(parser)
+
+
+# Parse a text file with a process pool
+def parse_parallel(file_name, processes=None, shards_per_process=4, expand=False):
+    """
+    Parses the text file in shards across a process pool, and yields the entries back in file order,
+    so anything inserting them (and handing out Form IDs) sees the same order as a sequential parse
+    :param file_name: Name of the text file
+    :param processes: Number of worker processes (Default: every core)
+    :param shards_per_process: Shards per worker. More shards keep the workers busy and hold fewer results at once
+    :param expand: Whether the workers fill in each entry with its generated paradigm
+    :return: Generator of Entries
+    """
+    processes = processes or multiprocessing.cpu_count()
+    jobs = [(file_name, start, end, expand) for start, end in shard(file_name, processes * shards_per_process)]
+    pool = multiprocessing.Pool(processes)
+    try:
+        for entries in pool.imap(_parse_shard, jobs):  # imap keeps the order of the jobs
+            for entry in entries:
+                yield entry
+        pool.close()
+    finally:
+        pool.terminate()
+        pool.join()
+
+
+# Fingerprint an entry
+def fingerprint(part, form, words):
+    """
+    Hashes everything read in for one entry (one Parser.read result), so that an entry
+    that changed in the text file can be told apart from one that did not
+    :param part: Part of Speech
+    :param form: Form record
+    :param words: Individual Words
+    :return: Fingerprint string
+    """
+    fields = [part, u"\x1e".join(Records.values(form))]
+    for name in sorted(words):  # The dictionary has no order of its own
+        for info in words[name]:
+            fields.append(name + u"\x1f" + u"\x1f".join(info))
+    return hashlib.sha1(u"\x1d".join(fields).encode("utf-8")).hexdigest()
+
 '''
     def read_verb(self):
         # Verbs need to be in a specific format
@@ -26,3 +26,4 @@ class Error(Enum):
     BAD_INSERT = 3          # An SQL Insert Error.
     WORD_NOT_FOUND = 4
     BAD_ARGS = 5
+    EXCEPTION = 6           # The command raised an exception.
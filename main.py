@@ -1,13 +1,41 @@
 # -*- coding: UTF-8 -*-
 from __future__ import print_function
+import os
+import sys
+import argparse
+import DatabaseManager as dB
 import LexiconSearcher as LS
 
-if __name__ == "__main__":
-
-    db = "Lexicon.db"
-    with LS.LexiconSearcher(db) as ls:
-        ls.run_searcher()
-
+BUFFER_SIZE = 1 << 16  # Bytes of output held before each write in batch mode
 
+if __name__ == "__main__":
 
+    parser = argparse.ArgumentParser(description="Look up words in the Greek lexicon.")
+    parser.add_argument("--db", default="Lexicon.db", help="Database to connect to")
+    parser.add_argument("--source", default=LS.LexiconSearcher.FILE_NAME, help="Text file that update reads")
+    parser.add_argument("--profile", default=dB.Lexicon.PROFILE_DEFAULT, choices=sorted(dB.Lexicon.PROFILES),
+                        help="Connection profile")
+    parser.add_argument("--backend", default=LS.LexiconSearcher.BACKEND_SQLITE,
+                        choices=LS.LexiconSearcher.BACKENDS, help="Which backend answers info lookups")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Run the commands in FILE (- for standard input) without prompting, and exit "
+                             "with status 1 if any of them failed")
+    args = parser.parse_args()
 
+    if args.batch is None:
+        with LS.LexiconSearcher(args.db, backend=args.backend, profile=args.profile,
+                                file_name=args.source) as ls:
+            ls.run_searcher()
+    else:
+        # Write results through a large buffer, not a line at a time
+        out = os.fdopen(os.dup(sys.stdout.fileno()), "w", BUFFER_SIZE)
+        commands = sys.stdin if args.batch == "-" else open(args.batch)
+        try:
+            with LS.LexiconSearcher(args.db, backend=args.backend, profile=args.profile,
+                                    file_name=args.source, out=out) as ls:
+                status = ls.run_batch(commands)
+        finally:  # Whatever happens, write out what the commands before it printed
+            out.close()
+            if commands is not sys.stdin:
+                commands.close()
+        sys.exit(status)